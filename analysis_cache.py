@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for MultiDimAnalyzer.analyze_content_3d().
+
+Entries are keyed by sha256(article bytes + analyzer version), so an unchanged
+draft re-uses its SEO / GEO / voice analysis and any edit (or analyzer upgrade)
+misses cleanly. The cache is bounded by entry count and total bytes; the least
+recently used entries are evicted first.
+
+Usage:
+    from analysis_cache import CachedAnalyzer
+    analyzer = CachedAnalyzer()                 # wraps MultiDimAnalyzer()
+    analysis = analyzer.analyze_content_3d(path)
+    print(analyzer.cache.stats())
+"""
+import os
+import pickle
+import hashlib
+import tempfile
+from pathlib import Path
+
+from instrumentation import count
+
+# Shared publishing tools on sys.path
+import shared_tools  # noqa: F401
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / '.cache' / 'analysis'
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def source_version(module):
+    """Version string for a module: __version__ plus a hash of its source.
+
+    Hashing the source means a local edit to the module invalidates cached
+    or checkpointed results even when nobody bumped a version number.
+    """
+    version = getattr(module, '__version__', '0')
+    try:
+        digest = hashlib.sha256(Path(module.__file__).read_bytes()).hexdigest()[:16]
+    except (OSError, TypeError):
+        digest = 'nosource'
+    return f"{version}+{digest}"
+
+
+def evict_lru(cache_dir, pattern, max_entries, max_bytes, keep=()):
+    """Delete the least recently used files matching pattern until within both bounds.
+
+    Recency is mtime, so readers touch entries on a hit. Paths in keep are
+    never deleted. Returns the number of files removed.
+    """
+    keep = {Path(p) for p in keep}
+    entries = []
+    for path in Path(cache_dir).glob(pattern):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+
+    entries.sort()   # oldest first
+    remaining = len(entries)
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+
+    for _, size, path in entries:
+        if remaining <= max_entries and total <= max_bytes:
+            break
+        if path in keep:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        remaining -= 1
+        total -= size
+        evicted += 1
+    return evicted
+
+
+def analyzer_version():
+    """source_version() of the shared multi_dim_analyzer module."""
+    import multi_dim_analyzer
+    return source_version(multi_dim_analyzer)
+
+
+class AnalysisCache:
+    """LRU, size-bounded pickle store of analysis dicts keyed by content hash."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, analyzer_version=None,
+                 max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.analyzer_version = analyzer_version
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, article_bytes):
+        """Cache key for raw article bytes under the current analyzer version."""
+        h = hashlib.sha256()
+        h.update(str(self.analyzer_version).encode('utf-8'))
+        h.update(b'\0')
+        h.update(article_bytes)
+        return h.hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}.pkl"
+
+    def get(self, key):
+        """Return the cached analysis for key, or None. Counts a hit or miss."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                analysis = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.misses += 1
+            count('analysis_cache.misses')
+            return None
+
+        # Touch mtime so eviction sees this entry as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.hits += 1
+        count('analysis_cache.hits')
+        return analysis
+
+    def put(self, key, analysis):
+        """Store analysis under key, then evict down to the configured bounds."""
+        # Write to a temp file and rename so concurrent workers never read a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(analysis, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._entry_path(key))
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until within max_entries / max_bytes."""
+        self.evictions += evict_lru(self.cache_dir, '*.pkl', self.max_entries, self.max_bytes)
+
+    def clear(self):
+        """Delete every entry (counters are kept)."""
+        for path in self.cache_dir.glob('*.pkl'):
+            path.unlink()
+
+    def stats(self):
+        """Hit/miss counters for this process plus current on-disk footprint."""
+        sizes = [p.stat().st_size for p in self.cache_dir.glob('*.pkl')]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'entries': len(sizes),
+            'bytes': sum(sizes),
+        }
+
+
+class CachedAnalyzer:
+    """Drop-in replacement for MultiDimAnalyzer that consults AnalysisCache first."""
+
+    def __init__(self, analyzer=None, cache=None):
+        if analyzer is None:
+            from multi_dim_analyzer import MultiDimAnalyzer
+            analyzer = MultiDimAnalyzer()
+        if cache is None:
+            cache = AnalysisCache(analyzer_version=analyzer_version())
+        self.analyzer = analyzer
+        self.cache = cache
+
+    def analyze_content_3d(self, article_path):
+        """Same contract as MultiDimAnalyzer.analyze_content_3d(), served from cache when possible."""
+        article_bytes = Path(article_path).read_bytes()
+        key = self.cache.key(article_bytes)
+
+        analysis = self.cache.get(key)
+        if analysis is not None:
+            return analysis
+
+        analysis = self.analyzer.analyze_content_3d(article_path)
+        self.cache.put(key, analysis)
+        return analysis
+
+    def __getattr__(self, name):
+        # Anything else (helpers, config) passes straight through to the real analyzer
+        if name == 'analyzer':
+            raise AttributeError(name)
+        return getattr(self.analyzer, name)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Concurrent batch image upload to the GitHub Pages CDN in a single commit.
+
+Uses the GitHub Git Data API instead of one contents-API commit per file:
+
+  1. Create one blob per image - concurrently, over one pooled session
+  2. Create one tree on top of the branch head containing every blob
+  3. Create one commit and fast-forward the branch ref to it
+
+Transient failures (429 / 5xx, connection resets) are retried with
+exponential backoff, honouring Retry-After. api_base is configurable so the
+whole flow can be exercised against a local stand-in server.
+
+Images are keyed by content hash. Repo paths embed the sha256 prefix, and a
+local manifest (.cache/cdn_manifest.json) maps hash -> CDN URL per repo, so
+re-publishing an article or reusing a chart skips the upload entirely. A lost
+manifest only costs a re-upload: the same bytes land on the same path.
+
+Usage:
+    python batch_image_uploader.py <owner> <repo> image1.png image2.png ...
+
+    Requires GITHUB_TOKEN in the environment.
+"""
+import os
+import sys
+import json
+import base64
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from instrumentation import count, span
+
+DEFAULT_API_BASE = 'https://api.github.com'
+DEFAULT_MANIFEST_PATH = Path(__file__).resolve().parent / '.cache' / 'cdn_manifest.json'
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF = 0.5          # seconds; doubles per retry
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class UploadError(Exception):
+    """Raised when a GitHub API step fails after retries."""
+
+
+def make_session(token=None, max_workers=DEFAULT_MAX_WORKERS,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+    """requests.Session with a connection pool sized for max_workers and retry/backoff."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=None,          # blobs/trees/commits are content-addressed, safe to retry
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Accept': 'application/vnd.github+json',
+        'User-Agent': 'content-upload-meister',
+    })
+    if token:
+        session.headers['Authorization'] = f'Bearer {token}'
+    return session
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def cdn_path(image_path, digest, prefix='images'):
+    """Repo path for an image: images/<hash[:2]>/<stem>_<hash[:12]><ext>."""
+    image_path = Path(image_path)
+    return f"{prefix}/{digest[:2]}/{image_path.stem}_{digest[:12]}{image_path.suffix.lower()}"
+
+
+class ImageManifest:
+    """Local record of uploaded images: {"owner/repo": {sha256: {url, repo_path, ...}}}."""
+
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = Path(path)
+        self._data = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}     # corrupt manifest: worst case is re-uploading
+
+    def get(self, repo_key, digest):
+        return self._data.get(repo_key, {}).get(digest)
+
+    def put(self, repo_key, digest, entry):
+        self._data.setdefault(repo_key, {})[digest] = entry
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._data.values())
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, indent=2, sort_keys=True)
+                f.write('\n')
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+
+class BatchImageUploader:
+    """Uploads many images to a GitHub Pages repo as one commit."""
+
+    def __init__(self, owner, repo, branch='main', token=None, api_base=DEFAULT_API_BASE,
+                 max_workers=DEFAULT_MAX_WORKERS, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF,
+                 timeout=30, session=None, manifest=None):
+        self.owner = owner
+        self.repo = repo
+        self.branch = branch
+        self.api_base = api_base.rstrip('/')
+        self.max_workers = max_workers
+        self.timeout = timeout
+        token = token if token is not None else os.environ.get('GITHUB_TOKEN')
+        self.session = session or make_session(token, max_workers, retries, backoff)
+        self.manifest = manifest if manifest is not None else ImageManifest()
+        self.api_calls = 0
+        self.reused = 0
+
+    @property
+    def repo_key(self):
+        return f"{self.owner}/{self.repo}"
+
+    @property
+    def cdn_base(self):
+        return f"https://{self.owner}.github.io/{self.repo}"
+
+    def _request(self, method, path, **kwargs):
+        url = f"{self.api_base}/repos/{self.owner}/{self.repo}/{path}"
+        self.api_calls += 1
+        count('github.api_calls')
+        try:
+            resp = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise UploadError(f"{method} {path}: {e}") from e
+        if resp.status_code >= 400:
+            raise UploadError(f"{method} {path}: HTTP {resp.status_code} {resp.text[:200]}")
+        return resp.json()
+
+    def _create_blob(self, data):
+        payload = {'content': base64.b64encode(data).decode('ascii'), 'encoding': 'base64'}
+        return self._request('POST', 'git/blobs', json=payload)['sha']
+
+    def upload_files(self, files, message=None):
+        """Commit {repo_path: bytes} to the branch in one commit.
+
+        Returns:
+            The new commit sha.
+        """
+        if not files:
+            raise ValueError("No files to upload")
+
+        head_sha = self._request('GET', f'git/ref/heads/{self.branch}')['object']['sha']
+        base_tree = self._request('GET', f'git/commits/{head_sha}')['tree']['sha']
+
+        repo_paths = list(files)
+        with span('image_uploader.blobs', files=len(files), bytes=sum(map(len, files.values()))):
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                blob_shas = list(pool.map(self._create_blob, (files[p] for p in repo_paths)))
+
+        tree = self._request('POST', 'git/trees', json={
+            'base_tree': base_tree,
+            'tree': [{'path': p, 'mode': '100644', 'type': 'blob', 'sha': sha}
+                     for p, sha in zip(repo_paths, blob_shas)],
+        })['sha']
+
+        commit = self._request('POST', 'git/commits', json={
+            'message': message or f"Add {len(files)} image(s) via batch uploader",
+            'tree': tree,
+            'parents': [head_sha],
+        })['sha']
+
+        self._request('PATCH', f'git/refs/heads/{self.branch}', json={'sha': commit, 'force': False})
+        return commit
+
+    def upload_images(self, image_paths, message=None):
+        """Upload local images in one commit; return CDN info in input order.
+
+        Images already in the manifest (same bytes, same repo) are not
+        re-uploaded; their entry carries 'reused': True and the commit that
+        originally added them. If every image is reused no commit is made.
+
+        Returns:
+            [{'local_path': str, 'repo_path': str, 'url': str, 'commit': str,
+              'sha256': str, 'reused': bool}, ...]
+        """
+        entries = []
+        files = {}
+        for image_path in image_paths:
+            data = Path(image_path).read_bytes()
+            digest = content_hash(data)
+            known = self.manifest.get(self.repo_key, digest)
+            if known:
+                entries.append({'local_path': str(image_path), 'repo_path': known['repo_path'],
+                                'url': known['url'], 'commit': known.get('commit'),
+                                'sha256': digest, 'reused': True})
+                continue
+            # Identical bytes twice in one batch share the first path
+            repo_path = next((e['repo_path'] for e in entries if e['sha256'] == digest),
+                             None) or cdn_path(image_path, digest)
+            files[repo_path] = data
+            entries.append({
+                'local_path': str(image_path),
+                'repo_path': repo_path,
+                'url': f"{self.cdn_base}/{repo_path}",
+                'sha256': digest,
+                'reused': False,
+            })
+
+        self.reused += sum(e['reused'] for e in entries)
+        count('images.reused', sum(e['reused'] for e in entries))
+        count('images.uploaded', len(files))
+        if files:
+            with span('image_uploader.upload_files', files=len(files)):
+                commit = self.upload_files(files, message)
+            uploaded_at = datetime.now().isoformat(timespec='seconds')
+            for entry in entries:
+                if not entry['reused']:
+                    entry['commit'] = commit
+                    self.manifest.put(self.repo_key, entry['sha256'], {
+                        'url': entry['url'], 'repo_path': entry['repo_path'],
+                        'commit': commit, 'uploaded': uploaded_at,
+                    })
+            self.manifest.save()
+        return entries
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("Usage: python batch_image_uploader.py <owner> <repo> <image> [<image> ...]")
+        sys.exit(1)
+
+    owner, repo, images = sys.argv[1], sys.argv[2], sys.argv[3:]
+    uploader = BatchImageUploader(owner, repo)
+    print(f"[*] Uploading {len(images)} image(s) to {owner}/{repo} in one commit...")
+    for entry in uploader.upload_images(images):
+        status = 'reused' if entry['reused'] else 'uploaded'
+        print(f"    {entry['local_path']} -> {entry['url']} ({status})")
+    print(f"[OK] Done ({uploader.api_calls} API calls, {uploader.reused} reused)")
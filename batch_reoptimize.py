@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Bulk re-optimization of published articles: analyze -> optimize -> platform SEO.
+
+Retro-fitting GEO/SEO metadata used to mean calling
+set_seo_from_optimizer_output() and build_medium_seo_from_optimizer() one
+article at a time. This command takes a manifest of articles with their
+Substack draft / Medium story ids and runs every item through a pipelined
+work queue:
+
+    analyze -> optimize -+-> substack   (diff-aware PUT via SubstackClient)
+                         +-> medium     (submission URL + JS payload, for the browser step)
+
+Each stage has its own concurrency bound, so item 2 is being analyzed while
+item 1 is optimizing and item 0's SEO is being written. Items are fed
+through a bounded queue to a fixed set of consumers, so only a handful are
+in flight however long the catalogue is. One item failing doesn't stop the
+others. Every stage outcome is appended to a status log (JSON Lines); stage
+details too large to inline (Medium JS payloads) go to content-addressed
+files in <status log>.payloads/ and the log records their path and hash.
+With --resume, items whose inputs (article bytes, targets,
+strategy, analyzer / engine / tag vocabulary versions) are unchanged since they last
+completed are skipped. --dry-run analyzes and optimizes, but only reports
+the Substack fields that would change and writes nothing.
+
+Manifest (JSON list, or JSON Lines):
+    [{"article": "article/medium_draft.md", "substack_draft_id": 188207668,
+      "medium_story_id": "06b801e2ce3b", "strategy": "balanced"}, ...]
+    strategy is optional: default is the best combined score per platform.
+
+Usage:
+    python batch_reoptimize.py catalogue.json --publication https://yourpub.substack.com
+    python batch_reoptimize.py catalogue.json --publication ... --dry-run
+    python batch_reoptimize.py catalogue.json --publication ... --resume --substack-workers 2
+"""
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+# Shared tools path; heavy modules load on first use
+from shared_tools import lazy_module
+
+multi_dim_analyzer = lazy_module('multi_dim_analyzer')
+optimization_engine = lazy_module('optimization_engine')
+
+from analysis_cache import CachedAnalyzer, source_version
+from instrumentation import count, span, tracing
+from substack_client import SubstackClient, fields_from_optimizer, seo_diff, seo_payload
+from tag_vocabulary import load_index, resolve_result_tags, vocabulary_version
+
+STAGES = ('analyze', 'optimize', 'substack', 'medium')
+DEFAULT_LIMITS = {'analyze': 2, 'optimize': 2, 'substack': 4, 'medium': 2}
+DETAIL_INLINE_BYTES = 512      # larger stage details are written to a payload file
+TARGETS = {'substack': 'substack_draft_id', 'medium': 'medium_story_id'}
+
+
+def load_manifest(path):
+    """Manifest items from a JSON list or a JSON Lines file, each with an 'id'."""
+    text = Path(path).read_text(encoding='utf-8')
+    if str(path).endswith('.jsonl'):
+        items = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        items = json.loads(text)
+    seen = set()
+    for item in items:
+        if 'article' not in item:
+            raise ValueError(f"Manifest item has no 'article': {item}")
+        item.setdefault('id', item['article'])
+        if item['id'] in seen:
+            raise ValueError(f"Duplicate manifest item: {item['id']}")
+        seen.add(item['id'])
+    return items
+
+
+def platforms_for(item):
+    """Platforms the item has a target id for, in STAGES order."""
+    return [p for p, key in TARGETS.items() if item.get(key) is not None]
+
+
+def item_fingerprint(item, versions=()):
+    """Hash of everything that determines an item's SEO writes; None if the article can't be read."""
+    try:
+        article_bytes = Path(item['article']).read_bytes()
+    except OSError:
+        return None
+    h = hashlib.sha256(article_bytes)
+    targets = {key: item.get(key) for key in ('substack_draft_id', 'medium_story_id', 'strategy')}
+    for part in (json.dumps(targets, sort_keys=True), *versions):
+        h.update(b'\0' + str(part).encode('utf-8'))
+    return h.hexdigest()
+
+
+def choose_strategy(strategies, strategy=None):
+    """(name, result): the requested strategy, or the best by combined score."""
+    if strategy:
+        if strategy not in strategies:
+            raise ValueError(f"Unknown strategy {strategy!r}; have {', '.join(strategies)}")
+        return strategy, strategies[strategy]
+    best = max(strategies, key=lambda s: strategies[s]['scores']['combined'])
+    return best, strategies[best]
+
+
+class StatusLog:
+    """Append-only JSON Lines log of per-item, per-stage outcomes."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.payload_dir = self.path.with_name(self.path.name + '.payloads')
+        self._f = None
+
+    def completed(self):
+        """{item id: fingerprint} for items whose last run finished every stage."""
+        done = {}
+        if not self.path.exists():
+            return done
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue   # partial line from an interrupted write
+                if record.get('stage') != 'item':
+                    continue
+                if record['status'] == 'ok':
+                    done[record['item']] = record.get('fingerprint')
+                else:
+                    done.pop(record['item'], None)
+        return done
+
+    def write(self, item_id, stage, status, **fields):
+        if self._f is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._f = open(self.path, 'a', encoding='utf-8')
+        record = {'time': datetime.now().isoformat(timespec='seconds'), 'item': item_id,
+                  'stage': stage, 'status': status, **fields}
+        self._f.write(json.dumps(record, default=str) + '\n')
+        self._f.flush()
+
+    def write_payload(self, value):
+        """Store value as JSON in payload_dir, named by its hash; return {'path', 'sha256', 'bytes'}."""
+        data = json.dumps(value, default=str, sort_keys=True).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.payload_dir / f"{digest[:16]}.json"
+        if not path.exists():
+            self.payload_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            tmp.write_bytes(data)
+            tmp.replace(path)
+        return {'path': str(path), 'sha256': digest, 'bytes': len(data)}
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+# =====================================================================
+# STAGES (synchronous; run in worker threads)
+# =====================================================================
+
+def default_analyzer():
+    return CachedAnalyzer()
+
+
+def default_engine(analysis):
+    return optimization_engine.OptimizationEngine(voice_profile=analysis['voice_profile'])
+
+
+def default_medium_builder(story_id, result):
+    from medium_seo_setter import build_medium_seo_from_optimizer
+    return build_medium_seo_from_optimizer(story_id, result)
+
+
+class Pipeline:
+    """Work queue over manifest items with a concurrency bound per stage."""
+
+    def __init__(self, substack_client=None, medium_builder=None, analyzer_factory=default_analyzer,
+                 engine_factory=default_engine, limits=None, dry_run=False, status_log=None,
+                 resume=False, versions=None, tag_index=None, in_flight=None):
+        self.substack_client = substack_client
+        self.medium_builder = medium_builder or default_medium_builder
+        self.analyzer_factory = analyzer_factory
+        self.engine_factory = engine_factory
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.dry_run = dry_run
+        self.status_log = status_log
+        self.resume = resume
+        self.versions = versions
+        self.tag_index = tag_index
+        # Items in flight at once: enough to keep every stage's slots busy
+        self.in_flight = in_flight or sum(self.limits.values())
+
+    # --- stage bodies ---
+
+    def analyze(self, item):
+        return self.analyzer_factory().analyze_content_3d(item['article'])
+
+    def optimize(self, item, analysis):
+        engine = self.engine_factory(analysis)
+        tag_index = self.tag_index or load_index()
+        chosen = {}
+        for platform in platforms_for(item):
+            strategies = engine.optimize_all_strategies(analysis, platform)
+            name, result = choose_strategy(strategies, item.get('strategy'))
+            chosen[platform] = dict(resolve_result_tags(result, platform, tag_index), strategy=name)
+        return chosen
+
+    def substack(self, item, result):
+        draft_id = item['substack_draft_id']
+        if self.substack_client is None:
+            raise RuntimeError("No Substack client (pass --publication)")
+        if self.dry_run:
+            payload = seo_payload(**fields_from_optimizer(result))
+            current = self.substack_client.get_draft(draft_id)
+            return {'would_send': sorted(seo_diff(current, payload))}
+        update = self.substack_client.set_seo_from_optimizer_output(draft_id, result)
+        return {'sent': sorted(update['sent']), 'skipped': update['skipped']}
+
+    def medium(self, item, result):
+        # Building the payload has no side effects; the browser step applies it
+        return self.medium_builder(item['medium_story_id'], result)
+
+    # --- queue ---
+
+    async def _stage(self, name, item, fn, *args):
+        """Run one stage for one item under the stage's semaphore; record its outcome (not in a dry run)."""
+        async with self._sems[name]:
+            start = time.perf_counter()
+            try:
+                with span(f"batch.{name}", item=item['id']):
+                    value = await asyncio.to_thread(fn, item, *args)
+            except Exception as e:
+                outcome = {'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+                value = None
+            else:
+                outcome = {'status': 'ok'}
+            outcome.update(start=round(start - self._t0, 4), elapsed=round(time.perf_counter() - start, 4))
+        if name in ('substack', 'medium') and value is not None:
+            outcome['detail'] = self._detail(value)
+        if self.status_log is not None and not self.dry_run:
+            self.status_log.write(item['id'], name, outcome['status'],
+                                  **{k: v for k, v in outcome.items() if k != 'status'})
+        return outcome, value
+
+    def _detail(self, value):
+        """value, or a reference to its payload file if it is too large for the status log."""
+        if self.status_log is None or self.dry_run:
+            return value
+        if len(json.dumps(value, default=str)) <= DETAIL_INLINE_BYTES:
+            return value
+        return {'payload': self.status_log.write_payload(value)}
+
+    async def _run_item(self, item, fingerprint):
+        report = {'item': item['id'], 'stages': {}}
+        stages = report['stages']
+
+        stages['analyze'], analysis = await self._stage('analyze', item, self.analyze)
+        if analysis is not None:
+            stages['optimize'], chosen = await self._stage('optimize', item, self.optimize, analysis)
+            if chosen is not None:
+                report['strategies'] = {p: r['strategy'] for p, r in chosen.items()}
+                seo = [self._stage(p, item, getattr(self, p), chosen[p]) for p in chosen]
+                for platform, (outcome, _) in zip(chosen, await asyncio.gather(*seo)):
+                    stages[platform] = outcome
+
+        failed = [name for name, s in stages.items() if s['status'] != 'ok']
+        report['status'] = 'failed' if failed or len(stages) < 2 + len(platforms_for(item)) else 'ok'
+        if failed:
+            report['error'] = f"{failed[0]}: {stages[failed[0]]['error']}"
+        count(f"batch.items_{report['status']}")
+        if self.status_log is not None and not self.dry_run:
+            self.status_log.write(item['id'], 'item', report['status'], fingerprint=fingerprint)
+        return report
+
+    async def _run(self, items):
+        self._sems = {name: asyncio.Semaphore(self.limits[name]) for name in STAGES}
+        self._t0 = time.perf_counter()
+        versions = self.versions
+        if versions is None:
+            versions = (source_version(multi_dim_analyzer), source_version(optimization_engine))
+        versions = (*versions, vocabulary_version(self.tag_index))   # tags are resolved against it
+        done = self.status_log.completed() if self.resume and self.status_log is not None else {}
+
+        async def run_or_skip(item):
+            fingerprint = item_fingerprint(item, versions)
+            if fingerprint is not None and done.get(item['id']) == fingerprint:
+                count('batch.items_skipped')
+                return {'item': item['id'], 'status': 'skipped', 'stages': {}}
+            if not platforms_for(item):
+                return {'item': item['id'], 'status': 'failed', 'stages': {},
+                        'error': 'no substack_draft_id or medium_story_id'}
+            return await self._run_item(item, fingerprint)
+
+        # Bounded queue, fixed consumers: memory stays flat however many items there are
+        queue = asyncio.Queue(maxsize=self.in_flight)
+        results = []
+
+        async def produce():
+            try:
+                for item in items:
+                    results.append(None)
+                    await queue.put((len(results) - 1, item))
+            finally:
+                for _ in range(self.in_flight):
+                    await queue.put(None)
+
+        async def consume():
+            while (job := await queue.get()) is not None:
+                index, item = job
+                results[index] = await run_or_skip(item)
+
+        await asyncio.gather(produce(), *(consume() for _ in range(self.in_flight)))
+        counts = {status: sum(r['status'] == status for r in results) for status in ('ok', 'failed', 'skipped')}
+        return {
+            'ok': counts['failed'] == 0,
+            'dry_run': self.dry_run,
+            'wall_time': round(time.perf_counter() - self._t0, 4),
+            'counts': counts,
+            'items': results,
+        }
+
+    def run(self, items):
+        """Process manifest items; return {'ok', 'dry_run', 'wall_time', 'counts', 'items': [...]}.
+
+        Each item report: {'item', 'status': 'ok' | 'failed' | 'skipped',
+        'stages': {name: {'status', 'start', 'elapsed', 'error', 'detail'}},
+        'strategies': {platform: strategy}, 'error'}; items are in manifest order.
+        With a status log, a detail over DETAIL_INLINE_BYTES is
+        {'payload': {'path', 'sha256', 'bytes'}} (see StatusLog.write_payload).
+        items may be any iterable; it is consumed as the queue has room.
+        """
+        items = (dict(item, id=item.get('id', item['article'])) for item in items)
+        try:
+            return asyncio.run(self._run(items))
+        finally:
+            if self.status_log is not None:
+                self.status_log.close()
+
+
+def format_report(report):
+    lines = [f"  {'Item':40s} {'Status':8s} " + ' '.join(f"{s:9s}" for s in STAGES), "-" * 90]
+    for r in report['items']:
+        cells = ' '.join(f"{r['stages'].get(s, {}).get('status', '-'):9s}" for s in STAGES)
+        lines.append(f"  {str(r['item'])[-40:]:40s} {r['status']:8s} {cells}")
+        if r.get('error'):
+            lines.append(f"      {r['error']}")
+    c = report['counts']
+    mode = ' (dry run)' if report['dry_run'] else ''
+    lines.append("-" * 90)
+    lines.append(f"  {c['ok']} ok, {c['failed']} failed, {c['skipped']} skipped in {report['wall_time']:.2f}s{mode}")
+    return '\n'.join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Re-optimize and re-apply SEO across a catalogue")
+    parser.add_argument('manifest', help="JSON / JSONL list of {article, substack_draft_id, medium_story_id}")
+    parser.add_argument('--publication', help="Substack publication URL (token from SUBSTACK_SID)")
+    parser.add_argument('--status', help="Status log (default: <manifest>.status.jsonl)")
+    parser.add_argument('--resume', action='store_true', help="Skip items unchanged since they last completed")
+    parser.add_argument('--dry-run', action='store_true', help="Report what would change; write nothing")
+    for stage in STAGES:
+        parser.add_argument(f'--{stage}-workers', type=int, default=DEFAULT_LIMITS[stage],
+                            help=f"Concurrent {stage} jobs (default: {DEFAULT_LIMITS[stage]})")
+    parser.add_argument('--trace', action='store_true', help="Write a span/counter trace to logs/traces/")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    items = load_manifest(args.manifest)
+    status_path = args.status or str(Path(args.manifest).with_suffix('.status.jsonl'))
+    client = SubstackClient(args.publication, max_workers=args.substack_workers) if args.publication else None
+    pipeline = Pipeline(substack_client=client, dry_run=args.dry_run, resume=args.resume,
+                        status_log=StatusLog(status_path),
+                        limits={stage: getattr(args, f'{stage}_workers') for stage in STAGES})
+
+    print(f"[*] {len(items)} item(s) from {args.manifest}{' (dry run)' if args.dry_run else ''}")
+    with tracing('batch_reoptimize', enabled=args.trace or None) as trace:
+        report = pipeline.run(items)
+    if client is not None:
+        client.close()
+    print(format_report(report))
+    if not args.dry_run:
+        print(f"[*] Status log: {status_path}")
+    if trace is not None:
+        print(f"[*] Trace: {trace.path}")
+    return 0 if report['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
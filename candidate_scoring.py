@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Batch scoring of candidate metadata: score_candidates() from
+docs/PERFORMANCE_BACKLOG.md (user-004), implemented in this repo.
+
+The shipped OptimizationEngine only scores its own strategy results, and its
+SEO / GEO / platform-fit / voice numbers are per article and platform: all
+five strategies get the same four, only 'combined' differs. Recombined
+metadata (pareto_search.generate_candidates) needs a score per candidate, so
+this module scores title / description / tags directly:
+
+  - Features are extracted once per batch into an (N, F) array: title,
+    description and tag-count fit to the platform's target ranges, keyword
+    coverage against analysis['traditional_seo']['keywords'], numeric and
+    methodology tokens, and promotional wording.
+  - Each objective is an intercept from the article analysis plus one (F,)
+    dot product; 'combined' applies the strategy weights from
+    docs/3D_OPTIMIZATION_MATRIX.md.
+  - With a `reference` (a result the engine scored), every objective is
+    shifted so the reference scores exactly as the engine scored it, and
+    candidates differ from it only by their metadata.
+
+This is a local model, not the engine's formula. When the engine ships its
+own score_candidates(), pareto_search.engine_scorer() uses that instead.
+
+Usage:
+    from candidate_scoring import score_candidates
+    scores = score_candidates(analysis, 'substack', candidates, reference=balanced_result)
+    scores['geo']   # ndarray[N]
+"""
+import re
+
+import numpy as np
+
+OBJECTIVE_KEYS = ('seo', 'geo', 'platform_fit', 'voice_distance', 'combined')
+
+# Target ranges (inclusive); pareto_search.PLATFORM_LIMITS holds the hard limits
+PLATFORM_TARGETS = {
+    'substack': {'title': (60, 70), 'description': (120, 140), 'tags': (3, 5)},
+    'medium': {'title': (40, 100), 'description': (100, 140), 'tags': (3, 5)},
+}
+
+# combined = SEO*w1 + GEO*w2 + Platform*w3 - Voice_Distance*w4 (3D_OPTIMIZATION_MATRIX.md)
+STRATEGY_WEIGHTS = {
+    'balanced': (0.40, 0.40, 0.20, 0.0),
+    'seo_heavy': (0.70, 0.20, 0.10, 0.0),
+    'geo_heavy': (0.20, 0.70, 0.10, 0.0),
+    'platform_first': (0.30, 0.30, 0.40, 0.0),
+    'voice_preservation': (0.25, 0.25, 0.10, 0.40),
+}
+
+METHODOLOGY_TERMS = frozenset(
+    "analysis benchmark data dataset elo empirical evidence framework historical methodology metric "
+    "metrics model models quantitative regression reproducible sample statistical validated validation".split()
+)
+PROMOTIONAL_TERMS = frozenset(
+    "amazing best discover easy essential hack hacks incredible perfect secret secrets shocking "
+    "simple tips ultimate".split()
+)
+
+FEATURES = ('title_fit', 'description_fit', 'tag_fit', 'keyword_coverage',
+            'numeric', 'methodology', 'promotional')
+
+# (F, objective) points per unit feature; columns are seo, geo, platform_fit, voice_distance
+FEATURE_WEIGHTS = np.array([
+    # seo  geo  fit  voice
+    [15.0, 0.0, 30.0, 0.0],    # title_fit
+    [10.0, 10.0, 40.0, 0.0],   # description_fit
+    [0.0, 0.0, 30.0, 0.0],     # tag_fit
+    [25.0, 5.0, 0.0, 0.0],     # keyword_coverage
+    [0.0, 15.0, 0.0, 0.0],     # numeric (0-1, saturates at 3 tokens)
+    [0.0, 20.0, 0.0, 0.0],     # methodology (0-1, saturates at 3 terms)
+    [5.0, -10.0, 0.0, 40.0],   # promotional (0-1, saturates at 2 terms)
+])
+ANALYSIS_SHARE = 0.5           # share of SEO / GEO taken from the article analysis
+
+_TOKEN = re.compile(r"[A-Za-z0-9%.'-]+")
+
+
+def _range_fit(values, low, high):
+    """1.0 inside [low, high], falling linearly to 0 at zero length / twice the upper bound."""
+    values = np.asarray(values, dtype=float)
+    below = np.clip(values / low, 0.0, 1.0)
+    above = np.clip(1.0 - (values - high) / high, 0.0, 1.0)
+    return np.where(values < low, below, np.where(values > high, above, 1.0))
+
+
+def candidate_features(analysis, platform, candidates):
+    """(N, F) feature array for candidates, columns in FEATURES order."""
+    targets = PLATFORM_TARGETS.get(platform, PLATFORM_TARGETS['medium'])
+    keywords = [k.lower() for k in (analysis.get('traditional_seo') or {}).get('keywords') or ()]
+
+    titles, descriptions, tag_counts = [], [], []
+    coverage, numeric, methodology, promotional = [], [], [], []
+    for candidate in candidates:
+        title = candidate.get('title') or ''
+        description = candidate.get('description') or ''
+        titles.append(len(title))
+        descriptions.append(len(description))
+        tag_counts.append(len(candidate.get('tags') or ()))
+
+        text = f"{title} {description}".lower()
+        tokens = [t.strip(".'-") for t in _TOKEN.findall(text)]
+        coverage.append(sum(k in text for k in keywords) / len(keywords) if keywords else 0.0)
+        numeric.append(min(sum(any(ch.isdigit() for ch in t) for t in tokens), 3) / 3)
+        methodology.append(min(sum(t in METHODOLOGY_TERMS for t in tokens), 3) / 3)
+        promotional.append(min(sum(t in PROMOTIONAL_TERMS for t in tokens) + text.count('!'), 2) / 2)
+
+    return np.column_stack([
+        _range_fit(titles, *targets['title']),
+        _range_fit(descriptions, *targets['description']),
+        _range_fit(tag_counts, *targets['tags']),
+        coverage, numeric, methodology, promotional,
+    ]).reshape(len(titles), len(FEATURES))
+
+
+def _local_scores(analysis, features):
+    """Unanchored (N, 4) seo / geo / platform_fit / voice_distance scores."""
+    seo = ((analysis.get('traditional_seo') or {}).get('score') or 0) * ANALYSIS_SHARE
+    geo = ((analysis.get('geo') or {}).get('score') or 0) * ANALYSIS_SHARE
+    return np.array([seo, geo, 0.0, 0.0]) + features @ FEATURE_WEIGHTS
+
+
+def combined_score(scores, strategy='balanced'):
+    """Strategy-weighted combined score for an (N, 4) seo / geo / fit / voice array."""
+    w_seo, w_geo, w_fit, w_voice = STRATEGY_WEIGHTS.get(strategy, STRATEGY_WEIGHTS['balanced'])
+    return scores @ np.array([w_seo, w_geo, w_fit, -w_voice])
+
+
+def score_candidates(analysis, platform, candidates, strategy='balanced', reference=None):
+    """Score N candidate metadata sets for one analysis in one pass.
+
+    Args:
+        analysis: analyze_content_3d() output, shared by every candidate.
+        platform: 'medium' or 'substack'
+        candidates: [{'title': ..., 'description': ..., 'tags': [...]}, ...]
+        strategy: Weights for 'combined' (STRATEGY_WEIGHTS).
+        reference: Optional engine-scored result ({..., 'scores': {...}}).
+                   Scores are shifted so it gets exactly its engine scores.
+
+    Returns:
+        {'seo', 'geo', 'platform_fit', 'voice_distance', 'combined'}: int
+        ndarray[N] each, clipped to 0-100.
+    """
+    candidates = list(candidates)
+    scores = _local_scores(analysis, candidate_features(analysis, platform, candidates))
+    combined = combined_score(scores, strategy)
+
+    if reference is not None:
+        ref = _local_scores(analysis, candidate_features(analysis, platform, [reference]))[0]
+        engine = reference['scores']
+        scores = scores + np.array([engine[key] for key in OBJECTIVE_KEYS[:4]]) - ref
+        combined = combined + engine['combined'] - combined_score(ref, strategy)
+
+    scores = np.clip(np.rint(np.column_stack([scores, combined])), 0, 100).astype(int)
+    return {key: scores[:, i] for i, key in enumerate(OBJECTIVE_KEYS)}
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Persistent SQLite index of optimization matrix results across runs.
+
+Each run of the test matrix leaves its own optimization_results_*.json(l)
+under test/, and cross-run questions ("best strategy per article type on
+Substack over the last 30 runs") used to mean reloading every file and
+re-taking max() over all_results. This index keeps one row per
+(run, article, platform, strategy) cell - scores, tags and description -
+in a single SQLite file with indexes on article type, platform and
+strategy, so those questions are one indexed query.
+
+A run is keyed by its stream id (the timestamp in the file name). Adding a
+run that is already indexed replaces its rows, so a resumed run or a
+re-import never double-counts.
+
+Usage:
+    python catalogue_index.py add test/optimization_results_*.json
+    python catalogue_index.py best --platform substack --last 30
+    python catalogue_index.py best --by article --metric seo
+
+    with CatalogueIndex() as index:
+        index.add_results_file('test/optimization_results_20260216_190857.jsonl')
+        index.best_strategies(platform='substack', last_runs=30)
+"""
+import sys
+import json
+import sqlite3
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_INDEX = Path(__file__).resolve().parent / 'test' / 'optimization_catalogue.db'
+
+# Scores that can be ranked (higher is better); voice_distance is lower-is-better
+METRICS = ('combined', 'seo', 'geo', 'platform_fit')
+GROUP_BY = ('article_type', 'article')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    generated   TEXT,
+    source      TEXT,
+    indexed_at  TEXT
+);
+CREATE TABLE IF NOT EXISTS cells (
+    id              INTEGER PRIMARY KEY,
+    run_id          TEXT NOT NULL REFERENCES runs(run_id),
+    article         TEXT NOT NULL,
+    article_type    TEXT,
+    platform        TEXT NOT NULL,
+    strategy        TEXT NOT NULL,
+    seo             INTEGER,
+    geo             INTEGER,
+    platform_fit    INTEGER,
+    voice_distance  INTEGER,
+    combined        INTEGER,
+    description     TEXT,
+    tags            TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_generated ON runs(generated);
+CREATE INDEX IF NOT EXISTS idx_cells_run ON cells(run_id);
+CREATE INDEX IF NOT EXISTS idx_cells_article_type ON cells(article_type, platform, strategy);
+CREATE INDEX IF NOT EXISTS idx_cells_platform ON cells(platform, article_type, strategy);
+CREATE INDEX IF NOT EXISTS idx_cells_strategy ON cells(strategy, platform);
+"""
+
+# Summary row key (as written by run_test_matrix) -> column
+SUMMARY_COLUMNS = {
+    'article': 'article',
+    'article_type': 'article_type',
+    'platform': 'platform',
+    'strategy': 'strategy',
+    'seo_score': 'seo',
+    'geo_score': 'geo',
+    'platform_fit': 'platform_fit',
+    'voice_distance': 'voice_distance',
+    'combined_score': 'combined',
+    'description': 'description',
+}
+
+
+def run_id_for(path):
+    """Run id of a results file: optimization_results_20260216_190857.jsonl -> 20260216_190857."""
+    return Path(path).stem.replace('optimization_results_', '')
+
+
+def load_results_file(path):
+    """(generated, summary rows) from a results .json or .jsonl file."""
+    path = str(path)
+    if path.endswith('.jsonl'):
+        from results_store import ResultsReader
+        with ResultsReader(path) as reader:
+            return reader.generated, list(reader.iter_summary())
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('generated'), data.get('summary', [])
+
+
+class CatalogueIndex:
+    """SQLite-backed index of matrix cells across runs."""
+
+    def __init__(self, path=DEFAULT_INDEX):
+        self.path = str(path)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def add_run(self, run_id, generated, rows, source=None):
+        """Index one run's summary rows, replacing the run if already present.
+
+        rows: iterable of summary dicts as written by run_test_matrix
+        ({'article', 'article_type', 'platform', 'strategy', 'seo_score', ...,
+        'tags'}). Returns the number of cells indexed.
+        """
+        columns = list(SUMMARY_COLUMNS.values()) + ['tags']
+        values = [
+            [run_id] + [row.get(key) for key in SUMMARY_COLUMNS] + [json.dumps(row.get('tags') or [])]
+            for row in rows
+        ]
+        with self.conn:
+            self.conn.execute("DELETE FROM cells WHERE run_id = ?", (run_id,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO runs (run_id, generated, source, indexed_at) VALUES (?, ?, ?, ?)",
+                (run_id, generated, source, datetime.now().isoformat()))
+            self.conn.executemany(
+                f"INSERT INTO cells (run_id, {', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * (len(columns) + 1))})", values)
+        return len(values)
+
+    def add_results_file(self, path):
+        """Index an optimization_results_*.json or .jsonl file; return the cell count."""
+        generated, rows = load_results_file(path)
+        return self.add_run(run_id_for(path), generated, rows, source=str(path))
+
+    def runs(self, limit=None):
+        """[{'run_id', 'generated', 'source', 'cells'}, ...], newest first."""
+        sql = ("SELECT r.run_id, r.generated, r.source, COUNT(c.id) AS cells FROM runs r "
+               "LEFT JOIN cells c ON c.run_id = r.run_id GROUP BY r.run_id "
+               "ORDER BY r.generated DESC, r.run_id DESC")
+        params = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (limit,)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def best_strategies(self, by='article_type', platform=None, article_type=None,
+                        last_runs=None, metric='combined'):
+        """Best strategy per group x platform, by mean score over the selected runs.
+
+        by: 'article_type' or 'article'. last_runs limits to the N most recent
+        runs (by generated time). Ties go to the higher single best score,
+        then strategy name.
+
+        Returns:
+            [{'group', 'platform', 'strategy', 'mean', 'best', 'cells'}, ...]
+            sorted by group, platform
+        """
+        if by not in GROUP_BY:
+            raise ValueError(f"by must be one of {GROUP_BY}, got {by!r}")
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+
+        where, params = [], []
+        if platform is not None:
+            where.append("platform = ?")
+            params.append(platform)
+        if article_type is not None:
+            where.append("article_type = ?")
+            params.append(article_type)
+        if last_runs is not None:
+            where.append("run_id IN (SELECT run_id FROM runs ORDER BY generated DESC, run_id DESC LIMIT ?)")
+            params.append(last_runs)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        sql = f"""
+            WITH agg AS (
+                SELECT {by} AS grp, platform, strategy,
+                       AVG({metric}) AS mean, MAX({metric}) AS best, COUNT(*) AS cells
+                FROM cells {clause}
+                GROUP BY {by}, platform, strategy
+            ), ranked AS (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY grp, platform ORDER BY mean DESC, best DESC, strategy) AS rank
+                FROM agg
+            )
+            SELECT grp AS "group", platform, strategy, mean, best, cells
+            FROM ranked WHERE rank = 1 ORDER BY grp, platform
+        """
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def best_per_cell(self, run_id):
+        """Best strategy per article x platform in one run, by combined score.
+
+        Ties go to the strategy indexed first, matching max() over the
+        strategy dict. Returns [{'article', 'platform', 'strategy', 'seo',
+        'geo', 'platform_fit', 'voice_distance', 'combined'}, ...] in
+        indexing order.
+        """
+        sql = """
+            SELECT article, platform, strategy, seo, geo, platform_fit, voice_distance, combined
+            FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY article, platform ORDER BY combined DESC, id) AS rank
+                FROM cells WHERE run_id = ?
+            ) WHERE rank = 1 ORDER BY id
+        """
+        return [dict(row) for row in self.conn.execute(sql, (run_id,))]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-run index of optimization matrix results")
+    parser.add_argument('--db', default=str(DEFAULT_INDEX), help="SQLite index path")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="Index optimization_results_*.json(l) files")
+    add.add_argument('files', nargs='+')
+
+    best = commands.add_parser('best', help="Best strategy per article type (or article) x platform")
+    best.add_argument('--by', choices=GROUP_BY, default='article_type')
+    best.add_argument('--platform')
+    best.add_argument('--article-type')
+    best.add_argument('--last', type=int, metavar='N', help="Only the N most recent runs")
+    best.add_argument('--metric', choices=METRICS, default='combined')
+
+    commands.add_parser('runs', help="List indexed runs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with CatalogueIndex(args.db) as index:
+        if args.command == 'add':
+            for path in args.files:
+                count = index.add_results_file(path)
+                print(f"[OK] {run_id_for(path)}: {count} cells ({path})")
+
+        elif args.command == 'runs':
+            for run in index.runs():
+                print(f"  {run['run_id']:20s} {run['generated'] or '':28s} {run['cells']:5d} cells")
+
+        else:
+            rows = index.best_strategies(by=args.by, platform=args.platform,
+                                         article_type=args.article_type,
+                                         last_runs=args.last, metric=args.metric)
+            print(f"  {args.by:25s} {'Platform':10s} {'Best Strategy':22s} {'Mean':>6s} {'Best':>5s} {'Cells':>6s}")
+            print("-" * 78)
+            for row in rows:
+                print(f"  {str(row['group']):25s} {row['platform']:10s} {row['strategy']:22s} "
+                      f"{row['mean']:6.1f} {row['best']:5d} {row['cells']:6d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
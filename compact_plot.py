@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Compact, decimated 3D optimization plot for catalogue-scale result sets.
+
+OptimizationVisualizer.create_3d_plot() inlines every cell into the page as
+JSON with a pre-rendered hover string, so the HTML grows with the catalogue.
+This module keeps the points in an append-only binary file instead:
+
+  <base>.bin   fixed 14-byte records (scores as uint8, string-table indexes)
+  <base>.json  string tables (articles, strategies, platforms) and the run
+               index: which byte range each run occupies
+
+New runs are appended - earlier runs are never rewritten. The .json is
+saved after the .bin chunk, so it is the commit point: bytes past the last
+run it lists (left by a crash in between) are never read, and the next
+append overwrites them. The HTML page
+carries the records base64-encoded (typed arrays, decoded in the browser),
+builds hover text client-side from the string tables, and loads Plotly from
+the CDN rather than inlining it. Above max_points, points are aggregated
+per strategy and platform on a voxel grid; marker size shows how many
+cells each point stands for.
+
+Usage:
+    python compact_plot.py test/optimization_results_20260216_190857.json
+    python compact_plot.py results.json --max-points 2000 --out visualizations/catalogue.html
+
+    from compact_plot import PointStore, write_html
+    store = PointStore('visualizations/optimization_points')
+    store.append_run(all_results, run_id='20260216_190857')
+    write_html(store, 'visualizations/optimization_3d_compact.html')
+"""
+import os
+import sys
+import json
+import base64
+import struct
+import argparse
+import tempfile
+from collections.abc import Mapping
+from datetime import datetime
+from pathlib import Path
+
+PLOTLY_CDN = 'https://cdn.plot.ly/plotly-2.27.0.min.js'
+DEFAULT_STORE = Path(__file__).resolve().parent / 'visualizations' / 'optimization_points'
+DEFAULT_MAX_POINTS = 5000
+
+# seo, geo, voice, platform_fit, combined, strategy, platform, flags, article, run, count
+RECORD = struct.Struct('<8B3H')
+FIELDS = ('seo', 'geo', 'voice', 'platform_fit', 'combined', 'strategy', 'platform', 'flags',
+          'article', 'run', 'count')
+AGGREGATE = 0xFFFF      # article index of a decimated (aggregated) point
+
+STRATEGY_COLORS = {
+    'balanced': '#2ecc71',
+    'seo_heavy': '#3498db',
+    'geo_heavy': '#e67e22',
+    'platform_first': '#9b59b6',
+    'voice_preservation': '#e74c3c',
+}
+
+
+def _clamp(value):
+    return max(0, min(100, int(round(value))))
+
+
+class PointStore:
+    """Append-only binary store of optimization cells, one record per cell."""
+
+    def __init__(self, base=DEFAULT_STORE):
+        self.base = Path(base)
+        self.bin_path = self.base.with_suffix('.bin')
+        self.meta_path = self.base.with_suffix('.json')
+        if self.meta_path.exists():
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {'record': RECORD.format, 'fields': list(FIELDS),
+                         'articles': [], 'strategies': [], 'platforms': [], 'runs': []}
+
+    def _index(self, table, value):
+        values = self.meta[table]
+        if value not in values:
+            values.append(value)
+        return values.index(value)
+
+    def _save_meta(self):
+        self.meta_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.meta_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.meta, f, separators=(',', ':'))
+            os.replace(tmp, self.meta_path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def append_run(self, all_results, run_id=None, generated=None):
+        """Append one run's {article: {platform: {strategy: result}}}; return points written.
+
+        Re-appending the latest run (e.g. after --resume) replaces it; an
+        older run id is left alone and nothing is written.
+        """
+        run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        runs = self.meta['runs']
+        existing = [i for i, r in enumerate(runs) if r['id'] == run_id]
+        if existing and existing[0] != len(runs) - 1:
+            return 0
+        if existing:
+            offset = runs.pop()['offset']
+        else:
+            offset = self._end()
+        run_index = len(runs)
+
+        chunk = bytearray()
+        for article, platforms in all_results.items():
+            if not isinstance(platforms, Mapping) or 'error' in platforms:
+                continue
+            for platform, strategies in platforms.items():
+                for strategy, result in (strategies or {}).items():
+                    s = result.get('scores') if isinstance(result, Mapping) else None
+                    if not s:
+                        continue
+                    chunk += RECORD.pack(
+                        _clamp(s['seo']), _clamp(s['geo']), _clamp(100 - s['voice_distance']),
+                        _clamp(s['platform_fit']), _clamp(s['combined']),
+                        self._index('strategies', strategy), self._index('platforms', platform), 0,
+                        self._index('articles', article), run_index, 1)
+
+        self.bin_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.bin_path, 'r+b' if self.bin_path.exists() else 'wb') as f:
+            f.truncate(offset)
+            f.seek(offset)
+            f.write(chunk)
+        runs.append({'id': run_id, 'generated': generated or datetime.now().isoformat(timespec='seconds'),
+                     'offset': offset, 'count': len(chunk) // RECORD.size})
+        self._save_meta()
+        return len(chunk) // RECORD.size
+
+    def _end(self):
+        """End of the last run recorded in the meta (any bytes after it are uncommitted)."""
+        runs = self.meta['runs']
+        return runs[-1]['offset'] + runs[-1]['count'] * RECORD.size if runs else 0
+
+    def records(self, runs=None):
+        """Record tuples (see FIELDS) of the runs listed in the meta, optionally only the given run ids."""
+        if not self.bin_path.exists():
+            return []
+        data = self.bin_path.read_bytes()
+        out = []
+        for run in self.meta['runs']:
+            if runs is None or run['id'] in runs:
+                start = run['offset']
+                out.extend(RECORD.iter_unpack(data[start:start + run['count'] * RECORD.size]))
+        return out
+
+
+def decimate(records, max_points=DEFAULT_MAX_POINTS):
+    """Aggregate records onto a voxel grid until at most max_points remain.
+
+    Points only merge within the same strategy and platform; the merged
+    point sits at the count-weighted mean and carries the summed count.
+    """
+    if len(records) <= max_points:
+        return list(records)
+    for cell in (2, 4, 5, 10, 20, 25, 50, 101):
+        groups = {}
+        for r in records:
+            key = (r[5], r[6], r[0] // cell, r[1] // cell, r[2] // cell)
+            groups.setdefault(key, []).append(r)
+        if len(groups) <= max_points or cell == 101:
+            break
+
+    out = []
+    for (strategy, platform, *_), members in groups.items():
+        total = sum(m[10] for m in members)
+        mean = [_clamp(sum(m[i] * m[10] for m in members) / total) for i in range(5)]
+        article = members[0][8] if len(members) == 1 else AGGREGATE
+        runs = {m[9] for m in members}
+        out.append((*mean, strategy, platform, 0, article, runs.pop() if len(runs) == 1 else AGGREGATE,
+                    min(total, 0xFFFF)))
+    return out
+
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>3D Content Optimization Space</title>
+<script src="__PLOTLY__"></script>
+<style>
+  body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; margin: 0; background: #f8f9fa; color: #2c3e50; }
+  .header { background: linear-gradient(135deg, #2c3e50, #3498db); color: white; padding: 20px 32px; }
+  .header p { opacity: 0.85; font-size: 14px; margin-top: 6px; }
+  #plot { width: 100%; height: 760px; }
+</style>
+</head>
+<body>
+<div class="header"><h1>3D Content Optimization Space</h1><p id="summary"></p></div>
+<div id="plot"></div>
+<script>
+const META = __META__;
+const DATA = "__DATA__";
+const bytes = Uint8Array.from(atob(DATA), c => c.charCodeAt(0));
+const view = new DataView(bytes.buffer);
+const STRIDE = __STRIDE__, AGG = 0xFFFF;
+const n = bytes.length / STRIDE;
+const groups = {};
+let cells = 0;
+for (let i = 0; i < n; i++) {
+  const o = i * STRIDE;
+  const strategy = bytes[o + 5], platform = bytes[o + 6];
+  const article = view.getUint16(o + 8, true), run = view.getUint16(o + 10, true), count = view.getUint16(o + 12, true);
+  const g = groups[strategy] || (groups[strategy] = {x: [], y: [], z: [], size: [], symbol: [], text: []});
+  g.x.push(bytes[o]); g.y.push(bytes[o + 1]); g.z.push(bytes[o + 2]);
+  g.size.push((platform === META.medium ? 10 : 8) * Math.min(3, Math.sqrt(count)));
+  g.symbol.push(platform === META.medium ? 'square' : 'circle');
+  const head = article === AGG ? `<b>${count} cells</b> (mean)` : `<b>${META.articles[article]}</b>`;
+  const when = run === AGG || !META.runs[run] ? '' : `<br>Run: ${META.runs[run].id}`;
+  g.text.push(`${head} (${META.platforms[platform]})<br>Strategy: ${META.strategies[strategy]}` +
+              `<br>SEO: ${bytes[o]} | GEO: ${bytes[o + 1]} | Voice: ${bytes[o + 2]}` +
+              `<br>Platform Fit: ${bytes[o + 3]} | Combined: ${bytes[o + 4]}${when}`);
+  cells += count;
+}
+const traces = Object.entries(groups).map(([s, g]) => ({
+  type: 'scatter3d', mode: 'markers', name: META.strategies[s].replace(/_/g, ' '),
+  x: Uint8Array.from(g.x), y: Uint8Array.from(g.y), z: Uint8Array.from(g.z), text: g.text,
+  hovertemplate: '%{text}<extra></extra>',
+  marker: {size: g.size, symbol: g.symbol, color: META.colors[META.strategies[s]] || '#7f8c8d',
+           opacity: 0.85, line: {color: 'white', width: 1}}
+}));
+const axis = t => ({title: t, range: [0, 100], gridcolor: '#ecf0f1', backgroundcolor: '#f8f9fa'});
+document.getElementById('summary').textContent =
+  `${cells} cells from ${META.runs.length} run(s), ${n} points drawn` + (n < cells ? ' (aggregated)' : '');
+Plotly.newPlot('plot', traces, {
+  scene: {xaxis: axis('Traditional SEO Score'), yaxis: axis('GEO Score (LLM Discoverability)'),
+          zaxis: axis('Voice Preservation (Higher = More Authentic)'), camera: {eye: {x: 1.5, y: 1.5, z: 1.2}}},
+  legend: {title: {text: 'Strategy'}}, margin: {l: 0, r: 0, t: 20, b: 0}
+}, {responsive: true, displaylogo: false});
+</script>
+</body>
+</html>
+"""
+
+
+def write_html(store, out_path, max_points=DEFAULT_MAX_POINTS, runs=None, plotly_src=PLOTLY_CDN):
+    """Render the store (or the given run ids) as a compact HTML page; return the path."""
+    points = decimate(store.records(runs), max_points)
+    data = b''.join(RECORD.pack(*p) for p in points)
+    platforms = store.meta['platforms']
+    meta = {
+        'articles': store.meta['articles'],
+        'strategies': store.meta['strategies'],
+        'platforms': platforms,
+        'medium': platforms.index('medium') if 'medium' in platforms else -1,
+        'runs': [{'id': r['id']} for r in store.meta['runs']],
+        'colors': STRATEGY_COLORS,
+    }
+    html = (HTML_TEMPLATE
+            .replace('__PLOTLY__', plotly_src)
+            .replace('__STRIDE__', str(RECORD.size))
+            .replace('__META__', json.dumps(meta, separators=(',', ':')).replace('</', '<\\/'))
+            .replace('__DATA__', base64.b64encode(data).decode('ascii')))
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(html, encoding='utf-8')
+    return str(out_path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Append results to the compact point store and render it")
+    parser.add_argument('results', nargs='*', help="optimization_results_*.json files to append")
+    parser.add_argument('--store', default=str(DEFAULT_STORE), help="Point store base path (no extension)")
+    parser.add_argument('--out', default=str(DEFAULT_STORE.parent / 'optimization_3d_compact.html'))
+    parser.add_argument('--max-points', type=int, default=DEFAULT_MAX_POINTS,
+                        help=f"Aggregate above this many points (default: {DEFAULT_MAX_POINTS})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = PointStore(args.store)
+    for path in args.results:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        run_id = Path(path).stem.replace('optimization_results_', '')
+        added = store.append_run(data['results'], run_id=run_id, generated=data.get('generated'))
+        print(f"[*] {path}: {added} point(s) appended")
+    out = write_html(store, args.out, args.max_points)
+    print(f"[OK] {len(store.records())} point(s) in {store.bin_path}; plot: {out} "
+          f"({Path(out).stat().st_size / 1024:.1f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
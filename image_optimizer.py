@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Image optimization stage between markdown parsing and CDN upload.
+
+For each local image referenced by an article:
+  1. Downscale to the widest display width of the target platforms
+     (2x the column width, so retina screens stay sharp)
+  2. Recompress losslessly: drop an all-opaque alpha channel, switch to a
+     palette when the image has <= 256 colours, zlib optimize
+  3. Optionally quantize to 256 colours (lossy, big win on charts)
+  4. Optionally emit a WebP alongside the PNG
+
+Images are processed in a process pool when an article has several. Every
+result records original / optimized bytes so the saving is visible. An
+optimized file is never larger than its source: if resizing and
+recompression don't help, the original bytes are kept.
+
+Usage:
+    python image_optimizer.py chart.png heatmap.png --platforms medium substack --out build/images
+    python image_optimizer.py article/medium_draft.md --webp --quantize
+
+    from image_optimizer import optimize_article_images
+    content, results = optimize_article_images(content, base_dir, out_dir, platforms=['medium'])
+"""
+import os
+import re
+import sys
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+from instrumentation import count, span
+
+# Display column width x2 for high-DPI screens
+PLATFORM_MAX_WIDTH = {
+    'medium': 1400,      # 700px content column
+    'substack': 1456,    # 728px content column
+}
+DEFAULT_MAX_WIDTH = max(PLATFORM_MAX_WIDTH.values())
+WEBP_QUALITY = 90
+
+IMAGE_REF_RE = re.compile(r'!\[([^\]]*)\]\(([^)\s]+)((?:\s+"[^"]*")?)\)')
+OPTIMIZABLE_SUFFIXES = {'.png', '.jpg', '.jpeg'}
+
+
+def max_width_for(platforms=None):
+    """Widest display width across platforms: one CDN image serves all of them."""
+    if not platforms:
+        return DEFAULT_MAX_WIDTH
+    unknown = [p for p in platforms if p not in PLATFORM_MAX_WIDTH]
+    if unknown:
+        raise ValueError(f"Unknown platform(s): {', '.join(unknown)}")
+    return max(PLATFORM_MAX_WIDTH[p] for p in platforms)
+
+
+def _lossless_reduce(img):
+    """Smallest lossless representation of img: RGB if opaque, palette if <= 256 colours."""
+    if img.mode in ('RGBA', 'LA') and img.getchannel('A').getextrema() == (255, 255):
+        img = img.convert('RGB' if img.mode == 'RGBA' else 'L')
+    if img.mode == 'RGB':
+        colors = img.getcolors(256)
+        if colors is not None:
+            img = img.convert('P', palette=Image.Palette.ADAPTIVE, colors=len(colors))
+    return img
+
+
+def optimize_image(src, dest, max_width=DEFAULT_MAX_WIDTH, quantize=False, webp=False,
+                   webp_quality=WEBP_QUALITY):
+    """Optimize one image from src to dest; return a result dict.
+
+    Top-level so it can run in a ProcessPoolExecutor worker.
+
+    Returns:
+        {'source', 'output', 'webp', 'original_bytes', 'optimized_bytes',
+         'webp_bytes', 'bytes_saved', 'original_size', 'size', 'resized'}
+    """
+    src, dest = Path(src), Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    original_bytes = src.stat().st_size
+
+    with Image.open(src) as opened:
+        fmt = opened.format
+        dpi = opened.info.get('dpi')
+        img = opened_img = opened.copy()
+    original_size = img.size
+
+    resized = img.width > max_width
+    if resized:
+        height = round(img.height * max_width / img.width)
+        img = img.resize((max_width, height), Image.Resampling.LANCZOS)
+
+    save_kwargs = {'dpi': dpi} if dpi else {}
+    if fmt == 'PNG':
+        if quantize and img.mode not in ('P', 'L', '1'):
+            method = Image.Quantize.FASTOCTREE if img.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+            out = img.quantize(colors=256, method=method)
+        else:
+            out = _lossless_reduce(img)
+        out.save(dest, 'PNG', optimize=True, **save_kwargs)
+    else:
+        out = img.convert('RGB') if img.mode not in ('RGB', 'L') else img
+        out.save(dest, 'JPEG', quality=90, optimize=True, progressive=True, **save_kwargs)
+
+    # Didn't pay off (a small downscale adds antialiased colours): keep the source
+    if dest.stat().st_size >= original_bytes:
+        shutil.copyfile(src, dest)
+        img, resized = opened_img, False
+    optimized_bytes = dest.stat().st_size
+
+    webp_path, webp_bytes = None, None
+    if webp:
+        webp_path = dest.with_suffix('.webp')
+        img.save(webp_path, 'WEBP', quality=webp_quality, method=6, lossless=(fmt == 'PNG' and not quantize))
+        webp_bytes = webp_path.stat().st_size
+
+    return {
+        'source': str(src),
+        'output': str(dest),
+        'webp': str(webp_path) if webp_path else None,
+        'original_bytes': original_bytes,
+        'optimized_bytes': optimized_bytes,
+        'webp_bytes': webp_bytes,
+        'bytes_saved': original_bytes - optimized_bytes,
+        'original_size': list(original_size),
+        'size': list(img.size),
+        'resized': resized,
+    }
+
+
+def optimize_images(paths, out_dir, platforms=None, quantize=False, webp=False, workers=None):
+    """Optimize many images into out_dir; results are in input order.
+
+    Duplicate input paths are optimized once; distinct files with the same
+    name get a numeric suffix so they don't overwrite each other.
+    """
+    out_dir = Path(out_dir)
+    max_width = max_width_for(platforms)
+
+    jobs = {}          # resolved source -> dest
+    used = set()
+    for path in paths:
+        key = Path(path).resolve()
+        if key in jobs:
+            continue
+        suffix = '.png' if key.suffix.lower() == '.png' else '.jpg'
+        dest = out_dir / f"{key.stem}{suffix}"
+        n = 2
+        while dest in used:
+            dest = out_dir / f"{key.stem}_{n}{suffix}"
+            n += 1
+        used.add(dest)
+        jobs[key] = dest
+
+    args = [(src, dest, max_width, quantize, webp) for src, dest in jobs.items()]
+    workers = min(workers or os.cpu_count() or 1, len(args))
+    with span('image_optimizer.optimize_images', images=len(args), workers=workers):
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                done = list(pool.map(optimize_image, *zip(*args)))
+        else:
+            done = [optimize_image(*a) for a in args]
+    count('images.optimized', len(done))
+    count('images.bytes_saved', sum(r['bytes_saved'] for r in done))
+
+    by_source = dict(zip(jobs, done))
+    return [by_source[Path(path).resolve()] for path in paths]
+
+
+def local_image_refs(content, base_dir):
+    """Local image paths referenced by markdown content, resolved against base_dir."""
+    refs = []
+    for match in IMAGE_REF_RE.finditer(content):
+        target = match.group(2)
+        if re.match(r'^[a-z][a-z0-9+.-]*://', target, re.IGNORECASE):
+            continue
+        path = Path(base_dir) / target
+        if path.suffix.lower() in OPTIMIZABLE_SUFFIXES and path.exists():
+            refs.append((match, path))
+    return refs
+
+
+def optimize_article_images(content, base_dir, out_dir, platforms=None, quantize=False,
+                            webp=False, workers=None):
+    """Optimize every local image in an article and point its refs at the output.
+
+    Returns:
+        (content with rewritten image paths, [result dict per unique image])
+    """
+    refs = local_image_refs(content, base_dir)
+    if not refs:
+        return content, []
+
+    unique = list(dict.fromkeys(path.resolve() for _, path in refs))
+    results = optimize_images(unique, out_dir, platforms, quantize, webp, workers)
+    output_for = {path: Path(r['output']).as_posix() for path, r in zip(unique, results)}
+
+    pieces, pos = [], 0
+    for match, path in refs:
+        pieces.append(content[pos:match.start()])
+        pieces.append(f"![{match.group(1)}]({output_for[path.resolve()]}{match.group(3)})")
+        pos = match.end()
+    pieces.append(content[pos:])
+    return ''.join(pieces), results
+
+
+def summarize(results):
+    original = sum(r['original_bytes'] for r in results)
+    optimized = sum(r['optimized_bytes'] for r in results)
+    return {
+        'images': len(results),
+        'original_bytes': original,
+        'optimized_bytes': optimized,
+        'bytes_saved': original - optimized,
+        'percent_saved': round(100 * (original - optimized) / original, 1) if original else 0.0,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Resize and recompress images before CDN upload")
+    parser.add_argument('inputs', nargs='+', help="Image files, or one markdown article")
+    parser.add_argument('--out', default='optimized_images', help="Output directory (default: optimized_images)")
+    parser.add_argument('--platforms', nargs='+', choices=sorted(PLATFORM_MAX_WIDTH),
+                        help="Target platforms; width is the widest of them (default: all)")
+    parser.add_argument('--quantize', action='store_true', help="Quantize PNGs to 256 colours (lossy)")
+    parser.add_argument('--webp', action='store_true', help="Also write a WebP next to each image")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if len(args.inputs) == 1 and args.inputs[0].endswith('.md'):
+        article = Path(args.inputs[0])
+        _, results = optimize_article_images(article.read_text(encoding='utf-8'), article.parent, args.out,
+                                             args.platforms, args.quantize, args.webp, args.workers)
+    else:
+        results = optimize_images(args.inputs, args.out, args.platforms, args.quantize, args.webp, args.workers)
+
+    for r in results:
+        size = f"{r['original_size'][0]}x{r['original_size'][1]} -> {r['size'][0]}x{r['size'][1]}"
+        webp = f", webp {r['webp_bytes'] / 1024:.0f} KB" if r['webp'] else ''
+        print(f"  {Path(r['source']).name:32s} {size:24s} "
+              f"{r['original_bytes'] / 1024:6.0f} KB -> {r['optimized_bytes'] / 1024:6.0f} KB{webp}")
+    total = summarize(results)
+    print(f"[OK] {total['images']} image(s): saved {total['bytes_saved'] / 1024:.0f} KB "
+          f"({total['percent_saved']}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Incremental, per-section re-analysis for edit -> rescore loops.
+
+Splits an article into heading-delimited sections (the same chunks the GEO
+"Semantic Structure" dimension scores), analyzes each section on its own and
+caches the result by section content hash. After an edit only the sections
+whose bytes changed go back through MultiDimAnalyzer; the document totals are
+then re-aggregated, weighted by section word count.
+
+The aggregate is an approximation of a whole-document analyze_content_3d()
+run - good for tracking the effect of an edit, not a replacement for the
+final pre-publish analysis.
+
+Usage:
+    python incremental_analyzer.py article/medium_draft.md
+"""
+import sys
+import re
+import tempfile
+from pathlib import Path
+
+# Shared publishing tools on sys.path
+import shared_tools  # noqa: F401
+
+from analysis_cache import AnalysisCache, DEFAULT_CACHE_DIR, analyzer_version
+
+FRONTMATTER_RE = re.compile(r'\A---\r?\n.*?\r?\n---[ \t]*\r?\n', re.DOTALL)
+HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t#]*$')
+FENCE_RE = re.compile(r'^[ \t]*(```|~~~)')
+WORD_RE = re.compile(r'\S+')
+
+# Numeric leaves that count things in the text: summed across sections.
+# Every other number (scores, ratios, total_score, ...) is word-weighted averaged.
+ADDITIVE_KEYS = frozenset({
+    'word_count', 'sentence_count', 'paragraph_count', 'heading_count', 'image_count',
+    'table_count', 'link_count', 'total_links', 'code_block_count',
+})
+
+
+def split_frontmatter(markdown):
+    """Return (frontmatter_block, body). frontmatter_block is '' if absent."""
+    match = FRONTMATTER_RE.match(markdown)
+    if not match:
+        return '', markdown
+    return match.group(0), markdown[match.end():]
+
+
+def split_sections(body, max_level=2):
+    """Split markdown body into heading-delimited sections.
+
+    A new section starts at every ATX heading of level <= max_level that is
+    not inside a fenced code block. Text before the first such heading is
+    the preamble section (heading None); a blank preamble is folded into
+    the first section instead.
+
+    Returns:
+        [{'heading': str or None, 'level': int, 'text': str}, ...]
+        Joining every section's text reproduces body exactly.
+    """
+    sections = []
+    current = {'heading': None, 'level': 0, 'lines': []}
+    in_fence = False
+
+    for line in body.splitlines(keepends=True):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = HEADING_RE.match(line.rstrip('\r\n'))
+            if match and len(match.group(1)) <= max_level:
+                sections.append(current)
+                current = {'heading': match.group(2), 'level': len(match.group(1)), 'lines': []}
+        current['lines'].append(line)
+    sections.append(current)
+
+    result = []
+    carry = ''
+    for section in sections:
+        text = carry + ''.join(section['lines'])
+        carry = ''
+        if section['heading'] is None and not text.strip():
+            carry = text   # blank preamble folds into the first real section
+            continue
+        result.append({'heading': section['heading'], 'level': section['level'], 'text': text})
+    return result
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _merge(values, weights, key=''):
+    """Recursively merge one field across section analyses.
+
+    Numbers -> word-weighted mean (sum for ADDITIVE_KEYS), ints stay ints.
+    Bools -> all(). Dicts -> merged per key. Lists -> ordered de-duplicated
+    union. Anything else -> first section's value.
+    """
+    present = [(v, w) for v, w in zip(values, weights) if v is not None]
+    if not present:
+        return None
+    first = present[0][0]
+
+    if isinstance(first, bool):
+        return all(bool(v) for v, _ in present)
+
+    if _is_number(first) and all(_is_number(v) for v, _ in present):
+        if key in ADDITIVE_KEYS:
+            total = sum(v for v, _ in present)
+        else:
+            weight_sum = sum(w for _, w in present) or len(present)
+            total = sum(v * (w or 1) for v, w in present) / weight_sum
+        if all(isinstance(v, int) for v, _ in present):
+            return int(round(total))
+        return round(total, 2)
+
+    if isinstance(first, dict):
+        keys = []
+        for v, _ in present:
+            if isinstance(v, dict):
+                keys.extend(k for k in v if k not in keys)
+        return {
+            k: _merge([v.get(k) if isinstance(v, dict) else None for v, _ in present],
+                      [w for _, w in present], k)
+            for k in keys
+        }
+
+    if isinstance(first, list):
+        merged = []
+        for v, _ in present:
+            for item in v if isinstance(v, list) else []:
+                if item not in merged:
+                    merged.append(item)
+        return merged
+
+    return first
+
+
+def aggregate_sections(section_analyses, word_counts):
+    """Combine per-section analyses into one analyze_content_3d()-shaped dict.
+
+    traditional_seo.grade is taken from the section whose SEO score is
+    closest to the aggregate, so the analyzer's own grade thresholds apply.
+    """
+    analysis = _merge(section_analyses, word_counts)
+
+    seo = analysis.get('traditional_seo') if isinstance(analysis, dict) else None
+    if isinstance(seo, dict) and _is_number(seo.get('score')):
+        graded = [a['traditional_seo'] for a in section_analyses
+                  if isinstance(a.get('traditional_seo'), dict) and 'grade' in a['traditional_seo']]
+        if graded:
+            nearest = min(graded, key=lambda s: abs(s.get('score', 0) - seo['score']))
+            seo['grade'] = nearest['grade']
+    return analysis
+
+
+class IncrementalAnalyzer:
+    """analyze_content_3d() that only re-analyzes sections whose content changed."""
+
+    def __init__(self, analyzer=None, cache=None, max_level=2):
+        if analyzer is None:
+            from multi_dim_analyzer import MultiDimAnalyzer
+            analyzer = MultiDimAnalyzer()
+        if cache is None:
+            cache = AnalysisCache(DEFAULT_CACHE_DIR.parent / 'sections',
+                                  analyzer_version=analyzer_version())
+        self.analyzer = analyzer
+        self.cache = cache
+        self.max_level = max_level
+        self.last_sections = []   # per-section report from the most recent call
+
+    def analyze_content_3d(self, article_path):
+        """Analyze article_path section by section, reusing unchanged sections.
+
+        Returns the aggregated analysis plus a 'sections' list:
+            [{'heading', 'words', 'key', 'reused', 'analysis'}, ...]
+        """
+        markdown = Path(article_path).read_text(encoding='utf-8')
+        frontmatter, body = split_frontmatter(markdown)
+        sections = split_sections(body, self.max_level)
+        if not sections:
+            sections = [{'heading': None, 'level': 0, 'text': body}]
+
+        report = []
+        with tempfile.TemporaryDirectory() as tmp:
+            for i, section in enumerate(sections):
+                # Every section carries the frontmatter so metadata-driven
+                # factors (title, tags, meta description) score consistently
+                source = frontmatter + section['text']
+                key = self.cache.key(source.encode('utf-8'))
+
+                analysis = self.cache.get(key)
+                reused = analysis is not None
+                if not reused:
+                    section_path = Path(tmp) / f"section_{i:03d}.md"
+                    section_path.write_text(source, encoding='utf-8')
+                    analysis = self.analyzer.analyze_content_3d(str(section_path))
+                    self.cache.put(key, analysis)
+
+                report.append({
+                    'heading': section['heading'],
+                    'words': len(WORD_RE.findall(section['text'])),
+                    'key': key,
+                    'reused': reused,
+                    'analysis': analysis,
+                })
+
+        aggregated = aggregate_sections([s['analysis'] for s in report],
+                                        [s['words'] for s in report])
+        aggregated['sections'] = report
+        self.last_sections = report
+        return aggregated
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python incremental_analyzer.py <article.md>")
+        sys.exit(1)
+
+    analyzer = IncrementalAnalyzer()
+    analysis = analyzer.analyze_content_3d(sys.argv[1])
+    sections = analysis['sections']
+    reused = sum(1 for s in sections if s['reused'])
+
+    print(f"[*] Sections: {len(sections)} ({reused} reused, {len(sections) - reused} re-analyzed)")
+    for s in sections:
+        flag = 'cached' if s['reused'] else 'NEW'
+        print(f"    [{flag:6s}] {s['words']:5d} words  {s['heading'] or '(preamble)'}")
+    print(f"[OK] Traditional SEO: {analysis['traditional_seo']['score']}/100 "
+          f"({analysis['traditional_seo'].get('grade', '?')})")
+    print(f"[OK] GEO: {analysis['geo']['score']}/100")
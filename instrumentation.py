@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Timing spans, counters and profiling hooks for the publishing pipeline.
+
+The scripts only print progress banners, so when a publish misses its
+5-minute target there's no record of where the time went. Call sites wrap
+their hot paths in span() and bump counters with count(); while a trace is
+active both are recorded, and otherwise they cost a global lookup.
+
+    with tracing('publish'):                    # or PUBLISHING_TRACE=1
+        with span('analysis', article=name):
+            ...
+        count('images.uploaded', 3)
+    # -> logs/traces/publish_20260217_140000.json
+
+A trace file has every span (name, start offset, elapsed, thread, parent
+span, attributes), the counters, a per-name summary (count / total / max)
+and, if profiling was on, the top functions:
+
+  PUBLISHING_PROFILE=cprofile   cProfile on the tracing thread (.prof saved
+                                alongside, for snakeviz / pstats)
+  PUBLISHING_PROFILE=sample     stack sampler over every thread (catches
+                                worker threads cProfile can't see)
+
+Worker processes can't add to the parent's trace directly: wrap the worker
+function in capture(), return its data, and absorb() it in the parent.
+
+Usage:
+    python instrumentation.py show logs/traces/publish_20260217_140000.json
+    python instrumentation.py compare before.json after.json
+"""
+import os
+import sys
+import json
+import time
+import cProfile
+import pstats
+import argparse
+import functools
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+TRACE_ENV = 'PUBLISHING_TRACE'
+PROFILE_ENV = 'PUBLISHING_PROFILE'
+DEFAULT_TRACE_DIR = 'logs/traces'
+PROFILE_TOP = 30
+SAMPLE_INTERVAL = 0.005        # seconds between stack samples
+
+_trace = None                                     # the active Trace in this process
+_parent = contextvars.ContextVar('instrumentation_parent', default=None)
+
+
+class _Sampler(threading.Thread):
+    """Samples every other thread's stack at a fixed interval."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(name='trace-sampler', daemon=True)
+        self.interval = interval
+        self.samples = 0
+        self.inclusive = Counter()   # function -> samples with it anywhere on the stack
+        self.exclusive = Counter()   # function -> samples with it on top
+        self._stop_event = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                self.samples += 1
+                seen = set()
+                leaf = True
+                while frame is not None:
+                    code = frame.f_code
+                    key = f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+                    if leaf:
+                        self.exclusive[key] += 1
+                        leaf = False
+                    if key not in seen:
+                        seen.add(key)
+                        self.inclusive[key] += 1
+                    frame = frame.f_back
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def top(self, limit=PROFILE_TOP):
+        return [{'function': key, 'samples': n, 'self_samples': self.exclusive[key]}
+                for key, n in self.inclusive.most_common(limit)]
+
+
+class Trace:
+    """Spans and counters collected during one run."""
+
+    def __init__(self, name, profile=None):
+        if profile not in (None, 'cprofile', 'sample'):
+            raise ValueError(f"profile must be 'cprofile' or 'sample', got {profile!r}")
+        self.name = name
+        self.pid = os.getpid()
+        self.started = datetime.now()
+        self.started_epoch = time.time()
+        self.t0 = time.perf_counter()
+        self.spans = []
+        self.counters = {}
+        self.profile_mode = profile
+        self.profile = None
+        self.path = None
+        self._ids = 0
+        self._lock = threading.Lock()
+        self._profiler = None
+        if profile == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif profile == 'sample':
+            self._profiler = _Sampler()
+            self._profiler.start()
+
+    def new_id(self):
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def record(self, span_id, parent, name, start, end, attrs):
+        entry = {'id': span_id, 'parent': parent, 'name': name,
+                 'start': round(start - self.t0, 6), 'elapsed': round(end - start, 6),
+                 'thread': threading.current_thread().name}
+        if attrs:
+            entry['attrs'] = attrs
+        with self._lock:
+            self.spans.append(entry)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def stop_profiler(self):
+        if self._profiler is None:
+            return None
+        profiler, self._profiler = self._profiler, None
+        if isinstance(profiler, _Sampler):
+            profiler.stop()
+            self.profile = {'mode': 'sample', 'interval': profiler.interval,
+                            'samples': profiler.samples, 'top': profiler.top()}
+            return None
+        profiler.disable()
+        stats = pstats.Stats(profiler)
+        rows = sorted(stats.stats.items(), key=lambda kv: -kv[1][3])[:PROFILE_TOP]
+        self.profile = {'mode': 'cprofile', 'top': [
+            {'function': f"{filename}:{line}({func})", 'calls': nc, 'tottime': round(tt, 6),
+             'cumtime': round(ct, 6)}
+            for (filename, line, func), (cc, nc, tt, ct, callers) in rows]}
+        return stats
+
+    def data(self):
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s['start'])
+            counters = dict(sorted(self.counters.items()))
+        return {
+            'name': self.name,
+            'started': self.started.isoformat(timespec='seconds'),
+            'started_epoch': self.started_epoch,
+            'wall_time': round(time.perf_counter() - self.t0, 6),
+            'pid': self.pid,
+            'summary': summarize(spans),
+            'counters': counters,
+            'spans': spans,
+            'profile': self.profile,
+        }
+
+    def absorb(self, data, thread_prefix=None):
+        """Merge a trace from another process (see capture()), re-basing times and ids."""
+        if not data:
+            return
+        offset = data['started_epoch'] - self.started_epoch
+        prefix = thread_prefix or f"pid{data.get('pid')}"
+        with self._lock:
+            base = self._ids
+            self._ids += max((s['id'] for s in data['spans']), default=0)
+            for s in data['spans']:
+                self.spans.append(dict(s, id=s['id'] + base,
+                                       parent=s['parent'] + base if s['parent'] is not None else _parent.get(),
+                                       start=round(s['start'] + offset, 6),
+                                       thread=f"{prefix}/{s['thread']}"))
+            for name, n in data['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + n
+
+
+def summarize(spans):
+    """{span name: {'count', 'total', 'max'}} ordered by total time, largest first."""
+    summary = {}
+    for s in spans:
+        entry = summary.setdefault(s['name'], {'count': 0, 'total': 0.0, 'max': 0.0})
+        entry['count'] += 1
+        entry['total'] += s['elapsed']
+        entry['max'] = max(entry['max'], s['elapsed'])
+    for entry in summary.values():
+        entry['total'] = round(entry['total'], 6)
+    return dict(sorted(summary.items(), key=lambda kv: -kv[1]['total']))
+
+
+# =====================================================================
+# RECORDING API (no-ops unless a trace is active)
+# =====================================================================
+
+def active():
+    """The active Trace, or None."""
+    return _trace
+
+
+@contextmanager
+def span(name, **attrs):
+    """Time the enclosed block as a span; nested spans record their parent."""
+    trace = _trace
+    if trace is None:
+        yield
+        return
+    span_id = trace.new_id()
+    parent = _parent.get()
+    token = _parent.set(span_id)
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        attrs['error'] = type(e).__name__
+        raise
+    finally:
+        end = time.perf_counter()
+        _parent.reset(token)
+        trace.record(span_id, parent, name, start, end, attrs)
+
+
+def traced(name=None):
+    """Decorator: run the function inside span(name or its qualified name)."""
+    def decorate(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _trace is None:
+                return fn(*args, **kwargs)
+            with span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, n=1):
+    """Add n to a counter (cache hits, images uploaded, API calls, ...)."""
+    trace = _trace
+    if trace is not None:
+        trace.count(name, n)
+
+
+# =====================================================================
+# TRACE LIFECYCLE
+# =====================================================================
+
+def start_trace(name, profile=None):
+    """Start collecting into a new Trace (replacing any active one) and return it."""
+    global _trace
+    _trace = Trace(name, profile)
+    return _trace
+
+
+def finish_trace(out_dir=DEFAULT_TRACE_DIR):
+    """Stop the active trace and write it to out_dir; return the file path (None if no trace)."""
+    global _trace
+    trace, _trace = _trace, None
+    if trace is None:
+        return None
+    stats = trace.stop_profiler()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"{trace.name}_{trace.started.strftime('%Y%m%d_%H%M%S')}"
+    path = out_dir / f"{stem}.json"
+    n = 2
+    while path.exists():
+        path = out_dir / f"{stem}_{n}.json"
+        n += 1
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(trace.data(), f, indent=2, default=str)
+    if stats is not None:
+        stats.dump_stats(str(path.with_suffix('.prof')))
+    trace.path = path
+    return path
+
+
+def enabled_from_env():
+    return os.environ.get(TRACE_ENV, '') not in ('', '0')
+
+
+@contextmanager
+def tracing(name, enabled=None, profile=None, out_dir=DEFAULT_TRACE_DIR):
+    """Trace the enclosed run if enabled (default: PUBLISHING_TRACE); yield the Trace or None.
+
+    profile defaults to PUBLISHING_PROFILE. While active, TRACE_ENV is set so
+    worker processes started inside the block know to capture() their spans.
+    The written path is on the yielded trace's .path afterwards.
+    """
+    if enabled is None:
+        enabled = enabled_from_env() or bool(profile)
+    if not enabled:
+        yield None
+        return
+    previous = os.environ.get(TRACE_ENV)
+    os.environ[TRACE_ENV] = '1'
+    trace = start_trace(name, profile or os.environ.get(PROFILE_ENV) or None)
+    try:
+        yield trace
+    finally:
+        if _trace is trace:
+            finish_trace(out_dir)
+        if previous is None:
+            os.environ.pop(TRACE_ENV, None)
+        else:
+            os.environ[TRACE_ENV] = previous
+
+
+class _Capture:
+    def __init__(self, trace):
+        self.trace = trace
+        self.data = None
+
+
+@contextmanager
+def capture(name='worker'):
+    """For worker processes: collect spans locally when the parent is tracing.
+
+    In the tracing process itself (or when tracing is off) spans go where
+    they normally would and .data stays None. In a worker started under
+    tracing(), .data holds the worker's trace after the block, for the
+    parent to absorb().
+    """
+    global _trace
+    # A forked worker inherits the parent's _trace; that copy is never written out
+    if (_trace is not None and _trace.pid == os.getpid()) or not enabled_from_env():
+        yield _Capture(None)
+        return
+    result = _Capture(start_trace(name))
+    try:
+        yield result
+    finally:
+        trace, _trace = _trace, None
+        result.data = trace.data() if trace is not None else None
+
+
+def absorb(data):
+    """Merge a worker's capture() data into the active trace."""
+    if _trace is not None and data:
+        _trace.absorb(data)
+
+
+# =====================================================================
+# READING TRACES
+# =====================================================================
+
+def load_trace(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def format_summary(data, limit=25):
+    lines = [f"Trace: {data['name']} ({data['started']}, wall {data['wall_time']:.2f}s)",
+             f"  {'Span':40s} {'Count':>6s} {'Total':>10s} {'Max':>10s}",
+             "-" * 70]
+    for name, s in list(data['summary'].items())[:limit]:
+        lines.append(f"  {name:40s} {s['count']:6d} {s['total']:9.3f}s {s['max']:9.3f}s")
+    if data['counters']:
+        lines.append("-" * 70)
+        for name, n in data['counters'].items():
+            lines.append(f"  {name:40s} {n:>6}")
+    if data.get('profile'):
+        lines.append("-" * 70)
+        lines.append(f"  Top functions ({data['profile']['mode']}):")
+        for row in data['profile']['top'][:10]:
+            weight = f"{row['cumtime']:9.3f}s" if 'cumtime' in row else f"{row['samples']:7d} smp"
+            lines.append(f"  {weight}  {row['function']}")
+    return '\n'.join(lines)
+
+
+def compare_traces(before, after):
+    """Per-span and per-counter deltas between two trace dicts.
+
+    Returns:
+        {'wall_time': (before, after),
+         'spans': {name: {'before', 'after', 'delta', 'pct'}}  (total seconds),
+         'counters': {name: {'before', 'after', 'delta'}}}
+    """
+    spans = {}
+    for name in dict.fromkeys([*before['summary'], *after['summary']]):
+        b = before['summary'].get(name, {}).get('total', 0.0)
+        a = after['summary'].get(name, {}).get('total', 0.0)
+        spans[name] = {'before': b, 'after': a, 'delta': round(a - b, 6),
+                       'pct': round(100 * (a - b) / b, 1) if b else None}
+    counters = {}
+    for name in dict.fromkeys([*before['counters'], *after['counters']]):
+        b, a = before['counters'].get(name, 0), after['counters'].get(name, 0)
+        counters[name] = {'before': b, 'after': a, 'delta': a - b}
+    return {'wall_time': (before['wall_time'], after['wall_time']), 'spans': spans, 'counters': counters}
+
+
+def format_comparison(diff):
+    b, a = diff['wall_time']
+    lines = [f"  {'Span':40s} {'Before':>9s} {'After':>9s} {'Change':>9s}", "-" * 72,
+             f"  {'wall time':40s} {b:8.3f}s {a:8.3f}s {a - b:+8.3f}s"]
+    for name, d in sorted(diff['spans'].items(), key=lambda kv: -abs(kv[1]['delta'])):
+        pct = f" ({d['pct']:+.0f}%)" if d['pct'] is not None else ''
+        lines.append(f"  {name:40s} {d['before']:8.3f}s {d['after']:8.3f}s {d['delta']:+8.3f}s{pct}")
+    if diff['counters']:
+        lines.append("-" * 72)
+        for name, d in diff['counters'].items():
+            lines.append(f"  {name:40s} {d['before']:9} {d['after']:9} {d['delta']:+9}")
+    return '\n'.join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and compare pipeline trace files")
+    commands = parser.add_subparsers(dest='command', required=True)
+    show = commands.add_parser('show', help="Summarize one trace")
+    show.add_argument('trace')
+    compare = commands.add_parser('compare', help="Compare two traces span by span")
+    compare.add_argument('before')
+    compare.add_argument('after')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'show':
+        print(format_summary(load_trace(args.trace)))
+    else:
+        print(format_comparison(compare_traces(load_trace(args.before), load_trace(args.after))))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
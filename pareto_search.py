@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Pareto-front search over OptimizationEngine candidates.
+
+Treats metadata selection as the multi-objective problem described in
+docs/3D_OPTIMIZATION_MATRIX.md: maximize SEO, GEO and platform fit, minimize
+voice distance, subject to a voice-distance bound and hard platform limits.
+
+Candidates are the engine's strategy results followed by recombinations of
+them: every title x description x tag list drawn from the strategies and
+their 'alternatives' (generate_candidates). Candidates that break a hard
+limit (Substack's 140-char description, Medium's 5 topics, ...) are
+rejected before they are scored, and the search stops consuming candidates
+once its time budget is spent. The same budget bounds the non-dominated
+sort that follows.
+
+Generated candidates need scoring. engine_scorer() uses the engine's batch
+score_candidates() (proposed upstream in docs/PERFORMANCE_BACKLOG.md) and
+falls back to candidate_scoring.score_candidates(), anchored on the
+engine's own result for the strategy.
+
+Usage:
+    from pareto_search import optimize_pareto
+    result = optimize_pareto(engine, analysis, 'substack', time_budget=2.0)
+    for candidate in result['front']:
+        print(candidate['strategy'], candidate['scores'])
+"""
+import time
+from itertools import product
+
+from candidate_scoring import score_candidates as local_score_candidates
+
+# Hard limits only - anything here is a rejection, not a warning
+PLATFORM_LIMITS = {
+    'substack': {'title': 70, 'description': 140, 'tags': 5},
+    'medium': {'title': 100, 'description': 140, 'tags': 5},
+}
+
+# (score key, +1 maximize / -1 minimize)
+OBJECTIVES = [
+    ('seo', 1),
+    ('geo', 1),
+    ('platform_fit', 1),
+    ('voice_distance', -1),
+]
+
+DEFAULT_VOICE_BOUND = 20      # same units as scores['voice_distance']
+DEFAULT_TIME_BUDGET = 5.0     # seconds
+
+
+def limit_violations(candidate, platform):
+    """Return a list of hard-limit violations for candidate metadata (empty = OK)."""
+    limits = PLATFORM_LIMITS.get(platform, {})
+    errors = []
+    for field in ('title', 'description'):
+        value = candidate.get(field) or ''
+        if field in limits and len(value) > limits[field]:
+            errors.append(f"{field} {len(value)} chars > {limits[field]}")
+    tags = candidate.get('tags') or []
+    if 'tags' in limits and len(tags) > limits['tags']:
+        errors.append(f"{len(tags)} tags > {limits['tags']}")
+    return errors
+
+
+def objective_vector(candidate):
+    """Scores as a tuple where larger is better on every axis."""
+    scores = candidate['scores']
+    return tuple(sign * scores[key] for key, sign in OBJECTIVES)
+
+
+def dominates(a, b):
+    """True if objective vector a is no worse than b everywhere and better somewhere."""
+    return all(x >= y for x, y in zip(a, b)) and any(x > y for x, y in zip(a, b))
+
+
+def non_dominated_sort(candidates, deadline=None):
+    """Fast non-dominated sort (Deb et al., NSGA-II).
+
+    Args:
+        deadline: time.perf_counter() value to stop comparing at (None = no
+                  limit). Fronts are then built from the comparisons made so
+                  far, so fronts[0] still holds every non-dominated candidate
+                  but may also hold some dominated ones.
+
+    Returns:
+        List of fronts, each a list of indexes into candidates. fronts[0] is
+        the Pareto front.
+    """
+    vectors = [objective_vector(c) for c in candidates]
+    n = len(vectors)
+    dominated_by = [[] for _ in range(n)]   # i dominates these
+    domination_count = [0] * n              # how many dominate i
+
+    for i in range(n):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        for j in range(i + 1, n):
+            if dominates(vectors[i], vectors[j]):
+                dominated_by[i].append(j)
+                domination_count[j] += 1
+            elif dominates(vectors[j], vectors[i]):
+                dominated_by[j].append(i)
+                domination_count[i] += 1
+
+    fronts = [[i for i in range(n) if domination_count[i] == 0]]
+
+    current = 0
+    while fronts[current]:
+        next_front = []
+        for i in fronts[current]:
+            for j in dominated_by[i]:
+                domination_count[j] -= 1
+                if domination_count[j] == 0:
+                    next_front.append(j)
+        current += 1
+        fronts.append(sorted(next_front))
+    return fronts[:-1]
+
+
+def pareto_search(candidates, platform, voice_bound=DEFAULT_VOICE_BOUND,
+                  time_budget=DEFAULT_TIME_BUDGET, score_fn=None):
+    """Consume candidates until exhausted or out of time; return the Pareto front.
+
+    Args:
+        candidates: Iterable (may be a lazy generator) of metadata dicts. Dicts
+                    without 'scores' are scored with score_fn after passing
+                    the platform limit check, or counted as unscored if
+                    there is no score_fn.
+        platform: 'medium' or 'substack'
+        voice_bound: Reject candidates whose voice_distance exceeds this.
+        time_budget: Seconds to spend consuming and sorting candidates (None = no limit).
+        score_fn: Callable(candidate) -> scores dict, for unscored candidates.
+
+    Returns:
+        {
+            'front': [...],        # non-dominated feasible candidates, best combined first
+            'evaluated': int,      # candidates scored and kept as feasible
+            'rejected': {'limits': int, 'voice': int, 'unscored': int},
+            'elapsed': float,
+            'timed_out': bool,     # candidates left unconsumed, or the sort was cut short
+        }
+    """
+    start = time.perf_counter()
+    deadline = start + time_budget if time_budget is not None else None
+    feasible = []
+    rejected = {'limits': 0, 'voice': 0, 'unscored': 0}
+    timed_out = False
+
+    for candidate in candidates:
+        if deadline is not None and time.perf_counter() > deadline:
+            timed_out = True
+            break
+
+        # Early rejection: hard limits are checked on raw metadata, before scoring
+        if limit_violations(candidate, platform):
+            rejected['limits'] += 1
+            continue
+
+        if 'scores' not in candidate:
+            if score_fn is None:
+                rejected['unscored'] += 1
+                continue
+            candidate = dict(candidate, scores=score_fn(candidate))
+
+        if candidate['scores']['voice_distance'] > voice_bound:
+            rejected['voice'] += 1
+            continue
+
+        feasible.append(candidate)
+
+    front = []
+    if feasible:
+        front = [feasible[i] for i in non_dominated_sort(feasible, deadline)[0]]
+        timed_out = timed_out or (deadline is not None and time.perf_counter() > deadline)
+        front.sort(key=lambda c: c['scores'].get('combined', 0), reverse=True)
+
+    return {
+        'front': front,
+        'evaluated': len(feasible),
+        'rejected': rejected,
+        'elapsed': round(time.perf_counter() - start, 4),
+        'timed_out': timed_out,
+    }
+
+
+def engine_candidates(engine, analysis, platform):
+    """Lazily yield every scored strategy result from an OptimizationEngine."""
+    for strategy, result in engine.optimize_all_strategies(analysis, platform).items():
+        yield dict(result, strategy=result.get('strategy', strategy))
+
+
+def generate_candidates(results):
+    """Lazily yield unscored recombinations of strategy results and their alternatives.
+
+    Titles come from the strategies; descriptions and tag lists from the
+    strategies and each of their 'alternatives'. Every title x description
+    x tags combination that isn't already one of the results is yielded
+    once, with 'sources' naming where each part came from.
+    """
+    results = list(results)
+    titles, descriptions, tag_lists = {}, {}, {}     # value -> first source, in result order
+    for result in results:
+        name = result.get('strategy')
+        titles.setdefault(result.get('title') or '', name)
+        descriptions.setdefault(result.get('description') or '', name)
+        tag_lists.setdefault(tuple(result.get('tags') or ()), name)
+        for alternative in result.get('alternatives') or ():
+            source = f"{name}:{alternative.get('variant', 'alternative')}"
+            if alternative.get('description'):
+                descriptions.setdefault(alternative['description'], source)
+            if alternative.get('tags'):
+                tag_lists.setdefault(tuple(alternative['tags']), source)
+
+    existing = {(r.get('title') or '', r.get('description') or '', tuple(r.get('tags') or ()))
+                for r in results}
+    for (title, t_src), (description, d_src), (tags, g_src) in product(
+            titles.items(), descriptions.items(), tag_lists.items()):
+        if (title, description, tags) in existing:
+            continue
+        yield {'strategy': 'variant', 'title': title, 'description': description, 'tags': list(tags),
+               'sources': {'title': t_src, 'description': d_src, 'tags': g_src}}
+
+
+def reference_result(results, strategy='balanced'):
+    """The strategy's own result from results (else the first), or None if there are none."""
+    results = list(results)
+    return next((r for r in results if r.get('strategy') == strategy), results[0] if results else None)
+
+
+def engine_scorer(engine, analysis, platform, strategy='balanced', reference=None):
+    """score_fn scoring one candidate through a batch score_candidates().
+
+    Uses engine.score_candidates() when the engine has it. Otherwise (or with
+    engine=None) candidate_scoring.score_candidates() scores the metadata,
+    anchored on `reference`, the engine's result for the strategy.
+    """
+    score_candidates = getattr(engine, 'score_candidates', None)
+    if score_candidates is None:
+        def score_candidates(analysis, platform, candidates, strategy):
+            return local_score_candidates(analysis, platform, candidates, strategy=strategy,
+                                          reference=reference)
+
+    def score_fn(candidate):
+        scores = score_candidates(analysis, platform, [candidate], strategy=strategy)
+        return {key: int(scores[key][0]) for key in ('seo', 'geo', 'platform_fit', 'voice_distance', 'combined')}
+    return score_fn
+
+
+def search_results(results, platform, score_fn=None, voice_bound=DEFAULT_VOICE_BOUND,
+                   time_budget=DEFAULT_TIME_BUDGET, extra_candidates=None):
+    """Pareto search over scored strategy results, then their generated recombinations."""
+    results = list(results)
+
+    def candidates():
+        yield from results
+        yield from generate_candidates(results)
+        if extra_candidates is not None:
+            yield from extra_candidates
+
+    return pareto_search(candidates(), platform, voice_bound=voice_bound,
+                         time_budget=time_budget, score_fn=score_fn)
+
+
+def optimize_pareto(engine, analysis, platform, voice_bound=DEFAULT_VOICE_BOUND,
+                    time_budget=DEFAULT_TIME_BUDGET, extra_candidates=None, score_fn=None):
+    """Pareto mode for OptimizationEngine: strategies, their recombinations, extra candidates.
+
+    Unscored candidates go through score_fn, by default engine_scorer()
+    anchored on the engine's balanced result.
+    """
+    results = list(engine_candidates(engine, analysis, platform))
+    if score_fn is None:
+        score_fn = engine_scorer(engine, analysis, platform, reference=reference_result(results))
+    return search_results(results, platform, score_fn=score_fn,
+                          voice_bound=voice_bound, time_budget=time_budget,
+                          extra_candidates=extra_candidates)
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Parallel multi-platform publish orchestrator with per-stage timing.
+
+Models the five publish stages as a dependency graph and runs it on asyncio:
+
+    validation -> image_upload -> content_prep -+-> publish:substack -+-> post_publication
+                                                +-> publish:medium  --+
+
+A stage starts as soon as all of its dependencies have succeeded, so the
+per-platform publish stages run concurrently. Synchronous stage functions
+(requests, Pillow, the shared SEO setters) run in worker threads. When a
+stage fails, only the stages that depend on it are skipped - a Medium
+failure doesn't stop Substack. Every stage records wall-clock start / end /
+elapsed relative to the start of the run.
+
+Usage:
+    python publish_orchestrator.py article/medium_draft.md --substack-draft 188207668 \\
+        --medium-story 06b801e2ce3b --optimizer-output result.json
+
+    from publish_orchestrator import Stage, run_stages
+    report = run_stages([Stage('a', fn_a), Stage('b', fn_b, deps=('a',))], ctx)
+    print(format_timings(report))
+"""
+import sys
+import json
+import time
+import asyncio
+import inspect
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+# Shared publishing tools on sys.path
+import shared_tools  # noqa: F401
+
+from incremental_analyzer import split_frontmatter
+from instrumentation import span, tracing
+from tag_vocabulary import load_index, resolve_result_tags
+
+PLATFORMS = ('substack', 'medium')
+
+
+class Stage:
+    """One node of the publish graph.
+
+    fn(ctx) may be a plain function or a coroutine function; its return
+    value is stored in ctx['results'][name].
+    """
+
+    def __init__(self, name, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, deps={self.deps!r})"
+
+
+def _check_graph(stages):
+    names = [s.name for s in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate stage names")
+    known = set(names)
+    for stage in stages:
+        missing = [d for d in stage.deps if d not in known]
+        if missing:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown stage(s): {', '.join(missing)}")
+
+    # Kahn's algorithm: every stage must be reachable without a cycle
+    indegree = {s.name: len(s.deps) for s in stages}
+    ready = [n for n, d in indegree.items() if d == 0]
+    seen = 0
+    while ready:
+        name = ready.pop()
+        seen += 1
+        for s in stages:
+            if name in s.deps:
+                indegree[s.name] -= 1
+                if indegree[s.name] == 0:
+                    ready.append(s.name)
+    if seen != len(stages):
+        raise ValueError("Stage graph has a cycle")
+
+
+async def _run_graph(stages, ctx):
+    _check_graph(stages)
+    ctx.setdefault('results', {})
+    timings, errors = {}, {}
+    t0 = time.perf_counter()
+    done = {s.name: asyncio.get_running_loop().create_future() for s in stages}
+
+    async def run(stage):
+        ok = True
+        for dep in stage.deps:
+            ok = await done[dep] and ok
+        if not ok:
+            timings[stage.name] = {'status': 'skipped', 'start': None, 'end': None, 'elapsed': 0.0}
+            done[stage.name].set_result(False)
+            return
+
+        start = time.perf_counter()
+        try:
+            # to_thread copies the context, so spans inside the stage nest under it
+            with span(f"stage:{stage.name}"):
+                if inspect.iscoroutinefunction(stage.fn):
+                    result = await stage.fn(ctx)
+                else:
+                    result = await asyncio.to_thread(stage.fn, ctx)
+            ctx['results'][stage.name] = result
+            status = 'ok'
+        except Exception as e:
+            errors[stage.name] = f"{type(e).__name__}: {e}"
+            status = 'failed'
+        end = time.perf_counter()
+        timings[stage.name] = {'status': status, 'start': round(start - t0, 4),
+                               'end': round(end - t0, 4), 'elapsed': round(end - start, 4)}
+        done[stage.name].set_result(status == 'ok')
+
+    await asyncio.gather(*(run(s) for s in stages))
+    return {
+        'ok': not errors and all(t['status'] == 'ok' for t in timings.values()),
+        'wall_time': round(time.perf_counter() - t0, 4),
+        'stages': {s.name: timings[s.name] for s in stages},
+        'errors': errors,
+        'results': ctx['results'],
+    }
+
+
+def run_stages(stages, ctx=None):
+    """Run a stage graph to completion; return the run report.
+
+    Returns:
+        {'ok': bool, 'wall_time': float, 'stages': {name: {status, start, end, elapsed}},
+         'errors': {name: str}, 'results': {name: return value}}
+    """
+    return asyncio.run(_run_graph(list(stages), ctx if ctx is not None else {}))
+
+
+def format_timings(report):
+    """Timeline table: one row per stage, in start order."""
+    rows = sorted(report['stages'].items(), key=lambda kv: (kv[1]['start'] is None, kv[1]['start'] or 0))
+    lines = [f"  {'Stage':22s} {'Status':8s} {'Start':>8s} {'Elapsed':>9s}", "-" * 52]
+    for name, t in rows:
+        start = f"{t['start']:7.2f}s" if t['start'] is not None else '       -'
+        lines.append(f"  {name:22s} {t['status']:8s} {start} {t['elapsed']:8.2f}s")
+    lines.append("-" * 52)
+    lines.append(f"  {'wall time':22s} {'':8s} {'':8s} {report['wall_time']:8.2f}s")
+    return '\n'.join(lines)
+
+
+# =====================================================================
+# DEFAULT PUBLISH STAGES
+# =====================================================================
+
+def validate_article(ctx):
+    """Parse frontmatter and check the fields and local images the pipeline needs."""
+    import yaml
+    from image_optimizer import IMAGE_REF_RE
+
+    article = Path(ctx['article_path'])
+    content = article.read_text(encoding='utf-8')
+    block, body = split_frontmatter(content)
+    if not block:
+        raise ValueError(f"{article}: no YAML frontmatter")
+    meta = yaml.safe_load(block.strip().strip('-')) or {}
+    if not meta.get('title'):
+        raise ValueError(f"{article}: frontmatter has no title")
+
+    missing = []
+    for match in IMAGE_REF_RE.finditer(body):
+        target = match.group(2)
+        if '://' not in target and not (article.parent / target).exists():
+            missing.append(target)
+    if missing:
+        raise FileNotFoundError(f"Missing image(s): {', '.join(missing)}")
+
+    ctx['content'] = content
+    ctx['metadata'] = meta
+    report = {'title': meta['title'], 'tags': meta.get('tags', [])}
+
+    # Flag tags and sections the platforms won't recognise now, not in the browser step
+    index = ctx.get('tag_index') or load_index()
+    if index is not None:
+        report['unmatched_tags'], report['tag_suggestions'] = {}, {}
+        report['unmatched_sections'], report['section_suggestions'] = {}, {}
+        for platform in ctx.get('platforms') or PLATFORMS:
+            unmatched = index.resolve_tags(report['tags'], platform)[1]
+            report['unmatched_tags'][platform] = unmatched
+            report['tag_suggestions'][platform] = index.suggest(unmatched, platform)
+
+            namespace = f"{platform}:sections"
+            if index.vocabulary(namespace) is None:
+                continue
+            platform_seo = (meta.get('seo') or {}).get(platform) or {}
+            wanted = [s for s in (ctx['optimizer_output'].get('section'), platform_seo.get('section')) if s]
+            unmatched = index.resolve_tags(wanted, namespace)[1]
+            report['unmatched_sections'][platform] = unmatched
+            report['section_suggestions'][platform] = index.suggest(unmatched, namespace)
+    return report
+
+
+def upload_images(ctx):
+    """Optimize local images and upload them to the CDN in one commit."""
+    from image_optimizer import optimize_article_images
+
+    article = Path(ctx['article_path'])
+    out_dir = ctx.get('image_dir') or article.parent / 'optimized_images'
+    content, optimized = optimize_article_images(ctx['content'], article.parent, out_dir,
+                                                 platforms=ctx.get('platforms'))
+    ctx['content'] = content
+    if not optimized:
+        ctx['image_urls'] = {}
+        return {'images': 0}
+
+    uploader = ctx.get('uploader')
+    if uploader is None:
+        from batch_image_uploader import BatchImageUploader
+        uploader = BatchImageUploader(*ctx['cdn_repo'].split('/', 1))
+    entries = uploader.upload_images([r['output'] for r in optimized], message=f"Images for {article.name}")
+    ctx['image_urls'] = {Path(e['local_path']).as_posix(): e['url'] for e in entries}
+    return {'images': len(entries), 'reused': sum(e['reused'] for e in entries),
+            'bytes_saved': sum(r['bytes_saved'] for r in optimized)}
+
+
+def prepare_content(ctx):
+    """Point image refs at the CDN and render HTML."""
+    import markdown
+
+    content = ctx['content']
+    for local, url in ctx.get('image_urls', {}).items():
+        content = content.replace(f"]({local}", f"]({url}")
+    ctx['content'] = content
+    _, body = split_frontmatter(content)
+    with span('markdown.html', chars=len(body)):
+        ctx['html'] = markdown.markdown(body, extensions=['tables', 'fenced_code'])
+    return {'html_chars': len(ctx['html'])}
+
+
+def platform_output(ctx, platform):
+    """Optimizer output with its tags resolved against the platform's vocabulary."""
+    return resolve_result_tags(ctx['optimizer_output'], platform, ctx.get('tag_index'),
+                               strict=ctx.get('strict_tags', False))
+
+
+def publish_substack(ctx):
+    setter = ctx.get('substack_setter')
+    if setter is None and ctx.get('substack_client') is not None:
+        setter = ctx['substack_client'].set_seo_from_optimizer_output
+    if setter is None:
+        from substack_seo_setter import set_seo_from_optimizer_output as setter
+    output = platform_output(ctx, 'substack')
+    with span('substack_seo_setter.set_seo_from_optimizer_output'):
+        return setter(ctx['substack_draft_id'], output)
+
+
+def publish_medium(ctx):
+    builder = ctx.get('medium_builder')
+    if builder is None:
+        from medium_seo_setter import build_medium_seo_from_optimizer as builder
+    output = platform_output(ctx, 'medium')
+    with span('medium_seo_setter.build_medium_seo_from_optimizer'):
+        return builder(ctx['medium_story_id'], output)
+
+
+def post_publication(ctx):
+    """Append a publish record (what ran, and where the images went) to the log."""
+    record = {
+        'published': datetime.now().isoformat(timespec='seconds'),
+        'article': str(ctx['article_path']),
+        'platforms': list(ctx.get('platforms') or PLATFORMS),
+        'images': ctx.get('image_urls', {}),
+    }
+    log_path = ctx.get('publish_log')
+    if log_path:
+        Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+    return record
+
+
+PUBLISH_STAGES = {
+    'substack': publish_substack,
+    'medium': publish_medium,
+}
+
+
+def build_publish_graph(platforms=PLATFORMS):
+    """The five-stage publish graph with one concurrent publish stage per platform."""
+    publish = [Stage(f"publish:{p}", PUBLISH_STAGES[p], deps=('content_prep',)) for p in platforms]
+    return [
+        Stage('validation', validate_article),
+        Stage('image_upload', upload_images, deps=('validation',)),
+        Stage('content_prep', prepare_content, deps=('image_upload',)),
+        *publish,
+        Stage('post_publication', post_publication, deps=tuple(s.name for s in publish)),
+    ]
+
+
+def publish(article_path, optimizer_output, platforms=PLATFORMS, **ctx):
+    """Run the default publish graph for one article; return the run report."""
+    ctx.update(article_path=article_path, optimizer_output=optimizer_output, platforms=list(platforms))
+    return run_stages(build_publish_graph(platforms), ctx)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Publish one article to every platform in parallel")
+    parser.add_argument('article', help="Markdown article with YAML frontmatter")
+    parser.add_argument('--optimizer-output', required=True, help="JSON file with the optimizer result")
+    parser.add_argument('--platforms', nargs='+', choices=PLATFORMS, default=list(PLATFORMS))
+    parser.add_argument('--substack-draft', type=int, help="Substack draft id")
+    parser.add_argument('--medium-story', help="Medium story id")
+    parser.add_argument('--cdn-repo', default='ghighcove/medium-images', help="owner/repo for image upload")
+    parser.add_argument('--publish-log', default='logs/publish_log.jsonl')
+    parser.add_argument('--strict-tags', action='store_true',
+                        help="Drop tags that aren't in the platform's vocabulary instead of sending them")
+    parser.add_argument('--trace', action='store_true',
+                        help="Write a span/counter trace to logs/traces/ (also: PUBLISHING_TRACE=1)")
+    parser.add_argument('--profile', choices=('cprofile', 'sample'),
+                        help="Profile the run into the trace (implies --trace)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with open(args.optimizer_output, 'r', encoding='utf-8') as f:
+        optimizer_output = json.load(f)
+
+    with tracing('publish', enabled=args.trace or None, profile=args.profile) as trace:
+        report = publish(args.article, optimizer_output, args.platforms,
+                         substack_draft_id=args.substack_draft, medium_story_id=args.medium_story,
+                         cdn_repo=args.cdn_repo, publish_log=args.publish_log, strict_tags=args.strict_tags)
+    print(format_timings(report))
+    if trace is not None:
+        print(f"[*] Trace: {trace.path}")
+    validation = report['results'].get('validation', {})
+    for platform, unmatched in validation.get('unmatched_tags', {}).items():
+        if unmatched:
+            print(f"[WARN] {platform}: tag(s) not in vocabulary: {', '.join(unmatched)}")
+        for tag, names in validation.get('tag_suggestions', {}).get(platform, {}).items():
+            print(f"       {tag!r}: did you mean {', '.join(names)}?")
+    for platform, unmatched in validation.get('unmatched_sections', {}).items():
+        if unmatched:
+            print(f"[WARN] {platform}: section not in vocabulary: {', '.join(unmatched)}")
+        for section, names in validation.get('section_suggestions', {}).get(platform, {}).items():
+            print(f"       {section!r}: did you mean {', '.join(names)}?")
+    for name, error in report['errors'].items():
+        print(f"[FAIL] {name}: {error}")
+    print("[OK] Published" if report['ok'] else "[FAIL] Publish incomplete")
+    return 0 if report['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Streaming, bounded-memory storage for optimization matrix results.
+
+ResultsSink appends one JSON line per completed (article, platform, strategy)
+cell and flushes it immediately, so a crash loses at most the cell in flight.
+ResultsReader indexes a .jsonl file by byte offset and rebuilds the nested
+{article: {platform: {strategy: result}}} view lazily - results are only
+parsed when something (export_json, the Pareto report) reads them.
+load_results() builds the same view as plain dicts, for consumers outside
+this repo (visualizer.create_3d_plot) and callers that outlive the reader.
+
+Record types (one JSON object per line):
+    {"type": "run", "generated": ..., "articles": [...]}
+    {"type": "article", "article": ..., "article_type": ..., "platforms": [...], "error": ...}
+    {"type": "cell", "article": ..., "platform": ..., "strategy": ..., "result": {...}, "summary": {...}}
+    {"type": "done", "article": ..., "platform": ..., "fingerprint": ...}
+
+A "done" record is the checkpoint: it is written after the last strategy
+cell for an (article, platform) and carries the fingerprint of the inputs
+that produced them, so a resumed run can skip work whose inputs are unchanged.
+"""
+import os
+import json
+from collections.abc import Mapping
+
+
+def _dumps(obj):
+    return json.dumps(obj, default=str, ensure_ascii=False)
+
+
+class ResultsSink:
+    """Append-only JSON Lines writer for matrix results."""
+
+    def __init__(self, path, fsync=False):
+        self.path = str(path)
+        self.fsync = fsync
+        self._f = open(self.path, 'a', encoding='utf-8')
+
+    def _write(self, record):
+        self._f.write(_dumps(record) + '\n')
+        self._f.flush()
+        if self.fsync:
+            os.fsync(self._f.fileno())
+
+    def write_run(self, generated, articles):
+        self._write({'type': 'run', 'generated': generated, 'articles': list(articles)})
+
+    def write_article(self, article, article_type, platforms, error=None):
+        record = {'type': 'article', 'article': article, 'article_type': article_type,
+                  'platforms': list(platforms)}
+        if error is not None:
+            record['error'] = error
+        self._write(record)
+
+    def write_cell(self, article, platform, strategy, result, summary):
+        self._write({'type': 'cell', 'article': article, 'platform': platform,
+                     'strategy': strategy, 'result': result, 'summary': summary})
+
+    def write_done(self, article, platform, fingerprint):
+        self._write({'type': 'done', 'article': article, 'platform': platform,
+                     'fingerprint': fingerprint})
+
+    def close(self):
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _LazyMapping(Mapping):
+    """Read-only mapping whose values are produced on access by a loader."""
+
+    def __init__(self, keys, loader):
+        self._keys = keys          # dict used as an ordered key -> token map
+        self._loader = loader
+
+    def __getitem__(self, key):
+        return self._loader(self._keys[key])
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class ResultsReader:
+    """Byte-offset index over a results .jsonl file.
+
+    Only offsets are held in memory; every result is re-read from disk when
+    accessed. A truncated final line (crash mid-write) is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.generated = None
+        self.articles = []
+        self.article_info = {}   # {article: {'article_type', 'platforms', 'error'}}
+        self.index = {}          # {article: {platform: {strategy: offset}}}
+        self.done = {}           # {(article, platform): fingerprint}
+        self.cell_count = 0
+        self._f = open(self.path, 'rb')
+        self._build_index()
+
+    def _build_index(self):
+        offset = 0
+        for line in self._f:
+            line_offset = offset
+            offset += len(line)
+            if not line.endswith(b'\n'):
+                break   # partial record from an interrupted write
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+
+            kind = record.get('type')
+            if kind == 'run':
+                self.generated = record['generated']
+                for article in record['articles']:
+                    if article not in self.articles:
+                        self.articles.append(article)
+            elif kind == 'article':
+                article = record['article']
+                self.article_info[article] = {
+                    'article_type': record.get('article_type'),
+                    'platforms': record.get('platforms', []),
+                    'error': record.get('error'),
+                }
+                platforms = self.index.setdefault(article, {})
+                if record.get('error') is None:
+                    for platform in record.get('platforms', []):
+                        platforms.setdefault(platform, {})
+            elif kind == 'cell':
+                strategies = self.index.setdefault(record['article'], {}).setdefault(record['platform'], {})
+                if record['strategy'] not in strategies:
+                    self.cell_count += 1
+                strategies[record['strategy']] = line_offset
+            elif kind == 'done':
+                self.done[(record['article'], record['platform'])] = record['fingerprint']
+
+    def _read_record(self, offset):
+        self._f.seek(offset)
+        return json.loads(self._f.readline())
+
+    def load_result(self, offset):
+        return self._read_record(offset)['result']
+
+    def results(self):
+        """Lazy nested {article: {platform: {strategy: result}}} view."""
+        return _LazyMapping(self.index, lambda platforms: _LazyMapping(
+            platforms, lambda strategies: _LazyMapping(strategies, self.load_result)))
+
+    def load_results(self):
+        """The results() view as plain nested dicts, read in one pass."""
+        return {article: {platform: {strategy: self.load_result(offset)
+                                     for strategy, offset in strategies.items()}
+                          for platform, strategies in platforms.items()}
+                for article, platforms in self.index.items()}
+
+    def iter_summary(self):
+        """Yield summary rows in the order the cells were first written."""
+        for platforms in self.index.values():
+            for strategies in platforms.values():
+                for offset in strategies.values():
+                    yield self._read_record(offset)['summary']
+
+    def completed_cells(self):
+        """Set of (article, platform, strategy) tuples present in the file."""
+        return {
+            (article, platform, strategy)
+            for article, platforms in self.index.items()
+            for platform, strategies in platforms.items()
+            for strategy in strategies
+        }
+
+    def close(self):
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _indented(obj, level):
+    """json.dumps(obj, indent=2) re-indented to sit `level` levels deep."""
+    text = json.dumps(obj, indent=2, default=str)
+    return text.replace('\n', '\n' + '  ' * level)
+
+
+def export_json(reader, out_path, generated=None):
+    """Write the classic optimization_results_*.json layout from a reader.
+
+    Streams one result at a time; the output is byte-identical to
+    json.dump({...}, f, indent=2, default=str) over the same data.
+    """
+    with open(out_path, 'w', encoding='utf-8') as f:
+        f.write('{\n')
+        f.write(f'  "generated": {json.dumps(generated or reader.generated)},\n')
+        f.write(f'  "test_cases": {reader.cell_count},\n')
+        f.write(f'  "articles": {_indented(reader.articles, 1)},\n')
+
+        f.write('  "results": ')
+        results = reader.results()
+        if not results:
+            f.write('{}')
+        else:
+            f.write('{')
+            for a, (article, platforms) in enumerate(results.items()):
+                f.write(',' if a else '')
+                f.write(f'\n    {json.dumps(article)}: ')
+                if not platforms:
+                    f.write('{}')
+                    continue
+                f.write('{')
+                for p, (platform, strategies) in enumerate(platforms.items()):
+                    f.write(',' if p else '')
+                    f.write(f'\n      {json.dumps(platform)}: ')
+                    if not strategies:
+                        f.write('{}')
+                        continue
+                    f.write('{')
+                    for s, (strategy, result) in enumerate(strategies.items()):
+                        f.write(',' if s else '')
+                        f.write(f'\n        {json.dumps(strategy)}: {_indented(result, 4)}')
+                    f.write('\n      }')
+                f.write('\n    }')
+            f.write('\n  }')
+        f.write(',\n')
+
+        f.write('  "summary": ')
+        rows = reader.iter_summary()
+        first = next(rows, None)
+        if first is None:
+            f.write('[]')
+        else:
+            f.write('[\n    ' + _indented(first, 2))
+            for row in rows:
+                f.write(',\n    ' + _indented(row, 2))
+            f.write('\n  ]')
+        f.write('\n}')
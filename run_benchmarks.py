@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the publishing hot paths, with committed baselines.
+
+Times four paths over synthetic short / medium / long articles:
+  - analyze_content_3d          (multi_dim_analyzer)
+  - optimize_all_strategies     (optimization_engine)
+  - convert_tables_to_images    (table_render_cache + table_to_image, cold and warm cache)
+  - markdown -> HTML            (python-markdown, same extensions as the HTML exports)
+
+Articles are generated deterministically and written to a temp dir, so the
+suite runs offline. Paths whose shared module isn't importable are reported
+as skipped rather than failing.
+
+Timings vary between machines and between runs. Every timed run is
+paired with a fixed pure-Python calibration workload, and --compare gates on
+'relative': the lower quartile of (run time / calibration time), which
+absorbs a different machine, a busy one and the odd slow run. Recording a
+baseline takes BASELINE_ROUNDS independent rounds and stores their spread; a
+benchmark's tolerance is the larger of --tolerance and NOISE_MARGIN times
+that spread. A benchmark is flagged only when it is over that tolerance and
+the slowdown is more than --noise-floor in absolute terms.
+
+--compare also fails when a benchmark it was asked to run has no baseline or
+could not run (shared module missing): an ungated path is reported, not
+silently passed. Narrow the run with --only where a path can't be gated.
+
+The analyzer, optimizer and table-render baselines can only be recorded where
+the shared tools are installed (G:/ai/_shared_tools/publishing, or
+PUBLISHING_TOOLS_PATH). Record them there; entries from other machines are kept:
+
+    python run_benchmarks.py --only analyze_content_3d --update-baseline
+    python run_benchmarks.py --only optimize_all_strategies --update-baseline
+    python run_benchmarks.py --only convert_tables_to_images --update-baseline
+
+Usage:
+    python run_benchmarks.py                    # run and print timings
+    python run_benchmarks.py --compare          # exit 1 if slower than baseline or ungated
+    python run_benchmarks.py --compare --only markdown_to_html
+    python run_benchmarks.py --update-baseline  # record timings as the new baseline
+"""
+import sys
+import json
+import random
+import shutil
+import argparse
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Shared publishing tools on sys.path
+import shared_tools  # noqa: F401
+
+ROOT = Path(__file__).resolve().parent
+BASELINE_PATH = ROOT / 'test' / 'benchmark_baselines.json'
+FIXTURE_IMAGE = ROOT / 'test' / 'images' / 'test_image_1.png'
+
+# README Phase 2 test plan: short / medium / long articles
+ARTICLE_SIZES = {
+    'short': {'words': 1500, 'images': 2, 'tables': 2},
+    'medium': {'words': 4000, 'images': 5, 'tables': 5},
+    'long': {'words': 7500, 'images': 10, 'tables': 10},
+}
+
+DEFAULT_REPEAT = 9
+DEFAULT_TOLERANCE = 0.50     # fail --compare if relative time is over baseline by the larger of 50%...
+NOISE_MARGIN = 2.0           # ...and twice the spread measured when the baseline was recorded...
+DEFAULT_NOISE_FLOOR = 0.005  # ...and more than 5 ms slower (seconds)
+CALIBRATION_REPEAT = 5       # calibration runs (~3 ms each) before every timed run
+BASELINE_ROUNDS = 5          # independent rounds per benchmark for --update-baseline
+
+VOCABULARY = (
+    "model data season upset seed rating efficiency analysis tournament bracket "
+    "variance probability regression sample historical baseline metric accuracy "
+    "team player draft round value contract market signal noise trend outlier"
+).split()
+
+
+# =====================================================================
+# SYNTHETIC ARTICLES
+# =====================================================================
+
+def make_article(words, images, tables, seed=0):
+    """Deterministic markdown article with frontmatter, H2 sections, images and tables."""
+    rng = random.Random(seed)
+    sections = max(images, tables, 3)
+    words_per_section = words // sections
+
+    parts = [
+        "---",
+        f'title: "Synthetic Benchmark Article ({words} words)"',
+        'subtitle: "Generated fixture for run_benchmarks.py"',
+        "seo:",
+        '  meta_title: "Synthetic Benchmark Article | Data Analysis"',
+        '  meta_description: "Deterministic synthetic article used to benchmark the publishing pipeline offline."',
+        "tags:",
+        "  - Data Science",
+        "  - Analytics",
+        "  - Benchmarks",
+        "category: Technology",
+        "---",
+        "",
+        "# Synthetic Benchmark Article",
+        "",
+    ]
+
+    for s in range(sections):
+        parts.append(f"## Section {s + 1}: {rng.choice(VOCABULARY).title()} {rng.choice(VOCABULARY).title()}")
+        parts.append("")
+        remaining = words_per_section
+        while remaining > 0:
+            n = min(remaining, rng.randint(40, 90))
+            sentence_words = [rng.choice(VOCABULARY) for _ in range(n)]
+            # Sprinkle data-bearing tokens so GEO quotability has something to find
+            for i in range(0, n, 12):
+                sentence_words[i] = f"{rng.randint(1, 99)}.{rng.randint(0, 9)}%"
+            paragraph = ' '.join(sentence_words)
+            parts.append(paragraph[0].upper() + paragraph[1:] + '.')
+            parts.append("")
+            remaining -= n
+        if s < images:
+            parts.append(f"![Figure {s + 1}]({FIXTURE_IMAGE.as_posix()})")
+            parts.append("")
+        if s < tables:
+            parts.append("| Team | Record | Rating | Margin |")
+            parts.append("|------|--------|--------|--------|")
+            for _ in range(rng.randint(4, 8)):
+                parts.append(f"| {rng.choice(VOCABULARY).title()} | {rng.randint(10, 30)}-{rng.randint(0, 10)} "
+                             f"| {rng.uniform(60, 95):.1f} | {rng.uniform(-10, 20):+.1f} |")
+            parts.append("")
+
+    return '\n'.join(parts) + '\n'
+
+
+def write_fixtures(directory):
+    """Write every ARTICLE_SIZES article to directory; return {size: path}."""
+    paths = {}
+    for seed, (size, spec) in enumerate(ARTICLE_SIZES.items()):
+        path = Path(directory) / f"synthetic_{size}.md"
+        path.write_text(make_article(seed=seed, **spec), encoding='utf-8')
+        paths[size] = path
+    return paths
+
+
+# =====================================================================
+# HARNESS
+# =====================================================================
+
+def _calibration_workload():
+    counts = {}
+    for i in range(20_000):
+        word = VOCABULARY[i % len(VOCABULARY)]
+        counts[word] = counts.get(word, 0) + len(word)
+    ' '.join(VOCABULARY * 200).split()
+    return counts
+
+
+def calibrate(repeat=CALIBRATION_REPEAT):
+    """Fastest of `repeat` runs of a fixed pure-Python workload, in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _calibration_workload()
+        samples.append(time.perf_counter() - start)
+    return min(samples)
+
+
+def time_call(fn, repeat):
+    """Run fn() `repeat` times after one warm-up call; return timing stats.
+
+    Each timed run follows a calibrate(). 'median', 'min' and 'calibration'
+    are seconds; 'relative' is the lower quartile of run time / calibration
+    time, so a few runs slowed by other load don't move it.
+    """
+    fn()
+    samples, calibration = [], []
+    for _ in range(repeat):
+        calibration.append(calibrate())
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {'median': statistics.median(samples), 'min': min(samples), 'repeat': repeat,
+            'calibration': statistics.median(calibration),
+            'relative': lower_quartile([t / c for t, c in zip(samples, calibration)])}
+
+
+def lower_quartile(values):
+    values = sorted(values)
+    return values[(len(values) - 1) // 4]
+
+
+def time_rounds(fn, repeat, rounds):
+    """time_call() `rounds` times; return the round with the median relative time.
+
+    With more than one round, 'spread' is (slowest / fastest relative) - 1
+    across rounds: the run-to-run noise compare() allows for.
+    """
+    runs = sorted((time_call(fn, repeat) for _ in range(rounds)), key=lambda r: r['relative'])
+    result = runs[len(runs) // 2]
+    if rounds > 1:
+        result['spread'] = runs[-1]['relative'] / runs[0]['relative'] - 1
+    return result
+
+
+def benchmarks(fixtures, workdir):
+    """Yield (name, fn or None-if-unavailable, reason). fn takes no arguments."""
+    # --- markdown -> HTML ---
+    try:
+        import markdown
+    except ImportError as e:
+        markdown = None
+        reason = str(e)
+    for size, path in fixtures.items():
+        text = path.read_text(encoding='utf-8')
+        if markdown is None:
+            yield f"markdown_to_html[{size}]", None, reason
+            continue
+        yield (f"markdown_to_html[{size}]",
+               lambda text=text: markdown.markdown(text, extensions=['tables', 'fenced_code']), None)
+
+    # --- analyze_content_3d / optimize_all_strategies ---
+    try:
+        from multi_dim_analyzer import MultiDimAnalyzer
+        from optimization_engine import OptimizationEngine
+        analyzer = MultiDimAnalyzer()
+    except ImportError as e:
+        for size in fixtures:
+            yield f"analyze_content_3d[{size}]", None, str(e)
+            yield f"optimize_all_strategies[{size}]", None, str(e)
+    else:
+        for size, path in fixtures.items():
+            yield f"analyze_content_3d[{size}]", lambda path=path: analyzer.analyze_content_3d(str(path)), None
+            analysis = analyzer.analyze_content_3d(str(path))
+            engine = OptimizationEngine(voice_profile=analysis['voice_profile'])
+            yield (f"optimize_all_strategies[{size}]",
+                   lambda analysis=analysis: [engine.optimize_all_strategies(analysis, p)
+                                              for p in ('substack', 'medium')], None)
+
+    # --- convert_tables_to_images (cold = empty render cache, warm = all hits) ---
+    from table_render_cache import TableRenderCache, convert_tables_to_images
+    try:
+        import table_to_image  # noqa: F401
+        missing = None
+    except ImportError as e:
+        missing = str(e)
+
+    for size, path in fixtures.items():
+        text = path.read_text(encoding='utf-8')
+        if missing:
+            yield f"convert_tables_to_images_cold[{size}]", None, missing
+            yield f"convert_tables_to_images_warm[{size}]", None, missing
+            continue
+
+        cache_dir = Path(workdir) / f"tables_{size}"
+        out_dir = Path(workdir) / f"out_{size}"
+
+        def cold(text=text, cache_dir=cache_dir, out_dir=out_dir):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            shutil.rmtree(out_dir, ignore_errors=True)
+            convert_tables_to_images(text, out_dir, size, cache=TableRenderCache(cache_dir))
+
+        def warm(text=text, cache_dir=cache_dir, out_dir=out_dir):
+            convert_tables_to_images(text, out_dir, size, cache=TableRenderCache(cache_dir))
+
+        yield f"convert_tables_to_images_cold[{size}]", cold, None
+        yield f"convert_tables_to_images_warm[{size}]", warm, None
+
+
+def load_baselines(path=BASELINE_PATH):
+    if not Path(path).exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('benchmarks', {})
+
+
+def save_baselines(results, path=BASELINE_PATH):
+    """Merge results into the baseline file; entries not in results are kept."""
+    machine = f"{platform.system()} {platform.machine()} / Python {platform.python_version()}"
+    existing = load_baselines(path)
+    for name, r in results.items():
+        entry = {'median': round(r['median'], 6), 'min': round(r['min'], 6), 'machine': machine}
+        if r.get('relative'):
+            entry['relative'] = round(r['relative'], 4)
+            entry['calibration'] = round(r['calibration'], 6)
+        if 'spread' in r:
+            entry['spread'] = round(r['spread'], 4)
+        existing[name] = entry
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'updated': datetime.now().isoformat(timespec='seconds'),
+            'benchmarks': dict(sorted(existing.items())),
+        }, f, indent=2)
+        f.write('\n')
+
+
+def expected_median(base, result):
+    """Baseline median in seconds on this machine right now (calibration-scaled when possible)."""
+    if base.get('relative') and result.get('calibration'):
+        return base['relative'] * result['calibration']
+    return base['median']
+
+
+def allowed_slowdown(base, tolerance=DEFAULT_TOLERANCE):
+    """Tolerance for one baseline: tolerance, widened to NOISE_MARGIN x its recorded spread."""
+    return max(tolerance, NOISE_MARGIN * base.get('spread', 0))
+
+
+def compare(results, baselines, tolerance=DEFAULT_TOLERANCE, noise_floor=DEFAULT_NOISE_FLOOR):
+    """Return [(name, median, expected_median, ratio), ...] for regressions.
+
+    A regression is more than allowed_slowdown() over the baseline (by
+    relative time when both sides have it, else by median) and more than
+    noise_floor seconds slower than the baseline's calibration-scaled median.
+    """
+    regressions = []
+    for name, r in results.items():
+        base = baselines.get(name)
+        if not base:
+            continue
+        expected = expected_median(base, r)
+        if base.get('relative') and r.get('relative'):
+            ratio = r['relative'] / base['relative']
+            median = r['relative'] * r['calibration']
+        else:
+            ratio = r['median'] / expected if expected else float('inf')
+            median = r['median']
+        if ratio > 1 + allowed_slowdown(base, tolerance) and median - expected > noise_floor:
+            regressions.append((name, median, expected, ratio))
+    return regressions
+
+
+def ungated(results, skipped, baselines):
+    """Return [(name, reason), ...] for requested benchmarks --compare can't check."""
+    missing = [(name, 'no baseline') for name in results if name not in baselines]
+    missing += [(name, f"not run: {reason}") for name, reason in skipped.items()]
+    return missing
+
+
+def run_benchmarks(repeat=DEFAULT_REPEAT, only=None, rounds=1):
+    """Run every available benchmark; return ({name: stats}, {name: skip_reason})."""
+    results, skipped = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = write_fixtures(tmp)
+        for name, fn, reason in benchmarks(fixtures, tmp):
+            if only and only not in name:
+                continue
+            if fn is None:
+                skipped[name] = reason
+                continue
+            results[name] = time_rounds(fn, repeat, rounds)
+    return results, skipped
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the publishing hot paths")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f"Timed runs per benchmark (default: {DEFAULT_REPEAT})")
+    parser.add_argument('--only', metavar='SUBSTRING', help="Run benchmarks whose name contains SUBSTRING")
+    parser.add_argument('--compare', action='store_true',
+                        help="Exit 1 if any benchmark is over its baseline, or has none")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed slowdown for --compare (default: {DEFAULT_TOLERANCE:.0%})")
+    parser.add_argument('--noise-floor', type=float, default=DEFAULT_NOISE_FLOOR, metavar='SECONDS',
+                        help=f"Ignore slowdowns smaller than this for --compare "
+                             f"(default: {DEFAULT_NOISE_FLOOR * 1000:.0f} ms)")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help=f"Write these timings to {BASELINE_PATH.relative_to(ROOT).as_posix()}")
+    parser.add_argument('--rounds', type=int,
+                        help=f"Independent rounds per benchmark "
+                             f"(default: {BASELINE_ROUNDS} with --update-baseline, else 1)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    baselines = load_baselines()
+
+    print("=" * 78)
+    print("  PUBLISHING HOT-PATH BENCHMARKS")
+    print("=" * 78)
+    rounds = args.rounds or (BASELINE_ROUNDS if args.update_baseline else 1)
+    results, skipped = run_benchmarks(repeat=args.repeat, only=args.only, rounds=rounds)
+
+    # Baseline: its median scaled to this run's calibration; Ratio compares relative times
+    print(f"  {'Benchmark':38s} {'Median':>9s} {'Relative':>9s} {'Baseline':>9s} {'Ratio':>6s}")
+    print("-" * 78)
+    for name, r in results.items():
+        base = baselines.get(name)
+        base_str = f"{expected_median(base, r) * 1000:7.2f}ms" if base else '      n/a'
+        ratio_str = f"{r['relative'] / base['relative']:5.2f}x" if base and base.get('relative') else '     -'
+        print(f"  {name:38s} {r['median'] * 1000:7.2f}ms {r['relative']:9.2f} {base_str} {ratio_str}")
+    for name, reason in skipped.items():
+        base_str = '' if name in baselines else ' (no baseline)'
+        print(f"  {name:38s} [SKIP] {reason}{base_str}")
+    print("=" * 78)
+
+    if args.update_baseline:
+        save_baselines(results)
+        print(f"[OK] Baselines updated: {BASELINE_PATH}")
+
+    if args.compare:
+        regressions = compare(results, baselines, args.tolerance, args.noise_floor)
+        missing = ungated(results, skipped, baselines)
+        if regressions:
+            print(f"[FAIL] {len(regressions)} benchmark(s) over baseline by more than their tolerance "
+                  f"(at least {args.tolerance:.0%}) and {args.noise_floor * 1000:.0f}ms:")
+            for name, median, base, ratio in regressions:
+                print(f"    {name}: {median * 1000:.2f}ms vs {base * 1000:.2f}ms ({ratio:.2f}x, "
+                      f"allowed {1 + allowed_slowdown(baselines[name], args.tolerance):.2f}x)")
+        if missing:
+            print(f"[FAIL] {len(missing)} benchmark(s) not gated; record a baseline where they run, "
+                  f"or narrow with --only:")
+            for name, reason in missing:
+                print(f"    {name}: {reason}")
+        if regressions or missing:
+            return 1
+        print("[OK] No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
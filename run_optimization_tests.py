@@ -2,19 +2,36 @@
 """
 Phase 4: Run 30-case optimization test matrix and generate 3D visualization
 3 articles x 5 strategies x 2 platforms = 30 test cases
+
+Usage:
+    python run_optimization_tests.py              # serial
+    python run_optimization_tests.py --workers 4  # one process per article shard
+    python run_optimization_tests.py --resume     # continue the latest run, skip unchanged cells
+    python run_optimization_tests.py --compact-plot  # append to the binary point store, small HTML
+    python run_optimization_tests.py --trace         # span/counter trace in logs/traces/
 """
-import sys
 import os
-import json
+import glob
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-# Add shared tools to path
-sys.path.insert(0, 'G:/ai/_shared_tools/publishing')
+# Shared tools path; heavy modules load on first use
+from shared_tools import lazy_module
+
+multi_dim_analyzer = lazy_module('multi_dim_analyzer')
+optimization_engine = lazy_module('optimization_engine')
+visualizer = lazy_module('visualizer')
 
-from multi_dim_analyzer import MultiDimAnalyzer
-from optimization_engine import OptimizationEngine
-from visualizer import OptimizationVisualizer
+from analysis_cache import CachedAnalyzer, source_version
+from pareto_search import engine_scorer, reference_result, search_results
+from results_store import ResultsSink, ResultsReader, export_json
+from compact_plot import PointStore, write_html
+from catalogue_index import CatalogueIndex, run_id_for
+from tag_vocabulary import load_index, resolve_result_tags, vocabulary_version
+from instrumentation import absorb, capture, span, tracing
 
 
 # =====================================================================
@@ -33,9 +50,173 @@ TEST_ARTICLES = {
 
 PLATFORMS = ['substack', 'medium']
 
+RESULTS_DIR = 'G:/ai/content_upload_meister/test'
+CATALOGUE_PATH = f'{RESULTS_DIR}/optimization_catalogue.db'
+
+
+def input_versions():
+    """Analyzer, engine and tag vocabulary versions; part of every cell fingerprint."""
+    return (source_version(multi_dim_analyzer), source_version(optimization_engine), vocabulary_version())
+
+
+def cell_fingerprint(article_path, platform, versions):
+    """Hash of every input that determines an (article, platform)'s strategy results.
+
+    Covers the article bytes, the analyzer, engine and tag vocabulary
+    versions (tags are resolved against the vocabulary), and the platform.
+    Returns None if the article can't be read (it will be re-run and error out).
+    """
+    try:
+        article_bytes = Path(article_path).read_bytes()
+    except OSError:
+        return None
+    h = hashlib.sha256()
+    h.update(article_bytes)
+    for part in (*versions, platform):
+        h.update(b'\0' + part.encode('utf-8'))
+    return h.hexdigest()
+
+
+def latest_stream(results_dir=RESULTS_DIR):
+    """Most recent optimization_results_*.jsonl in results_dir, or None."""
+    streams = sorted(glob.glob(os.path.join(results_dir, 'optimization_results_*.jsonl')))
+    return streams[-1] if streams else None
+
+
+def run_article(article_name, article_info, use_cache=True, platforms=None):
+    """Analyze one article once and run every platform/strategy cell on it.
+
+    Runs in a worker process when --workers > 1, so it only returns data;
+    all printing happens in the parent in TEST_ARTICLES order.
+
+    Args:
+        platforms: Platforms to optimize for (default: all PLATFORMS). A
+                   resumed run passes only the platforms still to do.
+    """
+    with capture(f"article:{article_name}") as captured:
+        outcome = _run_article(article_name, article_info, use_cache, platforms)
+    if captured.data:
+        outcome['trace'] = captured.data   # from a worker process; absorbed by the parent
+    return outcome
+
+
+def _run_article(article_name, article_info, use_cache, platforms):
+    analyzer = CachedAnalyzer() if use_cache else multi_dim_analyzer.MultiDimAnalyzer()
+    try:
+        with span('multi_dim_analyzer.analyze_content_3d', article=article_name):
+            analysis = analyzer.analyze_content_3d(article_info['path'])
+    except Exception as e:
+        return {'error': str(e)}
+
+    engine = optimization_engine.OptimizationEngine(voice_profile=analysis['voice_profile'])
+    tag_index = load_index()
+    platform_results = {}
+    for platform in platforms or PLATFORMS:
+        with span('optimization_engine.optimize_all_strategies', article=article_name, platform=platform):
+            strategies = engine.optimize_all_strategies(analysis, platform)
+        # Canonical platform tag / section spellings; misses are listed per result
+        platform_results[platform] = {strategy: resolve_result_tags(result, platform, tag_index)
+                                      for strategy, result in strategies.items()}
+
+    outcome = {'analysis': analysis, 'platforms': platform_results}
+    if use_cache:
+        outcome['cache'] = analyzer.cache.stats()
+    return outcome
+
+
+def _iter_article_results(jobs, workers, use_cache=True):
+    """Yield (article_name, article_info, outcome) for each job, in job order.
+
+    jobs is a list of (article_name, article_info, platforms). Jobs with no
+    platforms left to run yield {'skipped': True} without analyzing.
+    """
+    pending = [job for job in jobs if job[2]]
+    if workers <= 1:
+        outcomes = (run_article(name, info, use_cache, platforms) for name, info, platforms in pending)
+        yield from _merge_outcomes(jobs, outcomes)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields in submission order, so the merge is deterministic
+        outcomes = pool.map(run_article,
+                            [job[0] for job in pending],
+                            [job[1] for job in pending],
+                            [use_cache] * len(pending),
+                            [job[2] for job in pending])
+        yield from _merge_outcomes(jobs, outcomes)
+
+
+def _merge_outcomes(jobs, outcomes):
+    outcomes = iter(outcomes)
+    for article_name, article_info, platforms in jobs:
+        outcome = next(outcomes) if platforms else {'skipped': True}
+        yield article_name, article_info, outcome
+
+
+def print_pareto_fronts(all_results, use_cache=True):
+    """Print the non-dominated candidates for each article x platform.
+
+    Candidates are the strategy results plus their title x description x tags
+    recombinations (pareto_search.generate_candidates). Recombinations are
+    scored by the engine's score_candidates() when it has one, else by
+    candidate_scoring anchored on the article's balanced result.
+    """
+    scorable = hasattr(optimization_engine.OptimizationEngine, 'score_candidates')
+    print("=" * 70)
+    print("  PARETO FRONT: Non-dominated Candidates Per Article x Platform")
+    print("=" * 70)
+    for article_name, platforms in all_results.items():
+        engine = None
+        analysis = {}
+        if article_name in TEST_ARTICLES:
+            analyzer = CachedAnalyzer() if use_cache else multi_dim_analyzer.MultiDimAnalyzer()
+            analysis = analyzer.analyze_content_3d(TEST_ARTICLES[article_name]['path'])
+            if scorable:
+                engine = optimization_engine.OptimizationEngine(voice_profile=analysis['voice_profile'])
+        for platform, strategies in platforms.items():
+            if not strategies:
+                continue
+            strategies = list(strategies.values())
+            score_fn = engine_scorer(engine, analysis, platform, reference=reference_result(strategies))
+            with span('pareto_search', article=article_name, platform=platform):
+                result = search_results(strategies, platform, score_fn=score_fn)
+            rejected = result['rejected']
+            print(f"  {article_name} / {platform}: {len(result['front'])} on front of {result['evaluated']} "
+                  f"({rejected['limits']} over limits, {rejected['voice']} over voice bound"
+                  f"{', timed out' if result['timed_out'] else ''})")
+            for candidate in result['front']:
+                s = candidate['scores']
+                name = candidate['strategy']
+                if 'sources' in candidate:
+                    name = '/'.join(candidate['sources'].values())
+                print(f"    {name:20s} SEO:{s['seo']:3d} GEO:{s['geo']:3d} "
+                      f"Plat:{s['platform_fit']:3d} Voice:{s['voice_distance']:3d}")
+    if not scorable:
+        print("  [*] Recombined variants scored by candidate_scoring (the engine has no")
+        print("      score_candidates()), relative to each article's balanced result")
+    print("=" * 70)
+    print()
+
 
-def run_test_matrix():
-    """Run full 3D optimization test matrix"""
+def run_test_matrix(workers=1, use_cache=True, pareto=False, resume=None, compact_plot=False):
+    """Run full 3D optimization test matrix
+
+    Args:
+        workers: Number of worker processes. Each article (analysis plus its
+                 platform x strategy cells) is one shard; 1 runs serially.
+        use_cache: Serve unchanged articles from the on-disk analysis cache.
+        pareto: Also print the Pareto front of strategies and their recombined
+                variants per article x platform.
+        resume: Path of an earlier run's .jsonl to continue. (article, platform)
+                pairs checkpointed there with unchanged inputs are skipped.
+        compact_plot: Append this run to the binary point store and render the
+                      decimated compact plot instead of the full Plotly page.
+
+    Returns:
+        (all_results, viz_path): {article_name: {platform: {strategy: result}}}
+        as plain dicts, and the plot. The full results JSON is written next to
+        the .jsonl stream.
+    """
     print("=" * 70)
     print("  3D CONTENT OPTIMIZATION TEST MATRIX")
     print("=" * 70)
@@ -43,110 +224,150 @@ def run_test_matrix():
     print(f"  Platforms: {len(PLATFORMS)}")
     print(f"  Strategies: 5")
     print(f"  Total test cases: {len(TEST_ARTICLES) * len(PLATFORMS) * 5}")
+    print(f"  Workers: {workers}")
     print("=" * 70)
     print()
 
-    analyzer = MultiDimAnalyzer()
-    visualizer = OptimizationVisualizer()
-
-    all_results = {}   # {article_name: {platform: {strategy: result}}}
-    summary_data = []
+    # Cells stream to a .jsonl as they complete; nothing accumulates in memory
+    run_stamp = datetime.now()
+    if resume:
+        stream_path = str(resume)
+        with ResultsReader(stream_path) as previous:
+            checkpoints = previous.done
+        print(f"[*] Resuming: {stream_path} ({len(checkpoints)} article x platform checkpoints)")
+        print()
+    else:
+        stream_path = f"{RESULTS_DIR}/optimization_results_{run_stamp.strftime('%Y%m%d_%H%M%S')}.jsonl"
+        checkpoints = {}
+    results_path = stream_path[:-len('.jsonl')] + '.json'
 
+    versions = input_versions()
+    jobs = []
+    fingerprints = {}
     for article_name, article_info in TEST_ARTICLES.items():
-        article_path = article_info['path']
-        all_results[article_name] = {}
+        todo = []
+        for platform in PLATFORMS:
+            fingerprint = cell_fingerprint(article_info['path'], platform, versions)
+            fingerprints[(article_name, platform)] = fingerprint
+            if fingerprint is None or checkpoints.get((article_name, platform)) != fingerprint:
+                todo.append(platform)
+        jobs.append((article_name, article_info, todo))
 
-        print(f"[*] Analyzing: {article_name}")
-        print(f"    Path: {article_path}")
+    cache_hits = cache_misses = 0
 
-        # Analyze article
-        try:
-            analysis = analyzer.analyze_content_3d(article_path)
-        except Exception as e:
-            print(f"    [ERROR] Could not analyze: {e}")
-            continue
+    with ResultsSink(stream_path) as sink:
+        sink.write_run(run_stamp.isoformat(), TEST_ARTICLES.keys())
 
-        seo_score = analysis['traditional_seo']['score']
-        voice = analysis['voice_profile']
+        for article_name, article_info, outcome in _iter_article_results(jobs, workers, use_cache):
+            absorb(outcome.pop('trace', None))
+            article_path = article_info['path']
 
-        print(f"    Traditional SEO: {seo_score}/100 ({analysis['traditional_seo']['grade']})")
-        print(f"    Voice: Formality {voice['formality']}/5, Data-heaviness {voice['data_heaviness']}/5")
-        print()
+            print(f"[*] Analyzing: {article_name}")
+            print(f"    Path: {article_path}")
 
-        # Run optimization for each platform
-        engine = OptimizationEngine(voice_profile=voice)
+            if 'skipped' in outcome:
+                print("    [SKIP] Unchanged since checkpoint")
+                print()
+                continue
 
-        for platform in PLATFORMS:
-            all_results[article_name][platform] = {}
-            print(f"  [{platform.upper()}]")
-
-            # Run all 5 strategies
-            strategy_results = engine.optimize_all_strategies(analysis, platform)
-
-            for strategy, result in strategy_results.items():
-                all_results[article_name][platform][strategy] = result
-                s = result['scores']
-
-                print(f"    {strategy:20s} SEO:{s['seo']:3d} GEO:{s['geo']:3d} Plat:{s['platform_fit']:3d} Combined:{s['combined']:3d}")
-
-                summary_data.append({
-                    'article': article_name,
-                    'article_type': article_info['type'],
-                    'platform': platform,
-                    'strategy': strategy,
-                    'seo_score': s['seo'],
-                    'geo_score': s['geo'],
-                    'platform_fit': s['platform_fit'],
-                    'voice_distance': s['voice_distance'],
-                    'combined_score': s['combined'],
-                    'description': result['description'],
-                    'tags': result['tags']
-                })
+            if 'error' in outcome:
+                print(f"    [ERROR] Could not analyze: {outcome['error']}")
+                sink.write_article(article_name, article_info['type'], [], error=outcome['error'])
+                continue
 
+            analysis = outcome['analysis']
+            if 'cache' in outcome:
+                cache_hits += outcome['cache']['hits']
+                cache_misses += outcome['cache']['misses']
+            seo_score = analysis['traditional_seo']['score']
+            voice = analysis['voice_profile']
+
+            print(f"    Traditional SEO: {seo_score}/100 ({analysis['traditional_seo']['grade']})")
+            print(f"    Voice: Formality {voice['formality']}/5, Data-heaviness {voice['data_heaviness']}/5")
             print()
 
-    # Save results JSON
-    results_path = f"G:/ai/content_upload_meister/test/optimization_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(results_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'generated': datetime.now().isoformat(),
-            'test_cases': len(summary_data),
-            'articles': list(TEST_ARTICLES.keys()),
-            'results': all_results,
-            'summary': summary_data
-        }, f, indent=2, default=str)
+            sink.write_article(article_name, article_info['type'], PLATFORMS)
 
-    print(f"[OK] Results saved: {results_path}")
+            for platform, strategy_results in outcome['platforms'].items():
+                print(f"  [{platform.upper()}]")
 
-    # Generate 3D visualization
-    print()
-    print("[*] Generating 3D visualization...")
-    viz_path = visualizer.create_3d_plot(all_results)
-    print(f"[OK] Visualization saved: {viz_path}")
-    print()
+                for strategy, result in strategy_results.items():
+                    s = result['scores']
 
-    # Print summary table
-    print("=" * 70)
-    print("  SUMMARY: Best Strategy Per Article x Platform")
-    print("=" * 70)
-    print(f"  {'Article':25s} {'Platform':10s} {'Best Strategy':22s} {'SEO':5s} {'GEO':5s} {'Comb':5s}")
-    print("-" * 70)
+                    print(f"    {strategy:20s} SEO:{s['seo']:3d} GEO:{s['geo']:3d} Plat:{s['platform_fit']:3d} Combined:{s['combined']:3d}")
 
-    seen = set()
-    for article_name, platforms in all_results.items():
-        for platform, strategies in platforms.items():
-            if not strategies:
-                continue
-            best_strategy = max(strategies.keys(), key=lambda s: strategies[s]['scores']['combined'])
-            best = strategies[best_strategy]
-            s = best['scores']
-            key = (article_name, platform)
-            if key not in seen:
-                seen.add(key)
-                print(f"  {article_name:25s} {platform:10s} {best_strategy:22s} {s['seo']:5d} {s['geo']:5d} {s['combined']:5d}")
+                    sink.write_cell(article_name, platform, strategy, result, {
+                        'article': article_name,
+                        'article_type': article_info['type'],
+                        'platform': platform,
+                        'strategy': strategy,
+                        'seo_score': s['seo'],
+                        'geo_score': s['geo'],
+                        'platform_fit': s['platform_fit'],
+                        'voice_distance': s['voice_distance'],
+                        'combined_score': s['combined'],
+                        'description': result['description'],
+                        'tags': result['tags']
+                    })
+
+                unmatched_sections = sorted({r['unmatched_section'] for r in strategy_results.values()
+                                             if r.get('unmatched_section')})
+                if unmatched_sections:
+                    print(f"    [WARN] Section not in {platform} vocabulary: {', '.join(unmatched_sections)}")
+
+                if fingerprints[(article_name, platform)] is not None:
+                    sink.write_done(article_name, platform, fingerprints[(article_name, platform)])
+                print()
+
+    # Save results JSON (same layout as before, streamed from the .jsonl)
+    with ResultsReader(stream_path) as reader:
+        with span('export_json'):
+            export_json(reader, results_path, generated=datetime.now().isoformat())
+        # Plain dicts: the shared visualizer and callers get the structure they always had
+        all_results = reader.load_results()
+
+        # Index the run for cross-run queries (see catalogue_index.py)
+        run_id = run_id_for(stream_path)
+        with span('catalogue_index'), CatalogueIndex(CATALOGUE_PATH) as index:
+            indexed = index.add_run(run_id, reader.generated, reader.iter_summary(), source=stream_path)
+            best_cells = index.best_per_cell(run_id)
+
+        print(f"[OK] Results saved: {results_path}")
+        print(f"[OK] Cell stream: {stream_path}")
+        print(f"[OK] Catalogue index: {indexed} cells ({CATALOGUE_PATH})")
+        if use_cache:
+            print(f"[*] Analysis cache: {cache_hits} hits, {cache_misses} misses")
+
+        # Generate 3D visualization
+        print()
+        print("[*] Generating 3D visualization...")
+        with span('visualizer', compact=compact_plot):
+            if compact_plot:
+                store = PointStore()
+                store.append_run(all_results, run_id=run_id)
+                viz_path = write_html(store, store.base.parent / 'optimization_3d_compact.html')
+            else:
+                viz_path = visualizer.OptimizationVisualizer().create_3d_plot(all_results)
+        print(f"[OK] Visualization saved: {viz_path}")
+        print()
+
+        # Print summary table
+        print("=" * 70)
+        print("  SUMMARY: Best Strategy Per Article x Platform")
+        print("=" * 70)
+        print(f"  {'Article':25s} {'Platform':10s} {'Best Strategy':22s} {'SEO':5s} {'GEO':5s} {'Comb':5s}")
+        print("-" * 70)
+
+        for best in best_cells:
+            print(f"  {best['article']:25s} {best['platform']:10s} {best['strategy']:22s} "
+                  f"{best['seo']:5d} {best['geo']:5d} {best['combined']:5d}")
+
+        print("=" * 70)
+        print()
+
+        if pareto:
+            print_pareto_fronts(all_results, use_cache=use_cache)
 
-    print("=" * 70)
-    print()
     print("[SUCCESS] Phase 4 test matrix complete!")
     print()
     print(f"  Open in browser: {viz_path}")
@@ -154,5 +375,35 @@ def run_test_matrix():
     return all_results, viz_path
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the 3D optimization test matrix")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes (one article shard each). Default: 1 (serial)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-analyze every article instead of using the analysis cache")
+    parser.add_argument('--pareto', action='store_true',
+                        help="Print the Pareto front of strategies and recombined variants "
+                             "per article x platform")
+    parser.add_argument('--resume', nargs='?', const='latest', metavar='JSONL',
+                        help="Continue an earlier run (default: latest .jsonl in the results dir), "
+                             "skipping cells whose article, engine and platform are unchanged")
+    parser.add_argument('--compact-plot', action='store_true',
+                        help="Append to the binary point store and write the compact, decimated plot")
+    parser.add_argument('--trace', action='store_true',
+                        help="Write a span/counter trace to logs/traces/ (also: PUBLISHING_TRACE=1)")
+    parser.add_argument('--profile', choices=('cprofile', 'sample'),
+                        help="Profile the run into the trace (implies --trace)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    all_results, viz_path = run_test_matrix()
+    args = parse_args()
+    resume = latest_stream() if args.resume == 'latest' else args.resume
+    if args.resume and not resume:
+        print(f"[WARN] Nothing to resume in {RESULTS_DIR}; starting a fresh run")
+    with tracing('optimization_matrix', enabled=args.trace or None, profile=args.profile) as trace:
+        all_results, viz_path = run_test_matrix(workers=args.workers, use_cache=not args.no_cache,
+                                                pareto=args.pareto, resume=resume,
+                                                compact_plot=args.compact_plot)
+    if trace is not None:
+        print(f"[*] Trace: {trace.path}")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Shared publishing tools path and lazy module loading.
+
+Importing this module puts the shared publishing package on sys.path (the
+line every entry point used to repeat). lazy_module() returns a stand-in
+that imports the real module on first attribute access, so heavy modules -
+multi_dim_analyzer, optimization_engine, visualizer and the Plotly / NumPy
+stack behind them - cost nothing for commands that never touch them (SEO-
+only or validation-only runs).
+
+Every lazy load is timed. Set PUBLISHING_IMPORT_REPORT=1 to print the
+report at exit, or call import_report() / format_import_report().
+
+Usage:
+    from shared_tools import lazy_module
+    visualizer = lazy_module('visualizer')
+    ...
+    viz = visualizer.OptimizationVisualizer()   # imported here, on first use
+
+For the full picture including eager imports, use `python -X importtime`.
+"""
+import os
+import sys
+import time
+import atexit
+import importlib
+import threading
+import types
+
+SHARED_TOOLS_PATH = os.environ.get('PUBLISHING_TOOLS_PATH', 'G:/ai/_shared_tools/publishing')
+
+if SHARED_TOOLS_PATH not in sys.path:
+    sys.path.insert(0, SHARED_TOOLS_PATH)
+
+_load_times = {}     # module name -> seconds spent importing it via lazy_module
+_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports `name` the first time an attribute is read."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with _lock:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self.__name__)
+                    _load_times[self.__name__] = time.perf_counter() - start
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __reduce__(self):
+        # Pickle as the real module name, so worker processes re-import lazily
+        return (lazy_module, (self.__name__,))
+
+    @property
+    def is_loaded(self):
+        return self.__dict__['_lazy_module'] is not None
+
+    def __repr__(self):
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_module(name):
+    """Return the module if it is already imported, else a LazyModule for it."""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def import_report():
+    """{module: seconds} for every module loaded through lazy_module, slowest first."""
+    return dict(sorted(_load_times.items(), key=lambda kv: -kv[1]))
+
+
+def format_import_report():
+    report = import_report()
+    lines = ["Lazy imports:"]
+    if not report:
+        lines.append("  (none loaded)")
+    for name, seconds in report.items():
+        lines.append(f"  {name:28s} {seconds * 1000:8.1f}ms")
+    return '\n'.join(lines)
+
+
+if os.environ.get('PUBLISHING_IMPORT_REPORT'):
+    atexit.register(lambda: print(format_import_report(), file=sys.stderr))
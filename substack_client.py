@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Pooled Substack REST client for SEO metadata, with a bulk API.
+
+substack_seo_setter.set_seo_metadata() builds a fresh authenticated session
+per call (bypassing Api.__init__ and setting the substack.sid cookie) and
+sends its fields as separate requests. For retro-fitting SEO onto the back
+catalogue this client instead keeps one long-lived session with a
+connection pool, sends title / description / tags / slug in a single
+PUT /api/v1/drafts/{id}, and fans a list of drafts out over a bounded thread
+pool. 429 and 5xx responses are retried with exponential backoff,
+honouring Retry-After.
+
+Updates are diff-aware: the current draft is fetched once per update (a
+draft written earlier in the same bulk batch is diffed against that write),
+only fields whose value differs are PUT, and a draft that already matches
+gets no write at all. Each update reports what was sent. Nothing is cached
+across calls, so edits made in the Substack UI or by another process are
+always seen.
+
+Usage:
+    python substack_client.py https://yourpub.substack.com drafts.json
+
+    drafts.json: [{"draft_id": 188207668, "seo_title": "...", "seo_description": "...",
+                   "tags": ["..."], "slug": "..."}, ...]
+
+    client = SubstackClient('https://yourpub.substack.com')   # token from SUBSTACK_SID
+    client.set_seo_metadata_many(drafts)
+"""
+import os
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from instrumentation import count, span
+
+DEFAULT_MAX_WORKERS = 4        # Substack rate-limits aggressively; keep fan-out modest
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF = 1.0          # seconds; doubles per retry
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+SEO_DESCRIPTION_LIMIT = 140    # hard limit on Substack
+
+
+class SubstackError(Exception):
+    """Raised when a Substack API call fails after retries."""
+
+
+def load_token():
+    """substack.sid token: SUBSTACK_SID, else the substack-mcp-plus auth store."""
+    token = os.environ.get('SUBSTACK_SID')
+    if token:
+        return token
+    mcp_path = os.environ.get('SUBSTACK_MCP_PATH')
+    if mcp_path:
+        sys.path.insert(0, mcp_path)
+    try:
+        from src.simple_auth_manager import SimpleAuthManager
+    except ImportError:
+        raise SubstackError("No Substack token: set SUBSTACK_SID or SUBSTACK_MCP_PATH") from None
+    return SimpleAuthManager().get_token()
+
+
+def seo_payload(seo_title=None, seo_description=None, tags=None, slug=None):
+    """PUT body carrying every SEO field at once; None fields are left out."""
+    if seo_description is not None and len(seo_description) > SEO_DESCRIPTION_LIMIT:
+        raise ValueError(f"SEO description is {len(seo_description)} chars; "
+                         f"Substack limit is {SEO_DESCRIPTION_LIMIT}")
+    payload = {}
+    if seo_title is not None:
+        payload['search_engine_title'] = seo_title
+    if seo_description is not None:
+        payload['search_engine_description'] = seo_description
+    if tags is not None:
+        payload['postTags'] = [{'name': t} for t in tags]
+    if slug is not None:
+        payload['draft_slug'] = slug
+    return payload
+
+
+def _tag_names(tags):
+    return [t['name'] if isinstance(t, dict) else t for t in tags or []]
+
+
+def seo_diff(draft, payload):
+    """Subset of payload whose values differ from the draft's current metadata."""
+    changed = {}
+    for field, value in payload.items():
+        current = draft.get(field)
+        if field == 'postTags':
+            if _tag_names(current) != _tag_names(value):
+                changed[field] = value
+        elif (current or '') != (value or ''):
+            changed[field] = value
+    return changed
+
+
+def fields_from_optimizer(result):
+    """SEO fields from an optimizer result (title/description or seo_title/seo_description)."""
+    return {
+        'seo_title': result.get('seo_title', result.get('title')),
+        'seo_description': result.get('seo_description', result.get('description')),
+        'tags': result.get('tags'),
+        'slug': result.get('slug'),
+    }
+
+
+def make_session(token, cookie_domain, max_workers=DEFAULT_MAX_WORKERS,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+    """requests.Session with the substack.sid cookie, a pool sized for max_workers and retry/backoff."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=None,          # PUT of the same fields is idempotent
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Content-Type': 'application/json', 'User-Agent': 'content-upload-meister'})
+    session.cookies.set('substack.sid', token, domain=cookie_domain)
+    return session
+
+
+class SubstackClient:
+    """Long-lived, pooled client for one Substack publication."""
+
+    def __init__(self, publication_url, token=None, max_workers=DEFAULT_MAX_WORKERS,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, timeout=30, session=None):
+        self.publication_url = publication_url.rstrip('/')
+        self.max_workers = max_workers
+        self.timeout = timeout
+        host = urlparse(self.publication_url).hostname
+        cookie_domain = '.substack.com' if host.endswith('.substack.com') else host
+        self.session = session or make_session(token or load_token(), cookie_domain,
+                                               max_workers, retries, backoff)
+        self.api_calls = 0
+
+    def _request(self, method, path, **kwargs):
+        url = f"{self.publication_url}/api/v1/{path}"
+        self.api_calls += 1
+        count('substack.api_calls')
+        try:
+            with span('substack.request', method=method):
+                resp = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise SubstackError(f"{method} {path}: {e}") from e
+        if resp.status_code >= 400:
+            raise SubstackError(f"{method} {path}: HTTP {resp.status_code} {resp.text[:200]}")
+        return resp.json()
+
+    def get_draft(self, draft_id):
+        return self._request('GET', f'drafts/{draft_id}')
+
+    def put_draft(self, draft_id, payload):
+        return self._request('PUT', f'drafts/{draft_id}', json=payload)
+
+    def set_seo_metadata(self, draft_id, seo_title=None, seo_description=None, tags=None, slug=None,
+                         current=None, diff=True):
+        """Set the given SEO fields on one draft, sending only what changed.
+
+        current: the draft as already fetched, to skip the GET; otherwise it
+        is fetched fresh. With diff=False every given field is PUT
+        unconditionally.
+
+        Returns:
+            {'draft_id', 'sent': {field: value}, 'unchanged': [field, ...],
+             'skipped': bool, 'draft': dict}
+        """
+        payload = seo_payload(seo_title, seo_description, tags, slug)
+        if not payload:
+            raise ValueError("No SEO fields to set")
+
+        if diff:
+            if current is None:
+                current = self.get_draft(draft_id)
+            sent = seo_diff(current, payload)
+        else:
+            sent = payload
+
+        draft = self.put_draft(draft_id, sent) if sent else current
+        count('substack.drafts_updated' if sent else 'substack.drafts_unchanged')
+        return {
+            'draft_id': draft_id,
+            'sent': sent,
+            'unchanged': [field for field in payload if field not in sent],
+            'skipped': not sent,
+            'draft': draft,
+        }
+
+    def set_seo_from_optimizer_output(self, draft_id, optimizer_result, **kwargs):
+        return self.set_seo_metadata(draft_id, **fields_from_optimizer(optimizer_result), **kwargs)
+
+    def set_seo_metadata_many(self, drafts, max_workers=None, diff=True):
+        """Apply SEO fields to many drafts with bounded concurrency.
+
+        drafts: iterable of {'draft_id', 'seo_title', 'seo_description', 'tags', 'slug',
+        'current'} (all but draft_id optional). One draft failing doesn't stop the rest.
+        A draft listed again after an earlier entry for it finished is diffed
+        against that entry's write; the record is dropped when the batch ends.
+
+        Returns:
+            [{'draft_id', 'ok': True, 'sent', 'unchanged', 'skipped', 'draft'}
+             or {'draft_id', 'ok': False, 'error': str}, ...] in input order
+        """
+        written = {}    # draft_id -> draft as of this batch's last write to it
+
+        def apply(draft):
+            fields = {k: draft.get(k) for k in ('seo_title', 'seo_description', 'tags', 'slug')}
+            current = draft.get('current') or written.get(draft['draft_id'])
+            try:
+                result = self.set_seo_metadata(draft['draft_id'], current=current, diff=diff, **fields)
+            except (SubstackError, ValueError) as e:
+                return {'draft_id': draft['draft_id'], 'ok': False, 'error': str(e)}
+            written[draft['draft_id']] = result['draft']
+            return dict(result, ok=True)
+
+        drafts = list(drafts)
+        if not drafts:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers or self.max_workers, len(drafts))) as pool:
+            return list(pool.map(apply, drafts))
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python substack_client.py <publication_url> <drafts.json>")
+        sys.exit(1)
+
+    with open(sys.argv[2], 'r', encoding='utf-8') as f:
+        drafts = json.load(f)
+
+    with SubstackClient(sys.argv[1]) as client:
+        print(f"[*] Setting SEO on {len(drafts)} draft(s) ({client.max_workers} concurrent)...")
+        results = client.set_seo_metadata_many(drafts)
+        for r in results:
+            if not r['ok']:
+                status = 'FAIL - ' + r['error']
+            elif r['skipped']:
+                status = 'unchanged'
+            else:
+                status = 'sent ' + ', '.join(r['sent'])
+            print(f"    {r['draft_id']}: {status}")
+        failed = sum(not r['ok'] for r in results)
+        skipped = sum(r.get('skipped', False) for r in results)
+        print(f"[{'OK' if not failed else 'FAIL'}] {len(results) - failed}/{len(results)} ok, "
+              f"{skipped} unchanged ({client.api_calls} API calls)")
+    sys.exit(1 if failed else 0)
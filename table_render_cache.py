@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Render cache and parallel rendering for markdown table -> PNG conversion.
+
+Drop-in wrapper around table_to_image.convert_tables_to_images(). Each table
+is rendered to PNG at most once per (table content, renderer style): results
+live in a content-addressed cache directory, and only cache misses are sent
+to table_to_image - concurrently, in a process pool, when a document has
+several new tables. Re-publishing an article whose tables did not change
+does no rendering at all; the cached PNGs are copied into output_dir.
+Like the analysis cache, the directory is bounded by entry count and total
+bytes, evicting the least recently used PNGs first.
+
+Usage:
+    from table_render_cache import convert_tables_to_images, has_tables
+    content, paths = convert_tables_to_images(markdown, output_dir, 'article')
+"""
+import os
+import shutil
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Shared publishing tools on sys.path
+import shared_tools  # noqa: F401
+
+from analysis_cache import evict_lru, source_version
+from instrumentation import count, span
+from table_tokenizer import parse_tables, replace_spans, has_tables  # noqa: F401 (re-export)
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / '.cache' / 'tables'
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def renderer_style():
+    """Style component of the cache key: the table_to_image source version."""
+    import table_to_image
+    return source_version(table_to_image)
+
+
+def table_key(table_text, style):
+    """Content address for one table under one renderer style."""
+    normalized = '\n'.join(line.strip() for line in table_text.strip().splitlines())
+    return hashlib.sha256(f"{style}\0{normalized}".encode('utf-8')).hexdigest()
+
+
+def render_table(table_text, dest_path):
+    """Render one table with table_to_image and store the PNG at dest_path.
+
+    Top-level so it can run in a ProcessPoolExecutor worker.
+    """
+    from table_to_image import convert_tables_to_images as render_tables
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _, paths = render_tables(table_text + '\n', Path(tmp), 'table')
+        if len(paths) != 1:
+            raise RuntimeError(f"Expected 1 rendered table, got {len(paths)}")
+        # Write beside the destination and rename, so readers never see a partial PNG
+        partial = Path(str(dest_path) + f'.{os.getpid()}.tmp')
+        shutil.copyfile(paths[0], partial)
+        os.replace(partial, dest_path)
+    return str(dest_path)
+
+
+class TableRenderCache:
+    """LRU, size-bounded content-addressed PNG store for rendered tables, with hit/miss counters."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, style=None, workers=None, render_fn=render_table,
+                 max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.style = style
+        self.workers = workers or os.cpu_count() or 1
+        self.render_fn = render_fn
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _style(self):
+        if self.style is None:
+            self.style = renderer_style()
+        return self.style
+
+    def cached_path(self, key):
+        return self.cache_dir / f"{key}.png"
+
+    def ensure_rendered(self, tables):
+        """Make sure every table text has a cached PNG; return their cache paths.
+
+        Misses are de-duplicated and rendered together - in a process pool
+        when there is more than one and workers > 1. Afterwards the cache is
+        evicted down to its bounds, never dropping this call's tables.
+        """
+        style = self._style()
+        keys = [table_key(t, style) for t in tables]
+
+        missing = {}
+        for key, text in zip(keys, tables):
+            path = self.cached_path(key)
+            if path.exists():
+                self.hits += 1
+                # Touch mtime so eviction sees this entry as recently used
+                try:
+                    os.utime(path, None)
+                except OSError:
+                    pass
+            else:
+                self.misses += 1
+                missing.setdefault(key, text)
+        count('table_render.hits', len(keys) - len(missing))
+        count('table_render.misses', len(missing))
+
+        with span('table_to_image.render', tables=len(missing)):
+            if len(missing) > 1 and self.workers > 1:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(missing))) as pool:
+                    futures = [pool.submit(self.render_fn, text, self.cached_path(key))
+                               for key, text in missing.items()]
+                    for future in futures:
+                        future.result()
+            else:
+                for key, text in missing.items():
+                    self.render_fn(text, self.cached_path(key))
+
+        paths = [self.cached_path(key) for key in keys]
+        self.evictions += evict_lru(self.cache_dir, '*.png', self.max_entries, self.max_bytes, keep=paths)
+        return paths
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+_default_cache = None
+
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TableRenderCache()
+    return _default_cache
+
+
+def convert_tables_to_images(content, output_dir, prefix='table', cache=None, spans=None):
+    """Replace every markdown table with a PNG image reference.
+
+    Same contract as table_to_image.convert_tables_to_images():
+
+    Args:
+        spans: Table spans from table_tokenizer.parse_tables(content), if the
+               caller already parsed the document (e.g. to check has_tables).
+
+    Returns:
+        (new_content, [png_path, ...]) - paths are in document order and
+        live in output_dir; content without tables is returned unchanged.
+    """
+    if spans is None:
+        spans = parse_tables(content)
+    if not spans:
+        return content, []
+
+    cache = cache or default_cache()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    cached = cache.ensure_rendered([span.text.rstrip('\r\n') for span in spans])
+
+    paths = []
+    for n, src in enumerate(cached, start=1):
+        dest = output_dir / f"{prefix}_{n}_{src.stem[:12]}.png"
+        if not dest.exists() or dest.stat().st_size != src.stat().st_size:
+            shutil.copyfile(src, dest)
+        paths.append(dest)
+
+    refs = [f"![Table {n}]({path.as_posix()})" for n, path in enumerate(paths, start=1)]
+    return replace_spans(content, spans, refs), paths
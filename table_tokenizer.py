@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Single-pass, line-streaming tokenizer for markdown pipe tables.
+
+iter_tables() walks the document once, line by line, without splitting it
+into a list, and yields a TableSpan (character and line offsets) per table.
+One parse can then drive detection (has_tables), conversion and image
+reference insertion (replace_spans), so large documents stay linear.
+
+Table grammar (matches table_to_image):
+    | header | ... |        line starting with '|'
+    |--------|-----|        separator: pipes, dashes, optional ':' alignment
+    | row    | ... |        zero or more lines starting with '|'
+Tables inside ``` / ~~~ fenced code blocks are ignored.
+"""
+import re
+from collections import namedtuple
+
+SEPARATOR_RE = re.compile(r'^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$')
+FENCE_RE = re.compile(r'^[ \t]*(```|~~~)')
+
+# start/end: character offsets into the document (end exclusive, includes the
+# last row's newline). start_line/end_line: 0-based line numbers (end exclusive).
+TableSpan = namedtuple('TableSpan', 'start end start_line end_line text')
+
+
+def _iter_lines(content):
+    """Yield (offset, line_with_newline) without materializing a list of lines."""
+    pos = 0
+    length = len(content)
+    while pos < length:
+        nl = content.find('\n', pos)
+        end = length if nl == -1 else nl + 1
+        yield pos, content[pos:end]
+        pos = end
+
+
+def _is_row(line):
+    return line.lstrip().startswith('|')
+
+
+def _is_separator(line):
+    return '-' in line and SEPARATOR_RE.match(line.rstrip('\r\n')) is not None
+
+
+def iter_tables(content):
+    """Yield a TableSpan for every pipe table in content, in document order."""
+    in_fence = False
+    header = None        # (offset, line_no) of a '|' line that may start a table
+    table = None         # (offset, line_no) of the current table's header
+    last_end = 0         # end offset of the last table row seen
+    line_no = -1
+
+    for line_no, (offset, line) in enumerate(_iter_lines(content)):
+        if table is not None:
+            if _is_row(line):
+                last_end = offset + len(line)
+                continue
+            yield TableSpan(table[0], last_end, table[1], line_no, content[table[0]:last_end])
+            table = None
+
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+            header = None
+            continue
+        if in_fence:
+            continue
+
+        if header is not None and _is_separator(line):
+            table = header
+            header = None
+            last_end = offset + len(line)
+            continue
+
+        header = (offset, line_no) if _is_row(line) else None
+
+    if table is not None:
+        yield TableSpan(table[0], last_end, table[1], line_no + 1, content[table[0]:last_end])
+
+
+def parse_tables(content):
+    """All table spans as a list (parse once, reuse for detect/convert/insert)."""
+    return list(iter_tables(content))
+
+
+def has_tables(content):
+    """True if content contains a markdown pipe table. Stops at the first one."""
+    return next(iter_tables(content), None) is not None
+
+
+def replace_spans(content, spans, replacements):
+    """Replace each span with its replacement string, assembled in one join.
+
+    A replacement gets the span's trailing line ending ('\n' or '\r\n')
+    appended, so the line structure around it is preserved.
+    """
+    pieces = []
+    cursor = 0
+    for span, replacement in zip(spans, replacements):
+        pieces.append(content[cursor:span.start])
+        pieces.append(replacement)
+        pieces.append(span.text[len(span.text.rstrip('\r\n')):])
+        cursor = span.end
+    pieces.append(content[cursor:])
+    return ''.join(pieces)
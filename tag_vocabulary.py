@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Local tag / topic / section vocabulary with prefix and fuzzy lookup.
+
+Medium tags must match existing tags and Substack sections must match
+existing sections, but the optimizer emits whatever tags the frontmatter
+and its own heuristics produce (["Automation", "Publishing", "Images"]).
+Until now a tag that doesn't exist only showed up in the browser or API
+step. This module resolves candidate tags in-process, against a snapshot
+file, so it works offline:
+
+  normalized form   casefolded, accents stripped, '&' -> 'and', runs of
+                    anything else -> '-' (the slug Medium uses: data-science)
+  exact / alias     dict from normalized form to the canonical name
+  prefix            character trie over normalized forms (autocomplete)
+  fuzzy             trigram index, ranked by Dice similarity: suggestions
+                    for typos and near-misses ("Datascience"). Never
+                    applied automatically - a near-miss is often a different
+                    tag ('Sports Bet' is not 'Sports')
+
+A snapshot holds one vocabulary per namespace ('medium:tags',
+'substack:tags', 'substack:sections'); each term is a name or
+{"name", "count", "aliases"}. Indexes are built when the snapshot loads.
+
+Usage:
+    python tag_vocabulary.py resolve medium "machine-learning" "Pyhton" "Images"
+    python tag_vocabulary.py complete medium "data"
+    python tag_vocabulary.py build medium:tags medium_tags.txt   # one tag per line, merged into the snapshot
+
+    index = load_index()                        # tag_vocabulary.json, cached per process
+    tags, unmatched = index.resolve_tags(['data-science', 'ML', 'Pyhton'], 'medium:tags')
+    index.suggest(unmatched, 'medium:tags')     # {'Pyhton': ['Python']}
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+DEFAULT_SNAPSHOT = Path(__file__).resolve().parent / 'tag_vocabulary.json'
+DEFAULT_MIN_SCORE = 0.6        # Dice similarity over trigrams
+PLATFORM_TAG_LIMIT = {'medium': 5, 'substack': 5}
+
+_SEPARATORS = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(term):
+    """Canonical lookup form: 'Data Science' / 'data-science' / 'Data  Science!' -> 'data-science'."""
+    text = unicodedata.normalize('NFKD', str(term)).encode('ascii', 'ignore').decode('ascii')
+    text = text.casefold().replace('&', ' and ')
+    return _SEPARATORS.sub('-', text).strip('-')
+
+
+def trigrams(form):
+    padded = f"  {form.replace('-', ' ')} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Vocabulary:
+    """One namespace of canonical terms with exact, prefix and fuzzy lookup."""
+
+    def __init__(self, terms=()):
+        self.names = []          # id -> canonical name
+        self.counts = []         # id -> popularity (followers / stories), for ranking
+        self.aliases = {}        # id -> [alias, ...] as given
+        self._exact = {}         # normalized form or alias -> id
+        self._trie = {}          # char -> subtrie; '' -> [id, ...] ending here
+        self._grams = {}         # trigram -> {id, ...}
+        self._gram_counts = []   # id -> number of distinct trigrams
+        for term in terms:
+            self.add(term)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, term):
+        return normalize(term) in self._exact
+
+    def add(self, term):
+        """Add a name or {'name', 'count', 'aliases'}; return its id (existing id if known)."""
+        if isinstance(term, dict):
+            name, count, aliases = term['name'], term.get('count', 0), term.get('aliases', [])
+        else:
+            name, count, aliases = term, 0, []
+        form = normalize(name)
+        if not form:
+            raise ValueError(f"Empty tag after normalization: {name!r}")
+
+        term_id = self._exact.get(form)
+        if term_id is None:
+            term_id = len(self.names)
+            self.names.append(name)
+            self.counts.append(count)
+            self.aliases[term_id] = []
+            self._exact[form] = term_id
+
+            node = self._trie
+            for ch in form:
+                node = node.setdefault(ch, {})
+            node.setdefault('', []).append(term_id)
+
+            grams = trigrams(form)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._grams.setdefault(gram, set()).add(term_id)
+        else:
+            self.counts[term_id] = max(self.counts[term_id], count)
+
+        for alias in aliases:
+            alias_form = normalize(alias)
+            if alias_form and alias_form not in self._exact:
+                self._exact[alias_form] = term_id
+                self.aliases[term_id].append(alias)
+        return term_id
+
+    def lookup(self, term):
+        """Canonical name for an exact (normalized) or alias match, else None."""
+        term_id = self._exact.get(normalize(term))
+        return None if term_id is None else self.names[term_id]
+
+    def complete(self, prefix, limit=10):
+        """Canonical names whose normalized form starts with prefix, most popular first."""
+        node = self._trie
+        for ch in normalize(prefix):
+            node = node.get(ch)
+            if node is None:
+                return []
+        found, stack = [], [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key == '':
+                    found.extend(child)
+                else:
+                    stack.append(child)
+        found.sort(key=lambda i: (-self.counts[i], self.names[i]))
+        return [self.names[i] for i in found[:limit]]
+
+    def fuzzy(self, term, limit=5, min_score=DEFAULT_MIN_SCORE):
+        """[(canonical name, score), ...] by trigram Dice similarity, best first."""
+        grams = trigrams(normalize(term))
+        if not grams:
+            return []
+        shared = {}
+        for gram in grams:
+            for term_id in self._grams.get(gram, ()):
+                shared[term_id] = shared.get(term_id, 0) + 1
+        scored = []
+        for term_id, n in shared.items():
+            score = 2 * n / (len(grams) + self._gram_counts[term_id])
+            if score >= min_score:
+                scored.append((score, self.counts[term_id], term_id))
+        scored.sort(key=lambda s: (-s[0], -s[1], self.names[s[2]]))
+        return [(self.names[i], round(score, 3)) for score, _, i in scored[:limit]]
+
+    def resolve(self, term, min_score=DEFAULT_MIN_SCORE, suggest=3):
+        """{'input', 'tag', 'match': 'exact' | 'alias' | None, 'suggestions'}.
+
+        Only exact and alias matches resolve; on a miss, 'suggestions' lists
+        up to `suggest` fuzzy candidates for a human to pick from.
+        """
+        form = normalize(term)
+        term_id = self._exact.get(form)
+        if term_id is not None:
+            match = 'exact' if normalize(self.names[term_id]) == form else 'alias'
+            return {'input': term, 'tag': self.names[term_id], 'match': match, 'suggestions': []}
+        suggestions = [name for name, _ in self.fuzzy(term, limit=suggest, min_score=min_score)]
+        return {'input': term, 'tag': None, 'match': None, 'suggestions': suggestions}
+
+    def to_terms(self):
+        terms = []
+        for term_id, name in enumerate(self.names):
+            if self.counts[term_id] or self.aliases[term_id]:
+                term = {'name': name}
+                if self.counts[term_id]:
+                    term['count'] = self.counts[term_id]
+                if self.aliases[term_id]:
+                    term['aliases'] = list(self.aliases[term_id])
+                terms.append(term)
+            else:
+                terms.append(name)
+        return terms
+
+
+class TagIndex:
+    """Vocabularies by namespace ('medium:tags', 'substack:sections', ...), loadable from a snapshot."""
+
+    def __init__(self, vocabularies=None, generated=None):
+        self.vocabularies = {ns: v if isinstance(v, Vocabulary) else Vocabulary(v)
+                             for ns, v in (vocabularies or {}).items()}
+        self.generated = generated
+
+    @classmethod
+    def load(cls, path=DEFAULT_SNAPSHOT):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('vocabularies', {}), generated=data.get('generated'))
+
+    def save(self, path=DEFAULT_SNAPSHOT):
+        """Write the snapshot atomically."""
+        path = Path(path)
+        data = {'generated': self.generated,
+                'vocabularies': {ns: v.to_terms() for ns, v in sorted(self.vocabularies.items())}}
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        os.replace(tmp, path)
+
+    def version(self):
+        """Hash of every namespace's terms, counts and aliases; part of resume fingerprints."""
+        data = {ns: v.to_terms() for ns, v in sorted(self.vocabularies.items())}
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    def vocabulary(self, namespace):
+        """The namespace's vocabulary; a bare platform name means its tags."""
+        if ':' not in namespace:
+            namespace = f"{namespace}:tags"
+        return self.vocabularies.get(namespace)
+
+    def resolve_tags(self, tags, namespace, limit=None, strict=False):
+        """Map candidate tags onto the namespace's vocabulary.
+
+        Exact and alias matches take their canonical spelling and duplicates
+        collapse. Anything else - near-misses included - is unmatched: kept
+        in place (or dropped with strict=True) and also returned separately;
+        see suggest(). Without a vocabulary for the namespace, tags come
+        back unchanged.
+
+        Returns:
+            (tags, unmatched)
+        """
+        vocabulary = self.vocabulary(namespace)
+        if vocabulary is None:
+            tags = list(tags or [])
+            return (tags[:limit] if limit else tags), []
+        resolved, unmatched, seen = [], [], set()
+        for tag in tags or []:
+            match = vocabulary.resolve(tag, suggest=0)
+            if match['tag'] is None:
+                unmatched.append(tag)
+                if strict:
+                    continue
+            name = match['tag'] or tag
+            if normalize(name) not in seen:
+                seen.add(normalize(name))
+                resolved.append(name)
+        return (resolved[:limit] if limit else resolved), unmatched
+
+    def suggest(self, tags, namespace, limit=3, min_score=DEFAULT_MIN_SCORE):
+        """{tag: [closest canonical names, ...]} for tags with fuzzy candidates."""
+        vocabulary = self.vocabulary(namespace)
+        if vocabulary is None:
+            return {}
+        suggestions = {}
+        for tag in tags or []:
+            names = vocabulary.resolve(tag, min_score, suggest=limit)['suggestions']
+            if names:
+                suggestions[tag] = names
+        return suggestions
+
+
+@lru_cache(maxsize=None)
+def _load_cached(path):
+    return TagIndex.load(path)
+
+
+def load_index(path=DEFAULT_SNAPSHOT):
+    """TagIndex from the snapshot, loaded once per process; None if there is no snapshot."""
+    path = str(path)
+    if not os.path.exists(path):
+        return None
+    return _load_cached(path)
+
+
+def vocabulary_version(index=None):
+    """index.version() (default: the snapshot's index), or 'none' without a snapshot."""
+    index = index or load_index()
+    return 'none' if index is None else index.version()
+
+
+def resolve_result_tags(result, platform, index=None, strict=False):
+    """Optimizer result with its tags and section resolved against platform's vocabularies.
+
+    Returns a new dict; the optimizer's own tags are kept as
+    'candidate_tags', misses are listed under 'unmatched_tags' and their
+    fuzzy candidates under 'tag_suggestions'. A 'section' is checked
+    against '<platform>:sections' the same way: the original is kept as
+    'candidate_section', a miss is reported as 'unmatched_section' with
+    'section_suggestions' (and with strict=True the section is cleared).
+    """
+    index = index or load_index()
+    if index is None:
+        return result
+    sections = f"{platform}:sections"
+    check_tags = index.vocabulary(platform) is not None
+    check_section = bool(result.get('section')) and index.vocabulary(sections) is not None
+    if not (check_tags or check_section):
+        return result
+
+    resolved = dict(result)
+    if check_tags:
+        tags, unmatched = index.resolve_tags(result.get('tags'), platform,
+                                             limit=PLATFORM_TAG_LIMIT.get(platform), strict=strict)
+        resolved.update(tags=tags, candidate_tags=list(result.get('tags') or []), unmatched_tags=unmatched,
+                        tag_suggestions=index.suggest(unmatched, platform))
+    if check_section:
+        section = result['section']
+        match = index.vocabulary(sections).resolve(section)
+        resolved.update(section=match['tag'] or (None if strict else section), candidate_section=section,
+                        unmatched_section=None if match['tag'] else section,
+                        section_suggestions=match['suggestions'])
+    return resolved
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline tag / section vocabulary lookup")
+    parser.add_argument('--snapshot', default=str(DEFAULT_SNAPSHOT))
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    resolve = commands.add_parser('resolve', help="Resolve tags against a namespace")
+    resolve.add_argument('namespace', help="e.g. medium, substack:sections")
+    resolve.add_argument('tags', nargs='+')
+    resolve.add_argument('--min-score', type=float, default=0.3,
+                         help="Similarity threshold for suggestions on a miss")
+
+    complete = commands.add_parser('complete', help="Prefix completion")
+    complete.add_argument('namespace')
+    complete.add_argument('prefix')
+    complete.add_argument('--limit', type=int, default=10)
+
+    build = commands.add_parser('build', help="Merge terms (one per line, or a JSON list) into the snapshot")
+    build.add_argument('namespace')
+    build.add_argument('source')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'build':
+        index = TagIndex.load(args.snapshot) if os.path.exists(args.snapshot) else TagIndex()
+        with open(args.source, 'r', encoding='utf-8') as f:
+            text = f.read()
+        terms = json.loads(text) if args.source.endswith('.json') else [t.strip() for t in text.splitlines() if t.strip()]
+        vocabulary = index.vocabularies.setdefault(args.namespace, Vocabulary())
+        before = len(vocabulary)
+        for term in terms:
+            vocabulary.add(term)
+        index.generated = datetime.now().isoformat(timespec='seconds')
+        index.save(args.snapshot)
+        print(f"[OK] {args.namespace}: {len(vocabulary) - before} new, {len(vocabulary)} total ({args.snapshot})")
+        return 0
+
+    index = TagIndex.load(args.snapshot)
+    vocabulary = index.vocabulary(args.namespace)
+    if vocabulary is None:
+        print(f"[ERROR] No vocabulary for {args.namespace!r}; have: {', '.join(sorted(index.vocabularies))}")
+        return 1
+    if args.command == 'complete':
+        for name in vocabulary.complete(args.prefix, args.limit):
+            print(f"  {name}")
+        return 0
+
+    failed = 0
+    for tag in args.tags:
+        match = vocabulary.resolve(tag, args.min_score)
+        if match['tag'] is None:
+            failed += 1
+            suggestions = ', '.join(match['suggestions'])
+            print(f"  [MISS]  {tag!r}" + (f" (closest: {suggestions})" if suggestions else ''))
+        else:
+            print(f"  [{match['match'].upper():5s}] {tag!r} -> {match['tag']!r}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
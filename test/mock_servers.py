@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stand-ins for the platform APIs, for offline tests.
+
+MockGitHub implements the slice of the GitHub Git Data API that
+batch_image_uploader uses (refs, commits, blobs, trees) in memory.
+MockSubstack implements GET / PUT /api/v1/drafts/{id} behind the
+substack.sid cookie.
+
+    with MockGitHub() as gh:
+        uploader = BatchImageUploader('owner', 'repo', api_base=gh.url, token='t')
+        ...
+        gh.commits, gh.files(), gh.requests
+
+Set server.fail_next[(method, path_prefix)] = [status, ...] to inject
+transient failures, which are served (and counted) before the real reply.
+"""
+import json
+import time
+import base64
+import hashlib
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # keep-alive, so client connection pooling is observable
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=None, headers=None):
+        data = json.dumps(body if body is not None else {}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        body = json.loads(raw) if raw else None
+        server = self.server.mock
+        with server.lock:
+            server.requests.append((method, self.path))
+            server.connections.add(self.client_address)
+            for (m, prefix), statuses in server.fail_next.items():
+                if m == method and self.path.startswith(prefix) and statuses:
+                    status = statuses.pop(0)
+                    return self._reply(status, {'message': 'injected failure'}, {'Retry-After': '0'})
+        status, reply = server.route(method, self.path, body, self.headers)
+        self._reply(status, reply)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+
+class _MockServer:
+    """Threaded local HTTP server; subclasses implement route()."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []          # [(method, path), ...] in arrival order
+        self.fail_next = {}         # {(method, path_prefix): [status, ...]}
+        self.connections = set()    # distinct client (host, port) pairs: TCP connections opened
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._httpd.mock = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}"
+
+    def count(self, method, prefix=''):
+        return sum(1 for m, p in self.requests if m == method and p.startswith(prefix))
+
+    def route(self, method, path, body, headers):
+        raise NotImplementedError
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class MockGitHub(_MockServer):
+    """In-memory Git Data API for one repo: /repos/<owner>/<repo>/git/..."""
+
+    def __init__(self, branch='main'):
+        super().__init__()
+        self.branch = branch
+        self.blobs = {}             # sha -> bytes
+        self.trees = {}             # sha -> {path: blob_sha}
+        self.commit_objs = {}       # sha -> {'tree', 'parents', 'message'}
+        root_tree = self._store_tree({})
+        root = self._store_commit(root_tree, [], 'initial')
+        self.refs = {branch: root}
+        self.commits = []           # commits created through the API, in order
+
+    @staticmethod
+    def _sha(kind, payload):
+        return hashlib.sha1(kind.encode() + b'\0' + payload).hexdigest()
+
+    def _store_tree(self, entries):
+        sha = self._sha('tree', json.dumps(entries, sort_keys=True).encode())
+        self.trees[sha] = dict(entries)
+        return sha
+
+    def _store_commit(self, tree, parents, message):
+        sha = self._sha('commit', json.dumps([tree, parents, message]).encode())
+        self.commit_objs[sha] = {'tree': tree, 'parents': parents, 'message': message}
+        return sha
+
+    def files(self, branch=None):
+        """{path: bytes} at the head of branch."""
+        tree = self.trees[self.commit_objs[self.refs[branch or self.branch]]['tree']]
+        return {path: self.blobs[sha] for path, sha in tree.items()}
+
+    def route(self, method, path, body, headers):
+        parts = path.split('/git/', 1)
+        if len(parts) != 2:
+            return 404, {'message': 'not found'}
+        git_path = parts[1]
+
+        with self.lock:
+            if method == 'GET' and git_path.startswith('ref/heads/'):
+                branch = git_path[len('ref/heads/'):]
+                if branch not in self.refs:
+                    return 404, {'message': 'no ref'}
+                return 200, {'object': {'sha': self.refs[branch], 'type': 'commit'}}
+
+            if method == 'GET' and git_path.startswith('commits/'):
+                commit = self.commit_objs.get(git_path[len('commits/'):])
+                if commit is None:
+                    return 404, {'message': 'no commit'}
+                return 200, {'tree': {'sha': commit['tree']}, 'parents': commit['parents']}
+
+            if method == 'POST' and git_path == 'blobs':
+                data = base64.b64decode(body['content'])
+                sha = self._sha('blob', data)
+                self.blobs[sha] = data
+                return 201, {'sha': sha}
+
+            if method == 'POST' and git_path == 'trees':
+                entries = dict(self.trees.get(body.get('base_tree'), {}))
+                for entry in body['tree']:
+                    if entry['sha'] not in self.blobs:
+                        return 422, {'message': f"unknown blob {entry['sha']}"}
+                    entries[entry['path']] = entry['sha']
+                return 201, {'sha': self._store_tree(entries)}
+
+            if method == 'POST' and git_path == 'commits':
+                sha = self._store_commit(body['tree'], body['parents'], body['message'])
+                self.commits.append(sha)
+                return 201, {'sha': sha}
+
+            if method == 'PATCH' and git_path.startswith('refs/heads/'):
+                branch = git_path[len('refs/heads/'):]
+                new = body['sha']
+                if not body.get('force') and self.refs[branch] not in self.commit_objs[new]['parents']:
+                    return 422, {'message': 'not a fast forward'}
+                self.refs[branch] = new
+                return 200, {'object': {'sha': new}}
+
+        return 404, {'message': 'not found'}
+
+
+class MockSubstack(_MockServer):
+    """In-memory Substack drafts API. Requests without the right substack.sid get 401.
+
+    delay (seconds) is slept per draft request so tests can observe how many
+    requests the client keeps in flight (max_in_flight).
+    """
+
+    def __init__(self, token='test-sid', drafts=None, delay=0.0):
+        super().__init__()
+        self.token = token
+        self.delay = delay
+        self.drafts = {int(k): dict(v) for k, v in (drafts or {}).items()}
+        self.puts = []              # [(draft_id, body), ...]
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def route(self, method, path, body, headers):
+        cookie = SimpleCookie(headers.get('Cookie', ''))
+        if 'substack.sid' not in cookie or cookie['substack.sid'].value != self.token:
+            return 401, {'error': 'Not authorized'}
+
+        prefix = '/api/v1/drafts/'
+        if not path.startswith(prefix) or not path[len(prefix):].isdigit():
+            return 404, {'error': 'not found'}
+        draft_id = int(path[len(prefix):])
+
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            with self.lock:
+                if draft_id not in self.drafts:
+                    return 404, {'error': 'Draft not found'}
+                if method == 'GET':
+                    return 200, dict(self.drafts[draft_id], id=draft_id)
+                if method == 'PUT':
+                    self.puts.append((draft_id, body))
+                    self.drafts[draft_id].update(body)
+                    return 200, dict(self.drafts[draft_id], id=draft_id)
+            return 405, {'error': 'method not allowed'}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
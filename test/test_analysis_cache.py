@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for analysis_cache.py
+
+Run from project root: python test/test_analysis_cache.py
+Uses a counting stand-in analyzer, so no shared publishing tools are needed.
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analysis_cache import AnalysisCache, CachedAnalyzer
+
+# --- Fixtures ---
+
+ARTICLE = """\
+# Cache Test Article
+
+Some content with 42% data density.
+"""
+
+
+class CountingAnalyzer:
+    """Returns a small analysis dict and counts how often it really ran."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def analyze_content_3d(self, article_path):
+        self.calls += 1
+        text = Path(article_path).read_text(encoding='utf-8')
+        return {
+            'traditional_seo': {'score': len(text) % 100, 'grade': 'C'},
+            'geo': {'score': 70, 'dimensions': {'quotability': 3.5}},
+            'voice_profile': {'formality': 3, 'data_heaviness': 4},
+        }
+
+
+def make_analyzer(cache_dir, version='v1', **cache_kwargs):
+    cache = AnalysisCache(cache_dir, analyzer_version=version, **cache_kwargs)
+    return CachedAnalyzer(analyzer=CountingAnalyzer(), cache=cache)
+
+
+def write_article(directory, name, content=ARTICLE):
+    path = Path(directory) / name
+    path.write_text(content, encoding='utf-8')
+    return path
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+# --- Tests ---
+
+def test_second_call_is_cache_hit():
+    with tempfile.TemporaryDirectory() as tmp:
+        analyzer = make_analyzer(Path(tmp) / 'cache')
+        path = write_article(tmp, 'a.md')
+        first = analyzer.analyze_content_3d(path)
+        second = analyzer.analyze_content_3d(path)
+        assert first == second, 'Cached analysis differs from original'
+        assert analyzer.analyzer.calls == 1, f'Analyzer ran {analyzer.analyzer.calls} times'
+        stats = analyzer.cache.stats()
+        assert (stats['hits'], stats['misses']) == (1, 1), f'Unexpected counters: {stats}'
+
+
+def test_cache_survives_new_instance():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_article(tmp, 'a.md')
+        make_analyzer(Path(tmp) / 'cache').analyze_content_3d(path)
+        second = make_analyzer(Path(tmp) / 'cache')
+        second.analyze_content_3d(path)
+        assert second.analyzer.calls == 0, 'On-disk entry was not reused'
+
+
+def test_edit_invalidates_entry():
+    with tempfile.TemporaryDirectory() as tmp:
+        analyzer = make_analyzer(Path(tmp) / 'cache')
+        path = write_article(tmp, 'a.md')
+        analyzer.analyze_content_3d(path)
+        write_article(tmp, 'a.md', ARTICLE + '\nOne more paragraph.\n')
+        analyzer.analyze_content_3d(path)
+        assert analyzer.analyzer.calls == 2, 'Edited article served a stale analysis'
+
+
+def test_same_bytes_different_path_share_entry():
+    with tempfile.TemporaryDirectory() as tmp:
+        analyzer = make_analyzer(Path(tmp) / 'cache')
+        analyzer.analyze_content_3d(write_article(tmp, 'a.md'))
+        analyzer.analyze_content_3d(write_article(tmp, 'copy.md'))
+        assert analyzer.analyzer.calls == 1, 'Identical content was analyzed twice'
+
+
+def test_analyzer_version_is_part_of_key():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_article(tmp, 'a.md')
+        make_analyzer(Path(tmp) / 'cache', version='v1').analyze_content_3d(path)
+        upgraded = make_analyzer(Path(tmp) / 'cache', version='v2')
+        upgraded.analyze_content_3d(path)
+        assert upgraded.analyzer.calls == 1, 'Analyzer upgrade did not invalidate cache'
+
+
+def test_lru_eviction_by_entry_count():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AnalysisCache(Path(tmp) / 'cache', analyzer_version='v1', max_entries=2)
+        for i in range(3):
+            cache.put(cache.key(f'article {i}'.encode()), {'n': i})
+        # Touch entry 1 so entry 2 becomes the least recently used survivor
+        cache.get(cache.key(b'article 1'))
+        cache.put(cache.key(b'article 3'), {'n': 3})
+        assert cache.stats()['entries'] == 2, f'Expected 2 entries, got {cache.stats()}'
+        assert cache.get(cache.key(b'article 1')) == {'n': 1}, 'Recently used entry was evicted'
+        assert cache.get(cache.key(b'article 0')) is None, 'Oldest entry was not evicted'
+        assert cache.evictions == 2, f'Expected 2 evictions, got {cache.evictions}'
+
+
+def test_eviction_by_total_bytes():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AnalysisCache(Path(tmp) / 'cache', analyzer_version='v1', max_bytes=5000)
+        for i in range(5):
+            cache.put(cache.key(str(i).encode()), {'blob': 'x' * 2000})
+        assert cache.stats()['bytes'] <= 5000, f'Cache over byte bound: {cache.stats()}'
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Analysis Cache Tests')
+    print('=' * 55)
+
+    tests = [
+        ('second call is a cache hit', test_second_call_is_cache_hit),
+        ('entry survives new instance', test_cache_survives_new_instance),
+        ('edit invalidates entry', test_edit_invalidates_entry),
+        ('same bytes share one entry', test_same_bytes_different_path_share_entry),
+        ('analyzer version in key', test_analyzer_version_is_part_of_key),
+        ('LRU eviction by entry count', test_lru_eviction_by_entry_count),
+        ('eviction by total bytes', test_eviction_by_total_bytes),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Tests for batch_image_uploader.py against a local GitHub stand-in server
+
+Run from project root: python test/test_batch_image_uploader.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from batch_image_uploader import BatchImageUploader, ImageManifest, UploadError, cdn_path, content_hash
+from mock_servers import MockGitHub
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+def make_images(directory, n):
+    paths = []
+    for i in range(n):
+        path = Path(directory) / f'chart_{i}.png'
+        path.write_bytes(b'\x89PNG fake image ' + bytes([i]) * (i + 1))
+        paths.append(path)
+    return paths
+
+
+def make_uploader(gh, manifest_dir, **kwargs):
+    kwargs.setdefault('backoff', 0)
+    kwargs.setdefault('manifest', ImageManifest(Path(manifest_dir) / 'manifest.json'))
+    return BatchImageUploader('owner', 'repo', api_base=gh.url, token='t', **kwargs)
+
+
+# --- Tests ---
+
+def test_cdn_path_format():
+    digest = content_hash(b'chart')
+    expected = f'images/{digest[:2]}/Chart_{digest[:12]}.png'
+    assert cdn_path('dir/Chart.PNG', digest) == expected, cdn_path('dir/Chart.PNG', digest)
+
+
+def test_batch_is_one_commit():
+    with tempfile.TemporaryDirectory() as tmp, MockGitHub() as gh:
+        images = make_images(tmp, 6)
+        entries = make_uploader(gh, tmp).upload_images(images)
+
+        assert len(gh.commits) == 1, f'{len(gh.commits)} commits for one batch'
+        assert gh.count('PATCH', '/repos/owner/repo/git/refs/') == 1, 'Ref updated more than once'
+        assert gh.count('POST', '/repos/owner/repo/git/blobs') == 6, 'Expected one blob per image'
+        assert {e['commit'] for e in entries} == {gh.commits[0]}, 'Entries do not report the batch commit'
+
+
+def test_uploaded_content_and_urls():
+    with tempfile.TemporaryDirectory() as tmp, MockGitHub() as gh:
+        images = make_images(tmp, 3)
+        entries = make_uploader(gh, tmp).upload_images(images)
+
+        files = gh.files()
+        for image, entry in zip(images, entries):
+            assert entry['local_path'] == str(image), 'Entries are not in input order'
+            assert files[entry['repo_path']] == image.read_bytes(), f'{entry["repo_path"]}: wrong content'
+            assert entry['url'] == f'https://owner.github.io/repo/{entry["repo_path"]}', entry['url']
+
+
+def test_existing_files_are_kept():
+    with tempfile.TemporaryDirectory() as tmp, MockGitHub() as gh:
+        uploader = make_uploader(gh, tmp)
+        first = uploader.upload_files({'images/old.png': b'old'})
+        uploader.upload_images(make_images(tmp, 2))
+        assert gh.files()['images/old.png'] == b'old', 'Base tree was not carried forward'
+        assert gh.commit_objs[gh.commits[1]]['parents'] == [first], 'Second commit is not on top of the first'
+
+
+def test_transient_errors_are_retried():
+    with tempfile.TemporaryDirectory() as tmp, MockGitHub() as gh:
+        gh.fail_next[('POST', '/repos/owner/repo/git/blobs')] = [502, 429]
+        gh.fail_next[('POST', '/repos/owner/repo/git/commits')] = [503]
+        entries = make_uploader(gh, tmp).upload_images(make_images(tmp, 3))
+        assert len(entries) == 3 and len(gh.commits) == 1, 'Upload did not recover from transient errors'
+        assert gh.count('POST', '/repos/owner/repo/git/blobs') == 5, 'Failed blob requests were not retried'
+
+
+def test_persistent_error_raises():
+    with tempfile.TemporaryDirectory() as tmp, MockGitHub() as gh:
+        gh.fail_next[('GET', '/repos/owner/repo/git/ref/')] = [500] * 10
+        try:
+            make_uploader(gh, tmp, retries=2).upload_images(make_images(tmp, 1))
+        except UploadError:
+            pass
+        else:
+            raise AssertionError('Expected UploadError after retries were exhausted')
+        assert gh.commits == [], 'Commit created despite failure'
+
+
+def test_same_name_images_are_both_kept():
+    with tempfile.TemporaryDirectory() as tmp, MockGitHub() as gh:
+        a, b = Path(tmp) / 'a', Path(tmp) / 'b'
+        a.mkdir()
+        b.mkdir()
+        (a / 'chart.png').write_bytes(b'first')
+        (b / 'chart.png').write_bytes(b'second')
+        entries = make_uploader(gh, tmp).upload_images([a / 'chart.png', b / 'chart.png'])
+        paths = [e['repo_path'] for e in entries]
+        assert len(set(paths)) == 2, f'Same-name images collided: {paths}'
+        assert gh.files()[paths[1]] == b'second'
+
+
+def test_republish_reuses_uploaded_images():
+    with tempfile.TemporaryDirectory() as tmp, MockGitHub() as gh:
+        images = make_images(tmp, 3)
+        first = make_uploader(gh, tmp).upload_images(images)
+        calls_before = len(gh.requests)
+
+        # Fresh uploader, same manifest file: as if publishing again later
+        again = make_uploader(gh, tmp).upload_images(images)
+        assert len(gh.requests) == calls_before, 'Re-publish hit the API'
+        assert len(gh.commits) == 1, 'Re-publish made a commit'
+        assert all(e['reused'] for e in again), 'Entries not marked reused'
+        assert [e['url'] for e in again] == [e['url'] for e in first], 'Reused URLs differ'
+
+
+def test_identical_bytes_upload_once():
+    with tempfile.TemporaryDirectory() as tmp, MockGitHub() as gh:
+        (Path(tmp) / 'a.png').write_bytes(b'same chart')
+        (Path(tmp) / 'b.png').write_bytes(b'same chart')
+        entries = make_uploader(gh, tmp).upload_images([Path(tmp) / 'a.png', Path(tmp) / 'b.png'])
+        assert entries[0]['url'] == entries[1]['url'], 'Identical images got different URLs'
+        assert gh.count('POST', '/repos/owner/repo/git/blobs') == 1, 'Identical bytes uploaded twice'
+
+
+def test_mixed_batch_uploads_only_new_images():
+    with tempfile.TemporaryDirectory() as tmp, MockGitHub() as gh:
+        old = make_images(tmp, 2)
+        make_uploader(gh, tmp).upload_images(old)
+        new = Path(tmp) / 'new.png'
+        new.write_bytes(b'new chart')
+        entries = make_uploader(gh, tmp).upload_images(old + [new])
+        assert [e['reused'] for e in entries] == [True, True, False], entries
+        assert gh.count('POST', '/repos/owner/repo/git/blobs') == 3, 'Reused images were uploaded again'
+        assert entries[2]['commit'] == gh.commits[1]
+
+
+def test_manifest_is_per_repo():
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = ImageManifest(Path(tmp) / 'manifest.json')
+        manifest.put('owner/repo', 'abc', {'url': 'u'})
+        manifest.save()
+        reloaded = ImageManifest(Path(tmp) / 'manifest.json')
+        assert reloaded.get('owner/repo', 'abc') == {'url': 'u'}
+        assert reloaded.get('owner/other', 'abc') is None, 'Manifest leaked across repos'
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Batch Image Uploader Tests')
+    print('=' * 55)
+
+    tests = [
+        ('cdn path format', test_cdn_path_format),
+        ('batch is one commit', test_batch_is_one_commit),
+        ('uploaded content and urls', test_uploaded_content_and_urls),
+        ('existing files are kept', test_existing_files_are_kept),
+        ('transient errors are retried', test_transient_errors_are_retried),
+        ('persistent error raises', test_persistent_error_raises),
+        ('same-name images are both kept', test_same_name_images_are_both_kept),
+        ('re-publish reuses uploaded images', test_republish_reuses_uploaded_images),
+        ('identical bytes upload once', test_identical_bytes_upload_once),
+        ('mixed batch uploads only new images', test_mixed_batch_uploads_only_new_images),
+        ('manifest is per repo', test_manifest_is_per_repo),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Tests for batch_reoptimize.py, end to end against the local Substack stand-in
+
+Run from project root: python test/test_batch_reoptimize.py
+"""
+import sys
+import json
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_servers import MockSubstack
+from substack_client import SubstackClient
+from tag_vocabulary import TagIndex
+from batch_reoptimize import Pipeline, StatusLog, choose_strategy, load_manifest
+
+TOKEN = 'test-sid'
+VERSIONS = ('analyzer-v1', 'engine-v1')
+TAGS = TagIndex({'substack:tags': ['Data Science', 'Python'], 'medium:tags': ['Data Science', 'Python']})
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+# --- Stand-ins for the shared analyzer and engine ---
+
+class FakeAnalyzer:
+    delay = 0.0
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    def analyze_content_3d(self, path):
+        text = Path(path).read_text(encoding='utf-8')
+        with FakeAnalyzer.lock:
+            FakeAnalyzer.active += 1
+            FakeAnalyzer.max_active = max(FakeAnalyzer.max_active, FakeAnalyzer.active)
+        try:
+            time.sleep(self.delay)
+        finally:
+            with FakeAnalyzer.lock:
+                FakeAnalyzer.active -= 1
+        return {'voice_profile': {'formality': 3}, 'title': text.splitlines()[0].lstrip('# ')}
+
+
+class FakeEngine:
+    def __init__(self, analysis):
+        self.analysis = analysis
+
+    def optimize_all_strategies(self, analysis, platform):
+        title = analysis['title']
+        return {
+            strategy: {'title': f'{title} ({strategy})', 'description': f'{title}: {platform} {strategy}',
+                       'tags': ['data-science', 'Python'], 'scores': {'combined': combined}}
+            for strategy, combined in (('balanced', 70), ('seo_heavy', 80))
+        }
+
+
+def write_catalogue(tmp, n=3):
+    items = []
+    for i in range(1, n + 1):
+        article = Path(tmp) / f'article_{i}.md'
+        article.write_text(f'# Article {i}\n\nBody {i}.\n', encoding='utf-8')
+        items.append({'article': str(article), 'substack_draft_id': i, 'medium_story_id': f'story{i}'})
+    return items
+
+
+def medium_builder(story_id, result):
+    return {'submission_url': f'https://medium.com/p/{story_id}/submission', 'js': result['title']}
+
+
+def make_pipeline(server, tmp, **kwargs):
+    kwargs.setdefault('status_log', StatusLog(Path(tmp) / 'status.jsonl'))
+    kwargs.setdefault('tag_index', TAGS)
+    return Pipeline(substack_client=SubstackClient(server.url, token=TOKEN, backoff=0),
+                    medium_builder=medium_builder, analyzer_factory=FakeAnalyzer,
+                    engine_factory=FakeEngine, versions=VERSIONS, **kwargs)
+
+
+def drafts(n):
+    return {i: {'title': f'Draft {i}'} for i in range(1, n + 1)}
+
+
+# --- Tests ---
+
+def test_end_to_end_against_mock_substack():
+    with tempfile.TemporaryDirectory() as tmp, MockSubstack(TOKEN, drafts(3)) as server:
+        items = write_catalogue(tmp)
+        report = make_pipeline(server, tmp).run(items)
+
+        assert report['ok'] and report['counts'] == {'ok': 3, 'failed': 0, 'skipped': 0}, report
+        assert [r['item'] for r in report['items']] == [i['article'] for i in items], 'Order not kept'
+        first = report['items'][0]
+        assert first['strategies'] == {'substack': 'seo_heavy', 'medium': 'seo_heavy'}, first
+        assert first['stages']['medium']['detail']['js'] == 'Article 1 (seo_heavy)', first
+
+        assert len(server.puts) == 3, server.puts
+        draft = server.drafts[1]
+        assert draft['search_engine_title'] == 'Article 1 (seo_heavy)', draft
+        assert draft['postTags'] == [{'name': 'Data Science'}, {'name': 'Python'}], 'Tags not resolved'
+
+        log = [json.loads(line) for line in (Path(tmp) / 'status.jsonl').read_text().splitlines()]
+        assert sum(r['stage'] == 'item' and r['status'] == 'ok' for r in log) == 3, log
+        assert {r['stage'] for r in log} == {'analyze', 'optimize', 'substack', 'medium', 'item'}
+
+
+def test_resume_skips_unchanged_items():
+    with tempfile.TemporaryDirectory() as tmp, MockSubstack(TOKEN, drafts(3)) as server:
+        items = write_catalogue(tmp)
+        make_pipeline(server, tmp).run(items)
+
+        report = make_pipeline(server, tmp, resume=True).run(items)
+        assert report['counts'] == {'ok': 0, 'failed': 0, 'skipped': 3}, report['counts']
+
+        Path(items[1]['article']).write_text('# Article 2 revised\n', encoding='utf-8')
+        report = make_pipeline(server, tmp, resume=True).run(items)
+        assert report['counts'] == {'ok': 1, 'failed': 0, 'skipped': 2}, report['counts']
+        assert report['items'][1]['status'] == 'ok', report['items'][1]
+        assert server.drafts[2]['search_engine_title'] == 'Article 2 revised (seo_heavy)'
+        assert len(server.puts) == 4, server.puts
+
+        # A vocabulary rebuild changes resolved tags, so every item re-runs
+        rebuilt = TagIndex({'substack:tags': ['Data Science', 'Python', 'SEO'],
+                            'medium:tags': ['Data Science', 'Python']})
+        report = make_pipeline(server, tmp, resume=True, tag_index=rebuilt).run(items)
+        assert report['counts'] == {'ok': 3, 'failed': 0, 'skipped': 0}, report['counts']
+
+
+def test_dry_run_writes_nothing():
+    with tempfile.TemporaryDirectory() as tmp, MockSubstack(TOKEN, drafts(2)) as server:
+        items = write_catalogue(tmp, n=2)
+        report = make_pipeline(server, tmp, dry_run=True).run(items)
+
+        assert report['ok'] and report['dry_run'], report
+        assert server.puts == [], 'Dry run wrote to Substack'
+        detail = report['items'][0]['stages']['substack']['detail']
+        assert detail == {'would_send': ['postTags', 'search_engine_description', 'search_engine_title']}, detail
+        assert not (Path(tmp) / 'status.jsonl').exists(), 'Dry run wrote to the status log'
+
+        # A dry run never counts as completed work
+        report = make_pipeline(server, tmp, resume=True).run(items)
+        assert report['counts']['ok'] == 2 and len(server.puts) == 2, report['counts']
+
+
+def test_failures_are_per_item():
+    with tempfile.TemporaryDirectory() as tmp, MockSubstack(TOKEN, drafts(2)) as server:
+        items = write_catalogue(tmp, n=3)           # draft 3 doesn't exist
+        items.append({'article': str(Path(tmp) / 'missing.md'), 'substack_draft_id': 1})
+        items.append({'article': items[0]['article'], 'id': 'no-targets'})
+        items[1]['strategy'] = 'nonexistent'
+        report = make_pipeline(server, tmp).run(items)
+
+        status = [r['status'] for r in report['items']]
+        assert status == ['ok', 'failed', 'failed', 'failed', 'failed'], status
+        assert not report['ok'] and report['counts']['failed'] == 4
+        by_item = {r['item']: r for r in report['items']}
+        assert by_item[items[1]['article']]['stages']['optimize']['status'] == 'failed'
+        failed_at = by_item[items[2]['article']]['stages']
+        assert failed_at['substack']['status'] == 'failed' and failed_at['medium']['status'] == 'ok', failed_at
+        assert 'analyze' in by_item[items[3]['article']]['error']
+        assert 'substack_draft_id' in by_item['no-targets']['error']
+
+
+def test_stage_concurrency_is_bounded():
+    with tempfile.TemporaryDirectory() as tmp, MockSubstack(TOKEN, drafts(6), delay=0.05) as server:
+        items = write_catalogue(tmp, n=6)
+        FakeAnalyzer.delay, FakeAnalyzer.max_active = 0.05, 0
+        try:
+            report = make_pipeline(server, tmp, limits={'analyze': 2, 'substack': 1}).run(items)
+        finally:
+            FakeAnalyzer.delay = 0.0
+        assert report['ok'], report
+        assert FakeAnalyzer.max_active == 2, f'analyze ran {FakeAnalyzer.max_active} at once'
+        assert server.max_in_flight == 1, f'substack ran {server.max_in_flight} at once'
+
+        # Pipelined: later items are analyzed while earlier ones are at the SEO stage
+        stages = [r['stages'] for r in report['items']]
+        first_seo_end = stages[0]['substack']['start'] + stages[0]['substack']['elapsed']
+        assert stages[-1]['analyze']['start'] < first_seo_end, 'Stages ran item by item'
+
+
+def test_items_are_fed_through_a_bounded_queue():
+    pulled = []
+    pulled_at_first_analysis = []
+
+    class CountingAnalyzer(FakeAnalyzer):
+        def analyze_content_3d(self, path):
+            if not pulled_at_first_analysis:
+                pulled_at_first_analysis.append(len(pulled))
+            return super().analyze_content_3d(path)
+
+    def lazy_items(items):
+        for item in items:
+            pulled.append(item['article'])
+            yield item
+
+    with tempfile.TemporaryDirectory() as tmp, MockSubstack(TOKEN, drafts(30)) as server:
+        items = write_catalogue(tmp, n=30)
+        pipeline = make_pipeline(server, tmp, in_flight=2)
+        pipeline.analyzer_factory = CountingAnalyzer
+        report = pipeline.run(lazy_items(items))
+        assert report['counts']['ok'] == 30, report['counts']
+        assert [r['item'] for r in report['items']] == [i['article'] for i in items], 'Order not kept'
+        # 2 consumers + a 2-slot queue (+1 the producer holds) before anything is analyzed
+        assert pulled_at_first_analysis[0] <= 5, f'{pulled_at_first_analysis[0]} items pulled up front'
+
+
+def test_large_details_go_to_payload_files():
+    def big_builder(story_id, result):
+        return {'submission_url': f'https://medium.com/p/{story_id}/submission', 'js': result['title'] * 200}
+
+    with tempfile.TemporaryDirectory() as tmp, MockSubstack(TOKEN, drafts(2)) as server:
+        items = write_catalogue(tmp, n=2)
+        pipeline = make_pipeline(server, tmp)
+        pipeline.medium_builder = big_builder
+        report = pipeline.run(items)
+
+        log = (Path(tmp) / 'status.jsonl').read_text().splitlines()
+        assert max(len(line) for line in log) < 1000, 'Payload written into the status log'
+        medium = [json.loads(line) for line in log if json.loads(line)['stage'] == 'medium']
+        ref = medium[0]['detail']['payload']
+        payload = json.loads(Path(ref['path']).read_text(encoding='utf-8'))
+        assert payload['js'] == 'Article 1 (seo_heavy)' * 200, payload['submission_url']
+        assert report['items'][0]['stages']['medium']['detail'] == medium[0]['detail']
+        substack = next(json.loads(line) for line in log if json.loads(line)['stage'] == 'substack')
+        assert 'sent' in substack['detail'], 'Small details should stay inline'
+
+
+def test_manifest_and_strategy_choice():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'catalogue.jsonl'
+        path.write_text('{"article": "a.md", "substack_draft_id": 1}\n\n{"article": "b.md", "id": "b"}\n')
+        items = load_manifest(path)
+        assert [i['id'] for i in items] == ['a.md', 'b'], items
+
+        path = Path(tmp) / 'dupes.json'
+        path.write_text(json.dumps([{'article': 'a.md'}, {'article': 'a.md'}]))
+        try:
+            load_manifest(path)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('Duplicate items accepted')
+
+    strategies = FakeEngine(None).optimize_all_strategies({'title': 'T'}, 'substack')
+    assert choose_strategy(strategies)[0] == 'seo_heavy'
+    assert choose_strategy(strategies, 'balanced')[0] == 'balanced'
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Batch Re-optimization Tests')
+    print('=' * 55)
+
+    tests = [
+        ('end to end against mock Substack', test_end_to_end_against_mock_substack),
+        ('resume skips unchanged items', test_resume_skips_unchanged_items),
+        ('dry run writes nothing', test_dry_run_writes_nothing),
+        ('failures are per item', test_failures_are_per_item),
+        ('stage concurrency is bounded', test_stage_concurrency_is_bounded),
+        ('items are fed through a bounded queue', test_items_are_fed_through_a_bounded_queue),
+        ('large details go to payload files', test_large_details_go_to_payload_files),
+        ('manifest and strategy choice', test_manifest_and_strategy_choice),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
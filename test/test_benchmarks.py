@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for run_benchmarks.py (fixtures and baseline comparison, not timings)
+
+Run from project root: python test/test_benchmarks.py
+"""
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from run_benchmarks import (ARTICLE_SIZES, BASELINE_PATH, make_article, compare, ungated, lower_quartile,
+                            save_baselines, load_baselines)
+from table_tokenizer import parse_tables
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+# --- Tests ---
+
+def test_fixture_sizes_match_spec():
+    for size, spec in ARTICLE_SIZES.items():
+        article = make_article(**spec)
+        body = article.split('---\n', 2)[2]
+        words = len(body.split())
+        assert words >= spec['words'], f'{size}: {words} words < {spec["words"]}'
+        assert body.count('![Figure') == spec['images'], f'{size}: wrong image count'
+        assert len(parse_tables(body)) == spec['tables'], f'{size}: wrong table count'
+
+
+def test_fixtures_are_deterministic():
+    spec = ARTICLE_SIZES['short']
+    assert make_article(seed=1, **spec) == make_article(seed=1, **spec), 'Same seed gave different articles'
+
+
+def test_compare_flags_regressions_only():
+    baselines = {'fast': {'median': 1.0}, 'slow': {'median': 1.0}}
+    results = {'fast': {'median': 1.2}, 'slow': {'median': 1.5}, 'new': {'median': 9.0}}
+    regressions = compare(results, baselines, tolerance=0.3)
+    assert [r[0] for r in regressions] == ['slow'], regressions
+
+
+def test_noise_floor_ignores_small_absolute_slowdowns():
+    baselines = {'micro': {'median': 0.0003}, 'macro': {'median': 0.030}}
+    results = {'micro': {'median': 0.0006}, 'macro': {'median': 0.060}}
+    regressions = compare(results, baselines, tolerance=0.3, noise_floor=0.005)
+    assert [r[0] for r in regressions] == ['macro'], regressions
+
+
+def test_compare_scales_by_calibration():
+    baselines = {'md': {'median': 0.020, 'relative': 5.0, 'calibration': 0.004}}
+    # Half-speed machine: twice the time, twice the calibration -> same relative time
+    slower_machine = {'md': {'median': 0.040, 'relative': 5.0, 'calibration': 0.008}}
+    assert compare(slower_machine, baselines) == [], 'A slower machine read as a regression'
+    # Same machine, code got 2x slower
+    regressed = {'md': {'median': 0.040, 'relative': 10.0, 'calibration': 0.004}}
+    (name, median, expected, ratio), = compare(regressed, baselines)
+    assert abs(ratio - 2.0) < 1e-9 and abs(expected - 0.020) < 1e-9, (median, expected, ratio)
+
+
+def test_recorded_spread_widens_tolerance():
+    baselines = {'steady': {'median': 0.020, 'relative': 5.0, 'calibration': 0.004, 'spread': 0.05},
+                 'noisy': {'median': 0.020, 'relative': 5.0, 'calibration': 0.004, 'spread': 0.40}}
+    results = {name: {'median': 0.034, 'relative': 8.5, 'calibration': 0.004} for name in baselines}
+    regressions = compare(results, baselines, tolerance=0.3)
+    assert [r[0] for r in regressions] == ['steady'], regressions
+
+
+def test_lower_quartile_ignores_slow_outliers():
+    assert lower_quartile([5.0, 5.1, 5.2, 5.0, 9.0, 12.0, 5.1, 5.3, 20.0]) == 5.1
+
+
+def test_ungated_benchmarks_are_reported():
+    baselines = {'md': {'median': 0.02}}
+    results = {'md': {'median': 0.02}, 'new': {'median': 0.01}}
+    skipped = {'analyze': "No module named 'multi_dim_analyzer'"}
+    missing = dict(ungated(results, skipped, baselines))
+    assert set(missing) == {'new', 'analyze'}, missing
+    assert missing['new'] == 'no baseline' and 'multi_dim_analyzer' in missing['analyze'], missing
+
+
+def test_save_merges_existing_baselines():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'baselines.json'
+        save_baselines({'a': {'median': 1.0, 'min': 0.9}}, path)
+        save_baselines({'b': {'median': 2.0, 'min': 1.9}}, path)
+        assert set(load_baselines(path)) == {'a', 'b'}, 'Earlier baseline entries were dropped'
+
+
+def test_committed_baselines_load():
+    data = json.loads(BASELINE_PATH.read_text(encoding='utf-8'))
+    assert data['benchmarks'], 'No committed baselines'
+    for name, entry in data['benchmarks'].items():
+        assert entry['median'] > 0, f'{name}: non-positive baseline'
+        assert entry.get('relative', 0) > 0 and entry.get('calibration', 0) > 0, f'{name}: not calibrated'
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Benchmark Harness Tests')
+    print('=' * 55)
+
+    tests = [
+        ('fixture sizes match spec', test_fixture_sizes_match_spec),
+        ('fixtures are deterministic', test_fixtures_are_deterministic),
+        ('compare flags regressions only', test_compare_flags_regressions_only),
+        ('noise floor ignores small absolute slowdowns', test_noise_floor_ignores_small_absolute_slowdowns),
+        ('compare scales by calibration', test_compare_scales_by_calibration),
+        ('recorded spread widens tolerance', test_recorded_spread_widens_tolerance),
+        ('lower quartile ignores slow outliers', test_lower_quartile_ignores_slow_outliers),
+        ('ungated benchmarks are reported', test_ungated_benchmarks_are_reported),
+        ('save merges existing baselines', test_save_merges_existing_baselines),
+        ('committed baselines load', test_committed_baselines_load),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for candidate_scoring.py
+
+Run from project root: python test/test_candidate_scoring.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from candidate_scoring import OBJECTIVE_KEYS, candidate_features, score_candidates, FEATURES
+
+# --- Fixtures ---
+
+ANALYSIS = {
+    'traditional_seo': {'score': 56, 'grade': 'C', 'keywords': ['automation', 'publishing']},
+    'geo': {'score': 65},
+    'voice_profile': {'formality': 4, 'data_heaviness': 4},
+}
+
+# Balanced Substack result from test/optimization_results_20260216_190857.json
+REFERENCE = {
+    'strategy': 'balanced',
+    'title': 'Test Article with Images',
+    'description': 'Automation: technology framework, validated methodology',
+    'tags': ['Automation', 'Publishing', 'Images'],
+    'scores': {'seo': 56, 'geo': 65, 'platform_fit': 80, 'voice_distance': 10, 'combined': 63},
+}
+
+DATA_DENSE = dict(REFERENCE, description=(
+    'Automation publishing model: 40 years of data, 70% accuracy, validated methodology, '
+    'reproducible statistical framework for editors'))
+PROMOTIONAL = dict(REFERENCE, description='Discover the amazing secrets of automation! Easy tips!')
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+# --- Tests ---
+
+def test_batch_shapes():
+    features = candidate_features(ANALYSIS, 'substack', [REFERENCE, DATA_DENSE, PROMOTIONAL])
+    assert features.shape == (3, len(FEATURES)), features.shape
+    scores = score_candidates(ANALYSIS, 'substack', [REFERENCE, DATA_DENSE, PROMOTIONAL])
+    assert set(scores) == set(OBJECTIVE_KEYS), scores.keys()
+    assert all(len(v) == 3 and 0 <= v.min() and v.max() <= 100 for v in scores.values()), scores
+
+
+def test_empty_batch():
+    scores = score_candidates(ANALYSIS, 'medium', [])
+    assert all(len(v) == 0 for v in scores.values()), scores
+
+
+def test_reference_keeps_engine_scores():
+    scores = score_candidates(ANALYSIS, 'substack', [REFERENCE, DATA_DENSE], reference=REFERENCE)
+    for key in OBJECTIVE_KEYS:
+        assert scores[key][0] == REFERENCE['scores'][key], (key, scores[key][0])
+
+
+def test_metadata_moves_scores():
+    scores = score_candidates(ANALYSIS, 'substack', [REFERENCE, DATA_DENSE, PROMOTIONAL], reference=REFERENCE)
+    assert scores['geo'][1] > scores['geo'][0], 'Numbers and methodology terms should raise GEO'
+    assert scores['platform_fit'][1] > scores['platform_fit'][0], 'A 120-140 char description fits Substack better'
+    assert scores['voice_distance'][2] > scores['voice_distance'][0], 'Promotional wording should move the voice'
+    assert scores['geo'][2] < scores['geo'][0], 'Promotional wording should lower GEO'
+
+
+def test_strategy_weights_combined():
+    keyword_heavy = dict(REFERENCE, description='Automation and publishing for automation publishing teams')
+    candidates = [keyword_heavy, DATA_DENSE]
+    seo = score_candidates(ANALYSIS, 'medium', candidates, strategy='seo_heavy')
+    geo = score_candidates(ANALYSIS, 'medium', candidates, strategy='geo_heavy')
+    assert (geo['combined'][1] - geo['combined'][0]) > (seo['combined'][1] - seo['combined'][0]), \
+        'geo_heavy should favour the data-dense description more than seo_heavy does'
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Candidate Scoring Tests')
+    print('=' * 55)
+
+    tests = [
+        ('batch shapes', test_batch_shapes),
+        ('empty batch', test_empty_batch),
+        ('reference keeps engine scores', test_reference_keeps_engine_scores),
+        ('metadata moves scores', test_metadata_moves_scores),
+        ('strategy weights combined', test_strategy_weights_combined),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
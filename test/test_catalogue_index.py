@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for catalogue_index.py (SQLite cross-run index of matrix results)
+
+Run from project root: python test/test_catalogue_index.py
+"""
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from catalogue_index import CatalogueIndex, run_id_for
+from results_store import ResultsSink
+
+RESULTS_FILE = Path(__file__).resolve().parent / 'optimization_results_20260216_190857.json'
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+def row(article, article_type, platform, strategy, combined, seo=50):
+    return {'article': article, 'article_type': article_type, 'platform': platform,
+            'strategy': strategy, 'seo_score': seo, 'geo_score': 50, 'platform_fit': 50,
+            'voice_distance': 10, 'combined_score': combined,
+            'description': f'{strategy} description', 'tags': ['Automation']}
+
+
+def max_over_results(path):
+    """The summary the runner used to compute: max() over each strategy dict."""
+    with open(path, 'r', encoding='utf-8') as f:
+        results = json.load(f)['results']
+    best = []
+    for article, platforms in results.items():
+        for platform, strategies in platforms.items():
+            if strategies:
+                strategy = max(strategies, key=lambda s: strategies[s]['scores']['combined'])
+                best.append((article, platform, strategy, strategies[strategy]['scores']['combined']))
+    return best
+
+
+# --- Tests ---
+
+def test_results_file_best_matches_max():
+    with CatalogueIndex(':memory:') as index:
+        count = index.add_results_file(RESULTS_FILE)
+        assert count == 10, f'Expected 10 cells, got {count}'
+        best = [(b['article'], b['platform'], b['strategy'], b['combined'])
+                for b in index.best_per_cell(run_id_for(RESULTS_FILE))]
+    assert best == max_over_results(RESULTS_FILE), best
+
+
+def test_jsonl_stream_indexed():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'optimization_results_20260301_120000.jsonl'
+        with ResultsSink(path) as sink:
+            sink.write_run('2026-03-01T12:00:00', ['Only'])
+            sink.write_article('Only', 'tutorial', ['substack'])
+            for strategy, combined in (('balanced', 60), ('seo_heavy', 70)):
+                sink.write_cell('Only', 'substack', strategy, {},
+                                row('Only', 'tutorial', 'substack', strategy, combined))
+        with CatalogueIndex(':memory:') as index:
+            assert index.add_results_file(path) == 2
+            runs = index.runs()
+            assert [r['run_id'] for r in runs] == ['20260301_120000'], runs
+            assert runs[0]['generated'] == '2026-03-01T12:00:00', runs
+            best = index.best_per_cell('20260301_120000')
+    assert [b['strategy'] for b in best] == ['seo_heavy'], best
+
+
+def test_readding_run_replaces_rows():
+    with CatalogueIndex(':memory:') as index:
+        index.add_run('r1', '2026-03-01T00:00:00', [row('A', 'opinion', 'medium', 'balanced', 40)])
+        index.add_run('r1', '2026-03-01T00:00:00', [row('A', 'opinion', 'medium', 'balanced', 80),
+                                                    row('A', 'opinion', 'medium', 'geo_heavy', 50)])
+        runs = index.runs()
+        assert len(runs) == 1 and runs[0]['cells'] == 2, runs
+        best = index.best_strategies()
+    assert best[0]['strategy'] == 'balanced' and best[0]['best'] == 80, best
+
+
+def test_best_strategies_over_last_runs():
+    with CatalogueIndex(':memory:') as index:
+        # Older runs favoured seo_heavy; the two most recent favour balanced
+        for day, (balanced, seo_heavy) in enumerate([(40, 90), (45, 85), (80, 60), (75, 65)], start=1):
+            index.add_run(f'run{day}', f'2026-03-0{day}T00:00:00', [
+                row('A', 'research', 'substack', 'balanced', balanced),
+                row('A', 'research', 'substack', 'seo_heavy', seo_heavy),
+                row('B', 'research', 'medium', 'balanced', 10),
+                row('C', 'tutorial', 'substack', 'geo_heavy', 70),
+            ])
+
+        all_runs = index.best_strategies(platform='substack')
+        assert [(b['group'], b['strategy']) for b in all_runs] == [
+            ('research', 'seo_heavy'), ('tutorial', 'geo_heavy')], all_runs
+
+        recent = index.best_strategies(platform='substack', last_runs=2)
+        research = recent[0]
+        assert research['strategy'] == 'balanced', recent
+        assert research['mean'] == 77.5 and research['cells'] == 2, research
+
+        by_article = index.best_strategies(by='article', article_type='research')
+        assert [(b['group'], b['platform']) for b in by_article] == [
+            ('A', 'substack'), ('B', 'medium')], by_article
+
+        by_seo = index.best_strategies(platform='substack', article_type='research', metric='seo')
+        assert len(by_seo) == 1 and by_seo[0]['mean'] == 50, by_seo
+
+
+def test_rejects_unknown_group_and_metric():
+    with CatalogueIndex(':memory:') as index:
+        for kwargs in ({'by': 'strategy; DROP TABLE cells'}, {'metric': 'voice_distance'}):
+            try:
+                index.best_strategies(**kwargs)
+            except ValueError:
+                continue
+            raise AssertionError(f'Expected ValueError for {kwargs}')
+
+
+def test_platform_query_uses_index():
+    with CatalogueIndex(':memory:') as index:
+        plan = ' '.join(r['detail'] for r in index.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT strategy, AVG(combined) FROM cells "
+            "WHERE platform = ? AND article_type = ? GROUP BY strategy", ('substack', 'research')))
+    assert 'USING INDEX' in plan, plan
+
+
+def test_index_persists_on_disk():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / 'nested' / 'catalogue.db'
+        with CatalogueIndex(db) as index:
+            index.add_run('r1', '2026-03-01T00:00:00', [row('A', 'opinion', 'medium', 'balanced', 40)])
+        with CatalogueIndex(db) as index:
+            assert [r['run_id'] for r in index.runs()] == ['r1']
+            tags = index.conn.execute("SELECT tags FROM cells").fetchone()['tags']
+    assert json.loads(tags) == ['Automation'], tags
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Catalogue Index Tests')
+    print('=' * 55)
+
+    tests = [
+        ('results file best matches max()', test_results_file_best_matches_max),
+        ('jsonl stream indexed', test_jsonl_stream_indexed),
+        ('re-adding a run replaces its rows', test_readding_run_replaces_rows),
+        ('best strategies over last N runs', test_best_strategies_over_last_runs),
+        ('rejects unknown group and metric', test_rejects_unknown_group_and_metric),
+        ('platform query uses an index', test_platform_query_uses_index),
+        ('index persists on disk', test_index_persists_on_disk),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
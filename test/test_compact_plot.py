@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for compact_plot.py (binary point store, decimation, compact HTML)
+
+Run from project root: python test/test_compact_plot.py
+"""
+import sys
+import json
+import random
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from compact_plot import PLOTLY_CDN, RECORD, AGGREGATE, PointStore, decimate, write_html
+
+RESULTS_FILE = Path(__file__).resolve().parent / 'optimization_results_20260216_190857.json'
+STRATEGIES = ['balanced', 'seo_heavy', 'geo_heavy', 'platform_first', 'voice_preservation']
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+def synthetic_results(articles, seed=0):
+    rng = random.Random(seed)
+    return {
+        f'Article {a}': {
+            platform: {
+                s: {'scores': {'seo': rng.randint(0, 100), 'geo': rng.randint(0, 100),
+                               'platform_fit': rng.randint(0, 100), 'voice_distance': rng.randint(0, 100),
+                               'combined': rng.randint(0, 100)}}
+                for s in STRATEGIES
+            }
+            for platform in ('substack', 'medium')
+        }
+        for a in range(articles)
+    }
+
+
+# --- Tests ---
+
+def test_committed_results_round_trip():
+    results = json.loads(RESULTS_FILE.read_text(encoding='utf-8'))['results']
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PointStore(Path(tmp) / 'points')
+        assert store.append_run(results, run_id='r1') == 10
+        records = store.records()
+        balanced = results['Research Analysis']['substack']['balanced']['scores']
+        first = dict(zip(('seo', 'geo', 'voice'), records[0][:3]))
+        assert first == {'seo': balanced['seo'], 'geo': balanced['geo'], 'voice': 100 - balanced['voice_distance']}, first
+        assert store.bin_path.stat().st_size == 10 * RECORD.size
+
+
+def test_runs_append_without_rewriting():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PointStore(Path(tmp) / 'points')
+        store.append_run(synthetic_results(3, seed=1), run_id='r1')
+        before = store.bin_path.read_bytes()
+        store.append_run(synthetic_results(2, seed=2), run_id='r2')
+        after = store.bin_path.read_bytes()
+        assert after[:len(before)] == before, 'Earlier run was rewritten'
+
+        reopened = PointStore(Path(tmp) / 'points')
+        assert [r['id'] for r in reopened.meta['runs']] == ['r1', 'r2']
+        assert len(reopened.records()) == 50 and len(reopened.records(runs={'r2'})) == 20
+
+
+def test_reappending_latest_run_replaces_it():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PointStore(Path(tmp) / 'points')
+        store.append_run(synthetic_results(1), run_id='r1')
+        store.append_run(synthetic_results(1), run_id='r2')
+        store.append_run(synthetic_results(3), run_id='r2')      # resumed run, now complete
+        assert store.append_run(synthetic_results(5), run_id='r1') == 0, 'Older run was re-appended'
+        assert len(store.records()) == 10 + 30, len(store.records())
+
+
+def test_crash_before_meta_save_is_ignored():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PointStore(Path(tmp) / 'points')
+        store.append_run(synthetic_results(2), run_id='r1')
+        committed = store.bin_path.read_bytes()
+        # Crash between writing r2's chunk and saving the meta: orphan records with run index 1
+        with open(store.bin_path, 'ab') as f:
+            f.write(RECORD.pack(50, 50, 50, 50, 50, 0, 0, 0, 0, 1, 1) * 7)
+
+        reopened = PointStore(Path(tmp) / 'points')
+        records = reopened.records()
+        assert len(records) == 20 and {r[9] for r in records} == {0}, 'Uncommitted records were read'
+        assert reopened.append_run(synthetic_results(1), run_id='r2') == 10
+        assert reopened.bin_path.read_bytes()[:len(committed)] == committed
+        assert reopened.bin_path.stat().st_size == 30 * RECORD.size, 'Orphan records were kept'
+        assert len(reopened.records(runs={'r2'})) == 10
+
+
+def test_error_articles_are_skipped():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PointStore(Path(tmp) / 'points')
+        results = synthetic_results(1)
+        results['Broken'] = {'error': 'File not found'}
+        assert store.append_run(results) == 10
+
+
+def test_decimation_bounds_points_and_keeps_counts():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PointStore(Path(tmp) / 'points')
+        store.append_run(synthetic_results(400), run_id='big')
+        records = store.records()
+        points = decimate(records, max_points=500)
+        assert len(points) <= 500, len(points)
+        assert sum(p[10] for p in points) == len(records), 'Aggregation lost cells'
+        assert any(p[8] == AGGREGATE for p in points), 'Nothing was aggregated'
+        assert decimate(records[:20], max_points=500) == records[:20], 'Small sets must pass through'
+
+
+def test_html_is_compact_and_not_inlined():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PointStore(Path(tmp) / 'points')
+        store.append_run(synthetic_results(400), run_id='big')
+        out = Path(write_html(store, Path(tmp) / 'plot.html', max_points=1000))
+        html = out.read_text(encoding='utf-8')
+        assert f'<script src="{PLOTLY_CDN}"></script>' in html, 'Plotly not referenced from the CDN'
+        assert 'Article 399' in html, 'String table missing'
+        assert out.stat().st_size < 40 * 1024, f'{out.stat().st_size} bytes for 4000 cells'
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Compact Plot Tests')
+    print('=' * 55)
+
+    tests = [
+        ('committed results round trip', test_committed_results_round_trip),
+        ('runs append without rewriting', test_runs_append_without_rewriting),
+        ('re-appending latest run replaces it', test_reappending_latest_run_replaces_it),
+        ('crash before meta save is ignored', test_crash_before_meta_save_is_ignored),
+        ('error articles are skipped', test_error_articles_are_skipped),
+        ('decimation bounds points and keeps counts', test_decimation_bounds_points_and_keeps_counts),
+        ('html is compact and not inlined', test_html_is_compact_and_not_inlined),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
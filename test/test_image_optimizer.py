@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for image_optimizer.py (resize, lossless recompression, WebP, article refs)
+
+Run from project root: python test/test_image_optimizer.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+
+from image_optimizer import (PLATFORM_MAX_WIDTH, max_width_for, optimize_image, optimize_images,
+                             optimize_article_images, summarize)
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+def make_chart(path, width, height, colors=6):
+    """Flat-colour bars on an opaque RGBA canvas, like a saved matplotlib chart."""
+    img = Image.new('RGBA', (width, height), (255, 255, 255, 255))
+    bar = max(width // colors, 1)
+    for i in range(colors):
+        img.paste((40 * i % 256, 90, 200 - 30 * i % 200, 255), (i * bar, height // 3, (i + 1) * bar, height))
+    img.save(path, 'PNG')
+    return path
+
+
+# --- Tests ---
+
+def test_max_width_for_platforms():
+    assert max_width_for(['medium']) == PLATFORM_MAX_WIDTH['medium']
+    assert max_width_for(['medium', 'substack']) == max(PLATFORM_MAX_WIDTH.values())
+    try:
+        max_width_for(['myspace'])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('Unknown platform accepted')
+
+
+def test_wide_image_is_downscaled():
+    with tempfile.TemporaryDirectory() as tmp:
+        src = make_chart(Path(tmp) / 'wide.png', 3000, 1500)
+        result = optimize_image(src, Path(tmp) / 'out' / 'wide.png', max_width=1400)
+        with Image.open(result['output']) as out:
+            assert out.size == (1400, 700), out.size
+        assert result['resized'] and result['bytes_saved'] > 0, result
+
+
+def test_lossless_recompression_preserves_pixels():
+    with tempfile.TemporaryDirectory() as tmp:
+        src = make_chart(Path(tmp) / 'chart.png', 800, 400)
+        result = optimize_image(src, Path(tmp) / 'out' / 'chart.png')
+        assert not result['resized']
+        assert result['optimized_bytes'] < result['original_bytes'], result
+        with Image.open(src) as a, Image.open(result['output']) as b:
+            assert a.convert('RGBA').tobytes() == b.convert('RGBA').tobytes(), 'Lossless pass changed pixels'
+
+
+def test_never_larger_than_source():
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / 'tiny.png'
+        Image.new('L', (4, 4), 128).save(src, 'PNG', optimize=True)
+        result = optimize_image(src, Path(tmp) / 'out' / 'tiny.png')
+        assert result['optimized_bytes'] <= result['original_bytes'], result
+        assert result['bytes_saved'] >= 0
+
+
+def test_webp_is_optional():
+    with tempfile.TemporaryDirectory() as tmp:
+        src = make_chart(Path(tmp) / 'chart.png', 600, 300)
+        plain = optimize_image(src, Path(tmp) / 'a' / 'chart.png')
+        with_webp = optimize_image(src, Path(tmp) / 'b' / 'chart.png', webp=True)
+        assert plain['webp'] is None
+        assert Path(with_webp['webp']).exists() and with_webp['webp_bytes'] > 0
+
+
+def test_batch_keeps_order_and_same_names():
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / 'a').mkdir()
+        (Path(tmp) / 'b').mkdir()
+        first = make_chart(Path(tmp) / 'a' / 'chart.png', 500, 200, colors=3)
+        second = make_chart(Path(tmp) / 'b' / 'chart.png', 500, 200, colors=5)
+        results = optimize_images([first, second, first], Path(tmp) / 'out', workers=2)
+        assert [r['source'] for r in results] == [str(first.resolve()), str(second.resolve()), str(first.resolve())]
+        assert results[0]['output'] != results[1]['output'], 'Same-name images overwrote each other'
+        assert summarize(results[:2])['images'] == 2
+
+
+def test_article_refs_are_rewritten():
+    with tempfile.TemporaryDirectory() as tmp:
+        make_chart(Path(tmp) / 'chart.png', 2000, 1000)
+        content = ('# Title\n\n![Chart](chart.png "Figure 1")\n\n'
+                   '![Remote](https://example.com/x.png)\n\n![Again](chart.png)\n')
+        new_content, results = optimize_article_images(content, tmp, Path(tmp) / 'out', platforms=['medium'])
+        assert len(results) == 1, 'Repeated image optimized twice'
+        out = Path(results[0]['output']).as_posix()
+        assert f'![Chart]({out} "Figure 1")' in new_content, new_content
+        assert f'![Again]({out})' in new_content, new_content
+        assert '![Remote](https://example.com/x.png)' in new_content, 'Remote image was touched'
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Image Optimizer Tests')
+    print('=' * 55)
+
+    tests = [
+        ('max width for platforms', test_max_width_for_platforms),
+        ('wide image is downscaled', test_wide_image_is_downscaled),
+        ('lossless recompression preserves pixels', test_lossless_recompression_preserves_pixels),
+        ('never larger than source', test_never_larger_than_source),
+        ('webp is optional', test_webp_is_optional),
+        ('batch keeps order and same names', test_batch_keeps_order_and_same_names),
+        ('article refs are rewritten', test_article_refs_are_rewritten),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
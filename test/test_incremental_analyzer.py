@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental_analyzer.py
+
+Run from project root: python test/test_incremental_analyzer.py
+Uses a stand-in analyzer that records which sections it was asked to score.
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analysis_cache import AnalysisCache
+from incremental_analyzer import IncrementalAnalyzer, aggregate_sections, split_sections, split_frontmatter
+
+# --- Fixtures ---
+
+ARTICLE = """\
+---
+title: "Incremental Test"
+tags:
+  - Testing
+---
+
+# Incremental Test
+
+Intro paragraph before the first section.
+
+## Findings
+
+The model hit 70% accuracy across 40 seasons of data.
+
+## Method
+
+```python
+## not a heading, this is code
+```
+
+We used Elo ratings and efficiency metrics.
+
+### Detail
+
+Sub-heading stays inside Method.
+
+## Conclusion
+
+Short close.
+"""
+
+
+class RecordingAnalyzer:
+    """Scores a section by its word count and remembers every section it saw."""
+
+    def __init__(self):
+        self.seen = []
+
+    def analyze_content_3d(self, article_path):
+        text = Path(article_path).read_text(encoding='utf-8')
+        _, body = split_frontmatter(text)
+        self.seen.append(body)
+        words = len(body.split())
+        return {
+            'traditional_seo': {'score': min(words, 100), 'grade': 'A' if words > 20 else 'C'},
+            'geo': {'score': 50 + words % 50, 'dimensions': {'quotability': 2.0 + words % 3}},
+            'voice_profile': {'formality': 3, 'data_heaviness': 4},
+            'platform_constraints': {'substack': {'valid': True, 'errors': []}},
+            'keywords': body.split()[:2],
+            'image_count': body.count('!['),
+        }
+
+
+def make_analyzer(cache_dir):
+    cache = AnalysisCache(cache_dir, analyzer_version='test')
+    return IncrementalAnalyzer(analyzer=RecordingAnalyzer(), cache=cache)
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+# --- Tests ---
+
+def test_split_on_h1_h2_only():
+    _, body = split_frontmatter(ARTICLE)
+    headings = [s['heading'] for s in split_sections(body)]
+    assert headings == ['Incremental Test', 'Findings', 'Method', 'Conclusion'], headings
+
+
+def test_split_ignores_headings_in_code_fences():
+    _, body = split_frontmatter(ARTICLE)
+    method = [s for s in split_sections(body) if s['heading'] == 'Method'][0]
+    assert '## not a heading' in method['text'], 'Fenced "##" line started a new section'
+    assert '### Detail' in method['text'], 'H3 should stay inside its H2 section'
+
+
+def test_sections_rejoin_to_body():
+    _, body = split_frontmatter(ARTICLE)
+    assert ''.join(s['text'] for s in split_sections(body)) == body, 'Split lost or reordered text'
+
+
+def test_first_run_analyzes_every_section():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'a.md'
+        path.write_text(ARTICLE, encoding='utf-8')
+        analyzer = make_analyzer(Path(tmp) / 'cache')
+        analysis = analyzer.analyze_content_3d(path)
+        assert len(analyzer.analyzer.seen) == 4, f'Expected 4 analyses, got {len(analyzer.analyzer.seen)}'
+        assert not any(s['reused'] for s in analysis['sections']), 'Nothing should be cached yet'
+
+
+def test_edit_rescoring_only_touches_changed_section():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'a.md'
+        path.write_text(ARTICLE, encoding='utf-8')
+        analyzer = make_analyzer(Path(tmp) / 'cache')
+        analyzer.analyze_content_3d(path)
+
+        path.write_text(ARTICLE.replace('Short close.', 'A longer, edited close.'), encoding='utf-8')
+        analyzer.analyzer.seen.clear()
+        analysis = analyzer.analyze_content_3d(path)
+
+        assert len(analyzer.analyzer.seen) == 1, f'Re-analyzed {len(analyzer.analyzer.seen)} sections'
+        assert 'edited close' in analyzer.analyzer.seen[0], 'Wrong section re-analyzed'
+        reused = [s['heading'] for s in analysis['sections'] if s['reused']]
+        assert reused == ['Incremental Test', 'Findings', 'Method'], reused
+
+
+def test_frontmatter_edit_invalidates_all_sections():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'a.md'
+        path.write_text(ARTICLE, encoding='utf-8')
+        analyzer = make_analyzer(Path(tmp) / 'cache')
+        analyzer.analyze_content_3d(path)
+        path.write_text(ARTICLE.replace('- Testing', '- Analytics'), encoding='utf-8')
+        analyzer.analyzer.seen.clear()
+        analyzer.analyze_content_3d(path)
+        assert len(analyzer.analyzer.seen) == 4, 'Frontmatter change must rescore every section'
+
+
+def test_aggregate_is_word_weighted():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'a.md'
+        path.write_text(ARTICLE, encoding='utf-8')
+        analysis = make_analyzer(Path(tmp) / 'cache').analyze_content_3d(path)
+        sections = analysis['sections']
+        total_words = sum(s['words'] for s in sections)
+        expected = sum(s['analysis']['traditional_seo']['score'] * s['words'] for s in sections) / total_words
+        assert analysis['traditional_seo']['score'] == round(expected), \
+            f"SEO {analysis['traditional_seo']['score']} != weighted {expected:.1f}"
+        assert isinstance(analysis['voice_profile']['formality'], int), 'Int fields should stay ints'
+        assert analysis['platform_constraints']['substack']['valid'] is True, 'Bool fields should AND'
+        assert analysis['traditional_seo']['grade'] in ('A', 'C'), 'Grade should come from a section'
+
+
+def test_only_additive_keys_are_summed():
+    sections = [
+        {'image_count': 2, 'total_score': 80, 'keyword_count_ratio': 0.5},
+        {'image_count': 1, 'total_score': 40, 'keyword_count_ratio': 0.1},
+    ]
+    merged = aggregate_sections(sections, [100, 300])
+    assert merged['image_count'] == 3, merged
+    assert merged['total_score'] == 50, f"total_score should be averaged: {merged}"
+    assert merged['keyword_count_ratio'] == 0.2, f"keyword_count_ratio should be averaged: {merged}"
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Incremental Analyzer Tests')
+    print('=' * 55)
+
+    tests = [
+        ('split on H1/H2 only', test_split_on_h1_h2_only),
+        ('split ignores fenced headings', test_split_ignores_headings_in_code_fences),
+        ('sections rejoin to body', test_sections_rejoin_to_body),
+        ('first run analyzes every section', test_first_run_analyzes_every_section),
+        ('edit rescoring touches one section', test_edit_rescoring_only_touches_changed_section),
+        ('frontmatter edit invalidates all', test_frontmatter_edit_invalidates_all_sections),
+        ('aggregate is word-weighted', test_aggregate_is_word_weighted),
+        ('only additive keys are summed', test_only_additive_keys_are_summed),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
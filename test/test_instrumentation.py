@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Tests for instrumentation.py (spans, counters, trace files, profiling hooks)
+
+Run from project root: python test/test_instrumentation.py
+"""
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import instrumentation
+from instrumentation import (TRACE_ENV, absorb, capture, compare_traces, count, finish_trace,
+                             format_comparison, format_summary, load_trace, span, start_trace,
+                             traced, tracing)
+from publish_orchestrator import Stage, run_stages
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+    finally:
+        instrumentation._trace = None
+
+
+def teardown_function(fn):
+    # pytest hook; run_test() does the same for the script runner
+    instrumentation._trace = None
+
+
+def by_name(data):
+    return {s['name']: s for s in data['spans']}
+
+
+# --- Tests ---
+
+def test_noop_without_trace():
+    assert instrumentation.active() is None
+    with span('ignored'):
+        count('ignored')
+
+    @traced()
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+
+
+def test_spans_nest_and_counters_sum():
+    @traced('helper')
+    def helper():
+        count('calls')
+
+    trace = start_trace('unit')
+    with span('outer', article='A'):
+        helper()
+        helper()
+    count('calls', 3)
+    data = trace.data()
+
+    spans = by_name(data)
+    assert spans['outer']['parent'] is None, spans['outer']
+    assert spans['outer']['attrs'] == {'article': 'A'}, spans['outer']
+    helpers = [s for s in data['spans'] if s['name'] == 'helper']
+    assert len(helpers) == 2 and all(s['parent'] == spans['outer']['id'] for s in helpers), helpers
+    assert data['counters'] == {'calls': 5}, data['counters']
+    assert data['summary']['helper']['count'] == 2, data['summary']
+
+
+def test_failed_span_is_recorded():
+    trace = start_trace('unit')
+    try:
+        with span('boom'):
+            raise KeyError('x')
+    except KeyError:
+        pass
+    assert by_name(trace.data())['boom']['attrs'] == {'error': 'KeyError'}
+
+
+def test_tracing_writes_file_and_restores_env():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.pop(TRACE_ENV, None)
+        with tracing('run', enabled=True, out_dir=tmp) as trace:
+            assert os.environ.get(TRACE_ENV) == '1', 'Workers would not know to capture'
+            with span('step'):
+                pass
+        assert TRACE_ENV not in os.environ
+        assert trace.path.parent == Path(tmp) and trace.path.exists(), trace.path
+        data = load_trace(trace.path)
+        assert 'step' in data['summary'] and data['wall_time'] >= 0, data
+        assert 'step' in format_summary(data)
+
+        with tracing('run', enabled=False, out_dir=tmp) as off:
+            assert off is None
+        with tracing('run', enabled=True, out_dir=tmp) as again:
+            pass
+        assert again.path != trace.path, 'Second trace in the same second overwrote the first'
+
+
+def test_worker_capture_is_absorbed():
+    os.environ[TRACE_ENV] = '1'
+    try:
+        # As in a worker process: tracing is on, but not in this process
+        with capture('worker') as worker:
+            with span('analysis'):
+                with span('inner'):
+                    pass
+            count('analysis_cache.hits')
+        assert worker.data is not None, 'Worker spans were not captured'
+        assert instrumentation.active() is None
+    finally:
+        os.environ.pop(TRACE_ENV, None)
+
+    parent = start_trace('parent')
+    with span('matrix'):
+        absorb(worker.data)
+    data = parent.data()
+    spans = by_name(data)
+    assert spans['analysis']['parent'] == spans['matrix']['id'], spans
+    assert spans['inner']['parent'] == spans['analysis']['id'], spans
+    assert spans['analysis']['thread'].startswith('pid'), spans['analysis']
+    assert len({s['id'] for s in data['spans']}) == 3, 'Span ids collided after absorb'
+    assert data['counters'] == {'analysis_cache.hits': 1}
+
+    # In the tracing process itself, capture() leaves spans where they are
+    with capture() as local:
+        with span('direct'):
+            pass
+    assert local.data is None and 'direct' in parent.data()['summary']
+
+
+def test_stage_spans_nest_across_threads():
+    def stage_fn(ctx):
+        with span('work'):
+            pass
+        return threading.current_thread().name
+
+    trace = start_trace('publish')
+    report = run_stages([Stage('a', stage_fn), Stage('b', stage_fn, deps=('a',))])
+    assert report['ok'], report['errors']
+    data = trace.data()
+    stages = {s['name']: s['id'] for s in data['spans'] if s['name'].startswith('stage:')}
+    parents = sorted(s['parent'] for s in data['spans'] if s['name'] == 'work')
+    assert set(stages) == {'stage:a', 'stage:b'}, stages
+    assert parents == sorted(stages.values()), (parents, stages)
+
+
+def test_profilers_and_compare():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {}
+        for mode in ('cprofile', 'sample'):
+            start_trace(f'prof_{mode}', profile=mode)
+            with span('spin'):
+                sum(i * i for i in range(200000))
+            paths[mode] = finish_trace(tmp)
+        cprof = load_trace(paths['cprofile'])
+        assert cprof['profile']['mode'] == 'cprofile' and cprof['profile']['top'], cprof['profile']
+        assert paths['cprofile'].with_suffix('.prof').exists(), 'No .prof written'
+        assert load_trace(paths['sample'])['profile']['mode'] == 'sample'
+
+        diff = compare_traces(cprof, load_trace(paths['sample']))
+        assert set(diff['spans']) == {'spin'}, diff
+        assert 'spin' in format_comparison(diff)
+    try:
+        start_trace('bad', profile='perf')
+    except ValueError:
+        return
+    raise AssertionError('Accepted unknown profile mode')
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Instrumentation Tests')
+    print('=' * 55)
+
+    tests = [
+        ('no-op without a trace', test_noop_without_trace),
+        ('spans nest, counters sum', test_spans_nest_and_counters_sum),
+        ('failed span is recorded', test_failed_span_is_recorded),
+        ('tracing writes file, restores env', test_tracing_writes_file_and_restores_env),
+        ('worker capture is absorbed', test_worker_capture_is_absorbed),
+        ('stage spans nest across threads', test_stage_spans_nest_across_threads),
+        ('profilers and compare', test_profilers_and_compare),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
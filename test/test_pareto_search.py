@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Tests for pareto_search.py
+
+Run from project root: python test/test_pareto_search.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pareto_search import (
+    generate_candidates, limit_violations, non_dominated_sort, pareto_search, optimize_pareto, search_results,
+)
+
+# --- Fixtures ---
+
+
+def candidate(name, seo, geo, fit=80, voice=10, combined=None, description='Short description', tags=None):
+    return {
+        'strategy': name,
+        'description': description,
+        'tags': tags if tags is not None else ['A', 'B', 'C'],
+        'scores': {
+            'seo': seo, 'geo': geo, 'platform_fit': fit, 'voice_distance': voice,
+            'combined': combined if combined is not None else (seo + geo) // 2,
+        },
+    }
+
+
+STRATEGIES = [
+    candidate('balanced', 56, 65),
+    candidate('seo_heavy', 70, 50),
+    candidate('geo_heavy', 50, 80),
+    candidate('platform_first', 50, 60),       # dominated by balanced
+    candidate('voice_preservation', 40, 40, voice=2),
+]
+
+
+class StubEngine:
+    def __init__(self, results):
+        self.results = results
+
+    def optimize_all_strategies(self, analysis, platform):
+        return {c['strategy']: dict(c, platform=platform) for c in self.results}
+
+
+class ScoringEngine(StubEngine):
+    """Stub with the batch score_candidates() API: GEO rewards 'validated' descriptions."""
+
+    def __init__(self, results):
+        super().__init__(results)
+        self.scored = 0
+
+    def score_candidates(self, analysis, platform, candidates, strategy='balanced'):
+        self.scored += len(candidates)
+        geo = [90 if 'validated' in c['description'] else 50 for c in candidates]
+        return {'seo': [72] * len(candidates), 'geo': geo, 'platform_fit': [85] * len(candidates),
+                'voice_distance': [8] * len(candidates), 'combined': geo}
+
+
+RESULTS = [
+    dict(candidate('balanced', 56, 65, description='Automation: framework'),
+         title='Balanced title', alternatives=[
+             {'description': 'Automation: validated methodology', 'tags': ['A', 'B'], 'variant': 'geo_optimized'},
+             {'description': 'w' * 150, 'tags': ['A'], 'variant': 'seo_optimized'},
+         ]),
+    dict(candidate('seo_heavy', 70, 50, description='Automation | insights'), title='SEO title'),
+]
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+# --- Tests ---
+
+def test_substack_description_limit():
+    errors = limit_violations({'description': 'x' * 141, 'tags': []}, 'substack')
+    assert errors, 'A 141-char Substack description must be rejected'
+    assert not limit_violations({'description': 'x' * 140, 'tags': []}, 'substack'), '140 chars is allowed'
+
+
+def test_medium_tag_limit():
+    assert limit_violations({'tags': list('ABCDEF')}, 'medium'), 'Six Medium topics must be rejected'
+    assert not limit_violations({'tags': list('ABCDE')}, 'medium'), 'Five Medium topics are allowed'
+
+
+def test_front_excludes_dominated():
+    fronts = non_dominated_sort(STRATEGIES)
+    names = {STRATEGIES[i]['strategy'] for i in fronts[0]}
+    assert 'platform_first' not in names, 'Dominated strategy on the front'
+    assert names == {'balanced', 'seo_heavy', 'geo_heavy', 'voice_preservation'}, names
+    assert [STRATEGIES[i]['strategy'] for i in fronts[1]] == ['platform_first'], fronts
+
+
+def test_fronts_cover_every_candidate():
+    fronts = non_dominated_sort(STRATEGIES)
+    assert sorted(i for f in fronts for i in f) == list(range(len(STRATEGIES))), fronts
+
+
+def test_early_rejection_skips_scoring():
+    scored = []
+
+    def score_fn(c):
+        scored.append(c['description'])
+        return {'seo': 60, 'geo': 60, 'platform_fit': 80, 'voice_distance': 5, 'combined': 60}
+
+    unscored = [
+        {'description': 'ok', 'tags': ['A']},
+        {'description': 'y' * 200, 'tags': ['A']},
+    ]
+    result = pareto_search(unscored, 'substack', score_fn=score_fn)
+    assert scored == ['ok'], f'Over-limit candidate was scored: {scored}'
+    assert result['rejected']['limits'] == 1, result['rejected']
+
+
+def test_voice_bound_filters_front():
+    result = pareto_search(STRATEGIES, 'substack', voice_bound=5)
+    names = [c['strategy'] for c in result['front']]
+    assert names == ['voice_preservation'], names
+    assert result['rejected']['voice'] == 4, result['rejected']
+
+
+def test_time_budget_stops_generator():
+    def slow_candidates():
+        for i in range(100):
+            time.sleep(0.01)
+            yield candidate(f'c{i}', i, 100 - i)
+
+    result = pareto_search(slow_candidates(), 'medium', time_budget=0.05)
+    assert result['timed_out'], 'Search should stop when the budget runs out'
+    assert result['evaluated'] < 100, 'Generator was fully consumed despite budget'
+
+
+def test_optimize_pareto_with_engine():
+    extra = [candidate('variant', 75, 75, description='z' * 150)]
+    result = optimize_pareto(StubEngine(STRATEGIES), {}, 'substack', extra_candidates=iter(extra))
+    names = [c['strategy'] for c in result['front']]
+    assert 'variant' not in names, 'Over-limit extra candidate reached the front'
+    assert names[0] == 'geo_heavy', f'Front should be ordered by combined score: {names}'
+
+
+def test_generate_candidates_recombines_alternatives():
+    generated = list(generate_candidates(RESULTS))
+    # 2 titles x 4 descriptions x 3 tag lists, minus the two strategy results themselves
+    assert len(generated) == 2 * 4 * 3 - 2, len(generated)
+    keys = {(c['title'], c['description'], tuple(c['tags'])) for c in generated}
+    assert len(keys) == len(generated), 'Duplicate candidates generated'
+    assert ('Balanced title', 'Automation: framework', ('A', 'B', 'C')) not in keys, 'Strategy result re-yielded'
+    variant = next(c for c in generated if c['title'] == 'SEO title' and 'validated' in c['description'])
+    assert variant['sources']['description'] == 'balanced:geo_optimized', variant['sources']
+    assert all('scores' not in c for c in generated)
+
+
+def test_optimize_pareto_scores_generated_with_engine():
+    engine = ScoringEngine(RESULTS)
+    result = optimize_pareto(engine, {}, 'substack', time_budget=None)
+    assert result['rejected']['unscored'] == 0, result['rejected']
+    # The 150-char description appears with 2 titles x 3 tag lists
+    assert result['rejected']['limits'] == 6, 'Over-limit description variants should be rejected unscored'
+    assert engine.scored == 22 - 6, engine.scored
+    best = result['front'][0]
+    assert best['strategy'] == 'variant' and 'validated' in best['description'], best
+    assert best['scores']['geo'] == 90
+
+
+def test_engine_without_batch_api_scores_locally():
+    result = optimize_pareto(StubEngine(RESULTS), {}, 'substack', time_budget=None)
+    assert result['rejected']['unscored'] == 0, result['rejected']
+    assert result['evaluated'] == len(RESULTS) + 22 - 6, result
+    variants = [c for c in result['front'] if c['strategy'] == 'variant']
+    assert variants, f"No recombined variant reached the front: {result['front']}"
+
+
+def test_pareto_search_without_score_fn_counts_unscored():
+    result = search_results(RESULTS, 'substack', time_budget=None)
+    assert result['rejected']['unscored'] == 22 - 6, result['rejected']
+    assert {c['strategy'] for c in result['front']} == {'balanced', 'seo_heavy'}, result['front']
+
+
+def test_sort_stops_at_deadline():
+    many = [candidate(f'c{i}', i % 50, 50 - i % 50) for i in range(400)]
+    start = time.perf_counter()
+    fronts = non_dominated_sort(many, deadline=start)
+    assert time.perf_counter() - start < 0.5, 'Sort ignored its deadline'
+    assert sorted(i for f in fronts for i in f) == list(range(len(many))), 'Candidates dropped'
+    complete = non_dominated_sort(many)
+    assert set(complete[0]) <= set(fronts[0]), 'A truncated sort must keep every true front member'
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Pareto Search Tests')
+    print('=' * 55)
+
+    tests = [
+        ('Substack 140-char limit', test_substack_description_limit),
+        ('Medium 5-tag limit', test_medium_tag_limit),
+        ('front excludes dominated', test_front_excludes_dominated),
+        ('fronts cover every candidate', test_fronts_cover_every_candidate),
+        ('early rejection skips scoring', test_early_rejection_skips_scoring),
+        ('voice bound filters front', test_voice_bound_filters_front),
+        ('time budget stops generator', test_time_budget_stops_generator),
+        ('optimize_pareto with engine', test_optimize_pareto_with_engine),
+        ('generate_candidates recombines alternatives', test_generate_candidates_recombines_alternatives),
+        ('optimize_pareto scores generated with engine', test_optimize_pareto_scores_generated_with_engine),
+        ('engine without batch API scores locally', test_engine_without_batch_api_scores_locally),
+        ('pareto_search without score_fn counts unscored', test_pareto_search_without_score_fn_counts_unscored),
+        ('sort stops at deadline', test_sort_stops_at_deadline),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for publish_orchestrator.py (stage graph scheduling and the default publish graph)
+
+Run from project root: python test/test_publish_orchestrator.py
+"""
+import sys
+import json
+import time
+import asyncio
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from PIL import Image
+
+from batch_image_uploader import BatchImageUploader, ImageManifest
+from mock_servers import MockGitHub
+from publish_orchestrator import Stage, run_stages, build_publish_graph, publish, format_timings
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+def sleeper(seconds, result=None):
+    def fn(ctx):
+        time.sleep(seconds)
+        return result
+    return fn
+
+
+def failing(ctx):
+    raise RuntimeError('platform down')
+
+
+OPTIMIZER_OUTPUT = {
+    'seo_title': 'Pipeline Test Title',
+    'seo_description': 'Pipeline test description.',
+    'tags': ['Data Science', 'Python'],
+    'section': 'Technology',
+}
+
+
+# --- Tests ---
+
+def test_independent_stages_run_concurrently():
+    stages = [
+        Stage('prep', sleeper(0.05)),
+        Stage('publish:substack', sleeper(0.3), deps=('prep',)),
+        Stage('publish:medium', sleeper(0.3), deps=('prep',)),
+        Stage('post', sleeper(0), deps=('publish:substack', 'publish:medium')),
+    ]
+    report = run_stages(stages)
+    t = report['stages']
+    assert report['ok'], report['errors']
+    assert report['wall_time'] < 0.55, f"Platforms ran serially: {report['wall_time']}s"
+    assert t['publish:substack']['start'] >= t['prep']['end'], 'Started before its dependency finished'
+    assert t['post']['start'] >= max(t['publish:substack']['end'], t['publish:medium']['end'])
+
+
+def test_async_stages_and_results():
+    async def fetch(ctx):
+        await asyncio.sleep(0.01)
+        return 42
+
+    report = run_stages([Stage('fetch', fetch), Stage('use', lambda ctx: ctx['results']['fetch'] + 1, deps=('fetch',))])
+    assert report['results'] == {'fetch': 42, 'use': 43}, report['results']
+
+
+def test_failure_skips_only_dependents():
+    stages = [
+        Stage('prep', sleeper(0)),
+        Stage('publish:substack', sleeper(0, 'ok'), deps=('prep',)),
+        Stage('publish:medium', failing, deps=('prep',)),
+        Stage('post', sleeper(0), deps=('publish:substack', 'publish:medium')),
+    ]
+    report = run_stages(stages)
+    status = {name: t['status'] for name, t in report['stages'].items()}
+    assert status == {'prep': 'ok', 'publish:substack': 'ok', 'publish:medium': 'failed', 'post': 'skipped'}, status
+    assert not report['ok']
+    assert 'platform down' in report['errors']['publish:medium']
+    assert 'skipped' in format_timings(report)
+
+
+def test_bad_graphs_are_rejected():
+    for stages in ([Stage('a', failing, deps=('missing',))],
+                   [Stage('a', failing, deps=('b',)), Stage('b', failing, deps=('a',))],
+                   [Stage('a', failing), Stage('a', failing)]):
+        try:
+            run_stages(stages)
+        except ValueError:
+            continue
+        raise AssertionError(f'Accepted bad graph: {stages}')
+
+
+def test_default_graph_shape():
+    graph = {s.name: s.deps for s in build_publish_graph(['substack', 'medium'])}
+    assert graph['publish:substack'] == graph['publish:medium'] == ('content_prep',)
+    assert set(graph['post_publication']) == {'publish:substack', 'publish:medium'}
+    assert 'publish:medium' not in {s.name for s in build_publish_graph(['substack'])}
+
+
+def test_end_to_end_against_mock_cdn():
+    with tempfile.TemporaryDirectory() as tmp, MockGitHub() as gh:
+        tmp = Path(tmp)
+        Image.new('RGB', (2000, 1000), (20, 90, 200)).save(tmp / 'chart.png')
+        article = tmp / 'draft.md'
+        article.write_text('---\ntitle: "Test"\ntags:\n  - Data\n---\n\n# Test\n\n![Chart](chart.png)\n',
+                           encoding='utf-8')
+        calls = {}
+
+        def substack(draft_id, output):
+            calls['substack'] = draft_id
+            return {'search_engine_title': output['seo_title']}
+
+        def medium(story_id, output):
+            calls['medium'] = story_id
+            return {'submission_url': f'https://medium.com/p/{story_id}/submission'}
+
+        uploader = BatchImageUploader('owner', 'repo', api_base=gh.url, token='t', backoff=0,
+                                      manifest=ImageManifest(tmp / 'manifest.json'))
+        report = publish(article, OPTIMIZER_OUTPUT, uploader=uploader, image_dir=tmp / 'opt',
+                         substack_setter=substack, medium_builder=medium,
+                         substack_draft_id=1, medium_story_id='abc', publish_log=tmp / 'log.jsonl')
+
+        assert report['ok'], report['errors']
+        assert calls == {'substack': 1, 'medium': 'abc'}, calls
+        unmatched = report['results']['validation']['unmatched_tags']
+        assert unmatched == {'substack': ['Data'], 'medium': ['Data']}, unmatched
+        sections = report['results']['validation']['unmatched_sections']
+        assert sections == {'substack': ['Technology']}, sections
+        assert len(gh.commits) == 1, 'Images not uploaded in one commit'
+        record = json.loads((tmp / 'log.jsonl').read_text(encoding='utf-8'))
+        url = next(iter(record['images'].values()))
+        assert url.startswith('https://owner.github.io/repo/images/'), url
+        assert all(t['elapsed'] >= 0 for t in report['stages'].values())
+
+
+def test_validation_failure_stops_everything():
+    with tempfile.TemporaryDirectory() as tmp:
+        article = Path(tmp) / 'draft.md'
+        article.write_text('---\ntitle: "Test"\n---\n\n![Missing](nope.png)\n', encoding='utf-8')
+        report = publish(article, OPTIMIZER_OUTPUT, substack_setter=failing, medium_builder=failing)
+        assert report['stages']['validation']['status'] == 'failed'
+        assert 'nope.png' in report['errors']['validation']
+        assert all(t['status'] == 'skipped' for name, t in report['stages'].items() if name != 'validation')
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Publish Orchestrator Tests')
+    print('=' * 55)
+
+    tests = [
+        ('independent stages run concurrently', test_independent_stages_run_concurrently),
+        ('async stages and results', test_async_stages_and_results),
+        ('failure skips only dependents', test_failure_skips_only_dependents),
+        ('bad graphs are rejected', test_bad_graphs_are_rejected),
+        ('default graph shape', test_default_graph_shape),
+        ('end to end against mock CDN', test_end_to_end_against_mock_cdn),
+        ('validation failure stops everything', test_validation_failure_stops_everything),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for results_store.py
+
+Run from project root: python test/test_results_store.py
+"""
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from results_store import ResultsSink, ResultsReader, export_json
+
+# --- Fixtures ---
+
+GENERATED = '2026-02-16T19:08:57.252779'
+PLATFORMS = ['substack', 'medium']
+STRATEGIES = ['balanced', 'seo_heavy', 'geo_heavy']
+
+
+def make_result(article, platform, strategy):
+    return {
+        'platform': platform,
+        'strategy': strategy,
+        'title': f'{article} — title',
+        'description': f'{strategy} description for {platform}',
+        'tags': ['Automation', 'Publishing'],
+        'scores': {'seo': 56, 'geo': 65, 'platform_fit': 80, 'voice_distance': 10, 'combined': 63},
+        'trade_offs': [],
+        'alternatives': [{'description': 'alt', 'tags': ['A'], 'score': 61, 'variant': 'seo_optimized'}],
+    }
+
+
+def summary_row(article, platform, strategy, result):
+    return {'article': article, 'platform': platform, 'strategy': strategy,
+            'combined_score': result['scores']['combined']}
+
+
+def write_fixture(path, articles=('Research Analysis', 'Opinion'), failed=('Broken',)):
+    """Write a stream and return the equivalent in-memory (all_results, summary)."""
+    all_results, summary = {}, []
+    with ResultsSink(path) as sink:
+        sink.write_run(GENERATED, list(articles) + list(failed))
+        for article in articles:
+            sink.write_article(article, 'research', PLATFORMS)
+            all_results[article] = {}
+            for platform in PLATFORMS:
+                all_results[article][platform] = {}
+                for strategy in STRATEGIES:
+                    result = make_result(article, platform, strategy)
+                    row = summary_row(article, platform, strategy, result)
+                    sink.write_cell(article, platform, strategy, result, row)
+                    all_results[article][platform][strategy] = result
+                    summary.append(row)
+        for article in failed:
+            sink.write_article(article, 'research', [], error='file not found')
+            all_results[article] = {}
+    return all_results, summary
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+# --- Tests ---
+
+def test_lazy_view_matches_written_results():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'run.jsonl'
+        all_results, _ = write_fixture(path)
+        with ResultsReader(path) as reader:
+            view = reader.results()
+            rebuilt = {a: {p: dict(s) for p, s in ps.items()} for a, ps in view.items()}
+        assert rebuilt == all_results, 'Lazy nested view differs from written results'
+
+
+def test_load_results_returns_plain_dicts():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'run.jsonl'
+        all_results, _ = write_fixture(path)
+        with ResultsReader(path) as reader:
+            loaded = reader.load_results()
+        assert loaded == all_results, 'load_results() differs from written results'
+        assert type(loaded) is dict and all(type(ps) is dict for ps in loaded.values())
+        json.dumps(loaded)   # usable after the reader is closed, by plain-dict consumers
+
+
+def test_export_is_byte_identical_to_json_dump():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'run.jsonl'
+        all_results, summary = write_fixture(path)
+        expected = json.dumps({
+            'generated': GENERATED,
+            'test_cases': len(summary),
+            'articles': list(all_results.keys()),
+            'results': all_results,
+            'summary': summary,
+        }, indent=2, default=str)
+
+        out = Path(tmp) / 'run.json'
+        with ResultsReader(path) as reader:
+            export_json(reader, out)
+        actual = out.read_text(encoding='utf-8')
+        assert actual == expected, 'Streamed export differs from json.dump(indent=2)'
+
+
+def test_export_with_no_cells():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'run.jsonl'
+        all_results, summary = write_fixture(path, articles=())
+        out = Path(tmp) / 'run.json'
+        with ResultsReader(path) as reader:
+            export_json(reader, out)
+        expected = json.dumps({'generated': GENERATED, 'test_cases': 0, 'articles': ['Broken'],
+                               'results': all_results, 'summary': summary}, indent=2)
+        assert out.read_text(encoding='utf-8') == expected, 'Empty run export is malformed'
+
+
+def test_truncated_last_line_ignored():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'run.jsonl'
+        write_fixture(path)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "cell", "article": "Research Analysis", "platf')
+        with ResultsReader(path) as reader:
+            assert reader.cell_count == 12, f'Expected 12 complete cells, got {reader.cell_count}'
+
+
+def test_completed_cells():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'run.jsonl'
+        write_fixture(path, articles=('Only',), failed=())
+        with ResultsReader(path) as reader:
+            cells = reader.completed_cells()
+        assert ('Only', 'medium', 'geo_heavy') in cells, cells
+        assert len(cells) == 6, f'Expected 6 cells, got {len(cells)}'
+
+
+def test_done_checkpoints_last_write_wins():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'run.jsonl'
+        write_fixture(path, articles=('Only',), failed=())
+        with ResultsSink(path) as sink:
+            sink.write_done('Only', 'substack', 'fp-1')
+            # Resumed run re-did substack after the article changed
+            result = make_result('Only', 'substack', 'balanced')
+            result['scores']['combined'] = 99
+            sink.write_cell('Only', 'substack', 'balanced', result, {})
+            sink.write_done('Only', 'substack', 'fp-2')
+        with ResultsReader(path) as reader:
+            assert reader.done == {('Only', 'substack'): 'fp-2'}, reader.done
+            assert reader.cell_count == 6, 'Re-run cell must not be double counted'
+            score = reader.results()['Only']['substack']['balanced']['scores']['combined']
+            assert score == 99, f'Expected re-run result, got combined={score}'
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Results Store Tests')
+    print('=' * 55)
+
+    tests = [
+        ('lazy view matches written results', test_lazy_view_matches_written_results),
+        ('load_results returns plain dicts', test_load_results_returns_plain_dicts),
+        ('export byte-identical to json.dump', test_export_is_byte_identical_to_json_dump),
+        ('export with no cells', test_export_with_no_cells),
+        ('truncated last line ignored', test_truncated_last_line_ignored),
+        ('completed cells', test_completed_cells),
+        ('done checkpoints, last write wins', test_done_checkpoints_last_write_wins),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
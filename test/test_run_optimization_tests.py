@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Tests for run_optimization_tests.py, run end to end on stand-in shared modules
+
+The shared multi_dim_analyzer / optimization_engine / visualizer modules are
+written to a temp dir put first on sys.path, so worker processes import the
+same stand-ins. Each analysis is logged to STUB_ANALYSIS_LOG as
+'<article file> <pid>'.
+
+Run from project root: python test/test_run_optimization_tests.py
+"""
+import os
+import sys
+import json
+import atexit
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import run_optimization_tests as runner
+
+STUB_MODULES = {
+    'multi_dim_analyzer.py': '''
+import os
+from pathlib import Path
+
+
+class MultiDimAnalyzer:
+    def analyze_content_3d(self, path):
+        text = Path(path).read_text(encoding='utf-8')
+        with open(os.environ['STUB_ANALYSIS_LOG'], 'a', encoding='utf-8') as log:
+            log.write(f'{Path(path).name} {os.getpid()}\\n')
+        words = len(text.split())
+        return {'traditional_seo': {'score': 40 + words % 50, 'grade': 'B', 'keywords': ['data']},
+                'geo': {'score': 50 + words % 30},
+                'voice_profile': {'formality': 3, 'data_heaviness': 1 + words % 5}}
+''',
+    'optimization_engine.py': '''
+STRATEGIES = ['balanced', 'seo_heavy', 'geo_heavy', 'platform_first', 'voice_preservation']
+
+
+class OptimizationEngine:
+    def __init__(self, voice_profile):
+        self.voice_profile = voice_profile
+
+    def optimize_all_strategies(self, analysis, platform):
+        seo, geo = analysis['traditional_seo']['score'], analysis['geo']['score']
+        return {s: {'platform': platform, 'strategy': s, 'title': f'Data title {s}',
+                    'description': f'Data description for {platform}', 'tags': ['Data Science', 'Python'],
+                    'section': 'Technology',
+                    'scores': {'seo': seo, 'geo': geo, 'platform_fit': 80, 'voice_distance': 10,
+                               'combined': (seo + geo) // 2 + i},
+                    'alternatives': []}
+                for i, s in enumerate(STRATEGIES)}
+''',
+    'visualizer.py': '''
+import json
+import os
+
+
+class OptimizationVisualizer:
+    def create_3d_plot(self, all_results):
+        path = os.path.join(os.environ['STUB_RESULTS_DIR'], 'plot.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'type': type(all_results).__name__, 'results': all_results}, f)
+        return path
+''',
+}
+
+_stub_dir = None
+
+
+def install_stub_modules():
+    """Write the stand-in shared modules once and put them first on sys.path."""
+    global _stub_dir
+    if _stub_dir is None:
+        _stub_dir = tempfile.mkdtemp(prefix='stub_shared_tools_')
+        atexit.register(shutil.rmtree, _stub_dir, ignore_errors=True)
+        for name, source in STUB_MODULES.items():
+            Path(_stub_dir, name).write_text(source.lstrip(), encoding='utf-8')
+    if sys.path[0] != _stub_dir:
+        sys.path.insert(0, _stub_dir)
+
+
+@contextmanager
+def stub_matrix(articles=3):
+    """Point the runner at temp articles and a temp results dir; yield (tmp, article_paths)."""
+    install_stub_modules()
+    saved = {name: getattr(runner, name) for name in ('TEST_ARTICLES', 'RESULTS_DIR', 'CATALOGUE_PATH')}
+    saved_env = {name: os.environ.get(name) for name in ('STUB_ANALYSIS_LOG', 'STUB_RESULTS_DIR')}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = []
+        runner.TEST_ARTICLES = {}
+        for i in range(articles):
+            path = tmp / f'article_{i}.md'
+            path.write_text(f'# Article {i}\n\n' + 'data model ' * (20 + 7 * i), encoding='utf-8')
+            paths.append(path)
+            runner.TEST_ARTICLES[f'Article {i}'] = {'path': str(path), 'type': 'research_analysis',
+                                                    'description': ''}
+        os.environ['STUB_ANALYSIS_LOG'] = str(tmp / 'analysis.log')
+        try:
+            yield tmp, paths
+        finally:
+            for name, value in saved.items():
+                setattr(runner, name, value)
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+def run_matrix(results_dir, **kwargs):
+    """run_test_matrix() writing into results_dir; returns (all_results, viz_path)."""
+    results_dir.mkdir(exist_ok=True)
+    runner.RESULTS_DIR = str(results_dir)
+    runner.CATALOGUE_PATH = str(results_dir / 'catalogue.db')
+    os.environ['STUB_RESULTS_DIR'] = str(results_dir)
+    kwargs.setdefault('use_cache', False)
+    return runner.run_test_matrix(**kwargs)
+
+
+def exported_text(results_dir):
+    """The exported results JSON in results_dir as text, minus its 'generated' line."""
+    (path,) = results_dir.glob('optimization_results_*.json')
+    lines = path.read_text(encoding='utf-8').splitlines(keepends=True)
+    return ''.join(line for line in lines if not line.startswith('  "generated": '))
+
+
+def exported(results_dir):
+    """The exported results JSON in results_dir, without its 'generated' timestamp."""
+    return json.loads(exported_text(results_dir))
+
+
+def analysis_log(tmp):
+    """[(article file name, pid), ...] for every analysis so far."""
+    path = tmp / 'analysis.log'
+    if not path.exists():
+        return []
+    return [tuple(line.split()) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+# --- Tests ---
+
+def test_returns_plain_results_and_plots_a_dict():
+    with stub_matrix() as (tmp, paths):
+        all_results, viz_path = run_matrix(tmp / 'run')
+        assert type(all_results) is dict, type(all_results)
+        assert all(type(platforms) is dict for platforms in all_results.values()), 'Nested views not dicts'
+        assert all_results == exported(tmp / 'run')['results'], 'Returned results differ from the export'
+        plot = json.loads(Path(viz_path).read_text(encoding='utf-8'))
+        assert plot['type'] == 'dict', f"create_3d_plot got a {plot['type']}"
+        assert plot['results'] == all_results
+
+
+def test_workers_match_serial_output():
+    with stub_matrix() as (tmp, paths):
+        serial, _ = run_matrix(tmp / 'serial', workers=1)
+        serial_pids = {pid for _, pid in analysis_log(tmp)}
+        parallel, _ = run_matrix(tmp / 'parallel', workers=3)
+        worker_pids = {pid for _, pid in analysis_log(tmp)[len(paths):]}
+        assert serial_pids == {str(os.getpid())} and str(os.getpid()) not in worker_pids, \
+            f'Parallel run did not analyze in worker processes: {serial_pids} {worker_pids}'
+        assert exported_text(tmp / 'parallel') == exported_text(tmp / 'serial'), \
+            'Parallel export is not byte-identical to serial'
+        assert list(parallel) == list(runner.TEST_ARTICLES), 'Articles out of TEST_ARTICLES order'
+        assert exported(tmp / 'serial')['test_cases'] == 3 * 2 * 5
+
+
+
+def test_resume_reruns_only_edited_articles():
+    with stub_matrix() as (tmp, paths):
+        first, _ = run_matrix(tmp / 'run')
+        assert sorted(name for name, _ in analysis_log(tmp)) == [p.name for p in paths]
+        before = exported(tmp / 'run')
+
+        paths[1].write_text(paths[1].read_text(encoding='utf-8') + 'extra words\n', encoding='utf-8')
+        analyzed = len(analysis_log(tmp))
+        resumed, _ = run_matrix(tmp / 'run', resume=runner.latest_stream(str(tmp / 'run')))
+
+        assert [name for name, _ in analysis_log(tmp)[analyzed:]] == ['article_1.md'], analysis_log(tmp)
+        after = exported(tmp / 'run')
+        assert after['test_cases'] == before['test_cases'] == 3 * 2 * 5, (before['test_cases'], after['test_cases'])
+        assert len(after['summary']) == len(before['summary']), 'Resumed export duplicated summary rows'
+        assert after['results']['Article 0'] == before['results']['Article 0'], 'Unchanged article changed'
+        assert resumed['Article 1'] != first['Article 1'], 'Edited article kept its old results'
+
+        analyzed = len(analysis_log(tmp))
+        run_matrix(tmp / 'run', resume=runner.latest_stream(str(tmp / 'run')))
+        assert len(analysis_log(tmp)) == analyzed, 'Resuming an unchanged run re-analyzed articles'
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Optimization Test Matrix Runner Tests')
+    print('=' * 55)
+
+    tests = [
+        ('returns plain results and plots a dict', test_returns_plain_results_and_plots_a_dict),
+        ('workers match serial output', test_workers_match_serial_output),
+        ('resume reruns only edited articles', test_resume_reruns_only_edited_articles),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
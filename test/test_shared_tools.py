@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for shared_tools.py (lazy module loading and the import report)
+
+Run from project root: python test/test_shared_tools.py
+"""
+import os
+import sys
+import pickle
+import subprocess
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared_tools import LazyModule, lazy_module, import_report, format_import_report
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+def write_module(directory, name, body):
+    (Path(directory) / f'{name}.py').write_text(body, encoding='utf-8')
+
+
+# --- Tests ---
+
+def test_module_loads_on_first_attribute():
+    with tempfile.TemporaryDirectory() as tmp:
+        write_module(tmp, 'lazy_probe_a', 'LOADED = True\nVALUE = 7\n')
+        sys.path.insert(0, tmp)
+        try:
+            module = lazy_module('lazy_probe_a')
+            assert isinstance(module, LazyModule) and not module.is_loaded
+            assert 'lazy_probe_a' not in sys.modules, 'Imported before first use'
+            assert module.VALUE == 7
+            assert module.is_loaded and 'lazy_probe_a' in sys.modules
+            assert 'lazy_probe_a' in import_report()
+            assert 'lazy_probe_a' in format_import_report()
+        finally:
+            sys.path.remove(tmp)
+
+
+def test_already_imported_module_is_returned():
+    import json
+    assert lazy_module('json') is json
+
+
+def test_lazy_module_pickles_by_name():
+    module = pickle.loads(pickle.dumps(lazy_module('lazy_probe_never_imported')))
+    assert isinstance(module, LazyModule) and module.__name__ == 'lazy_probe_never_imported'
+
+
+def test_missing_module_fails_on_use_not_import():
+    module = lazy_module('lazy_probe_does_not_exist')
+    try:
+        module.anything
+    except ModuleNotFoundError:
+        return
+    raise AssertionError('Missing module did not raise on first use')
+
+
+def test_matrix_runner_starts_without_heavy_modules():
+    # Heavy shared modules that fail on import: the entry point must still start
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ('multi_dim_analyzer', 'optimization_engine', 'visualizer'):
+            write_module(tmp, name, f'raise ImportError("{name} imported eagerly")\n')
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([tmp, str(ROOT)]))
+        proc = subprocess.run([sys.executable, '-c', 'import run_optimization_tests, publish_orchestrator'],
+                              cwd=tmp, env=env, capture_output=True, text=True, timeout=60)
+        assert proc.returncode == 0, proc.stderr
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Shared Tools Loader Tests')
+    print('=' * 55)
+
+    tests = [
+        ('module loads on first attribute', test_module_loads_on_first_attribute),
+        ('already-imported module is returned', test_already_imported_module_is_returned),
+        ('lazy module pickles by name', test_lazy_module_pickles_by_name),
+        ('missing module fails on use, not import', test_missing_module_fails_on_use_not_import),
+        ('matrix runner starts without heavy modules', test_matrix_runner_starts_without_heavy_modules),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
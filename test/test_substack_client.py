@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Tests for substack_client.py against a local Substack stand-in server
+
+Run from project root: python test/test_substack_client.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_servers import MockSubstack
+from substack_client import SubstackClient, SubstackError, seo_payload, seo_diff, fields_from_optimizer
+
+TOKEN = 'test-sid'
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+def make_client(server, **kwargs):
+    kwargs.setdefault('backoff', 0)
+    return SubstackClient(server.url, token=TOKEN, **kwargs)
+
+
+def drafts(n):
+    return {i: {'title': f'Draft {i}'} for i in range(1, n + 1)}
+
+
+# --- Tests ---
+
+def test_payload_has_all_fields_in_one_body():
+    payload = seo_payload('Title', 'Description', ['Data', 'Python'], 'my-slug')
+    assert payload == {
+        'search_engine_title': 'Title',
+        'search_engine_description': 'Description',
+        'postTags': [{'name': 'Data'}, {'name': 'Python'}],
+        'draft_slug': 'my-slug',
+    }, payload
+    assert seo_payload(seo_title='Only') == {'search_engine_title': 'Only'}
+
+
+def test_description_limit_enforced():
+    try:
+        seo_payload(seo_description='x' * 141)
+    except ValueError:
+        return
+    raise AssertionError('141-char description accepted')
+
+
+def test_optimizer_field_names():
+    a = fields_from_optimizer({'seo_title': 'A', 'seo_description': 'B', 'tags': ['t']})
+    b = fields_from_optimizer({'title': 'A', 'description': 'B', 'tags': ['t']})
+    assert a == b, (a, b)
+
+
+def test_single_draft_is_one_put():
+    with MockSubstack(drafts=drafts(1)) as server:
+        result = make_client(server).set_seo_metadata(1, 'Title', 'Desc', ['Data'], 'slug')
+        assert server.count('PUT') == 1, f"{server.count('PUT')} PUTs for one draft"
+        draft = result['draft']
+        assert draft['search_engine_title'] == 'Title' and draft['draft_slug'] == 'slug', draft
+
+
+def test_bulk_reuses_pooled_connections():
+    with MockSubstack(drafts=drafts(12)) as server:
+        client = make_client(server, max_workers=3)
+        results = client.set_seo_metadata_many(
+            [{'draft_id': i, 'seo_title': f'SEO {i}'} for i in range(1, 13)])
+        assert all(r['ok'] for r in results), results
+        assert [r['draft_id'] for r in results] == list(range(1, 13)), 'Results not in input order'
+        assert server.drafts[7]['search_engine_title'] == 'SEO 7'
+        assert len(server.connections) <= 3, f'{len(server.connections)} connections for 3 workers'
+
+
+def test_bulk_concurrency_is_bounded():
+    with MockSubstack(drafts=drafts(10), delay=0.05) as server:
+        make_client(server, max_workers=3).set_seo_metadata_many(
+            [{'draft_id': i, 'tags': ['x']} for i in range(1, 11)])
+        assert 1 < server.max_in_flight <= 3, f'max in flight: {server.max_in_flight}'
+
+
+def test_rate_limit_is_retried():
+    with MockSubstack(drafts=drafts(2)) as server:
+        server.fail_next[('PUT', '/api/v1/drafts/')] = [429, 429, 503]
+        results = make_client(server).set_seo_metadata_many(
+            [{'draft_id': 1, 'slug': 'a'}, {'draft_id': 2, 'slug': 'b'}])
+        assert all(r['ok'] for r in results), results
+        assert server.count('PUT') == 5, f"{server.count('PUT')} PUTs"
+
+
+def test_one_failure_does_not_stop_the_batch():
+    with MockSubstack(drafts=drafts(2)) as server:
+        results = make_client(server).set_seo_metadata_many(
+            [{'draft_id': 1, 'seo_title': 'ok'}, {'draft_id': 99, 'seo_title': 'missing'},
+             {'draft_id': 2, 'seo_description': 'x' * 200}])
+        assert [r['ok'] for r in results] == [True, False, False], results
+        assert '404' in results[1]['error']
+        assert server.count('PUT') == 1, 'Invalid payload or missing draft was written'
+
+
+def test_diff_ignores_tag_ids_and_empty_values():
+    draft = {'search_engine_title': 'Same', 'search_engine_description': None,
+             'postTags': [{'id': 7, 'name': 'Data'}, {'id': 9, 'name': 'Python'}]}
+    assert seo_diff(draft, seo_payload('Same', '', ['Data', 'Python'])) == {}
+    assert seo_diff(draft, seo_payload('New', tags=['Python', 'Data'])) == {
+        'search_engine_title': 'New', 'postTags': [{'name': 'Python'}, {'name': 'Data'}]}
+
+
+def test_only_changed_fields_are_sent():
+    current = {1: {'search_engine_title': 'Old', 'search_engine_description': 'Same desc',
+                   'postTags': [{'name': 'Data'}]}}
+    with MockSubstack(drafts=current) as server:
+        result = make_client(server).set_seo_metadata(1, 'New', 'Same desc', ['Data'])
+        assert server.puts == [(1, {'search_engine_title': 'New'})], server.puts
+        assert result['sent'] == {'search_engine_title': 'New'}, result
+        assert sorted(result['unchanged']) == ['postTags', 'search_engine_description'], result
+        assert not result['skipped']
+
+
+def test_unchanged_draft_is_not_written():
+    current = {1: {'search_engine_title': 'T', 'search_engine_description': 'D', 'postTags': [{'name': 'x'}]}}
+    with MockSubstack(drafts=current) as server:
+        result = make_client(server).set_seo_metadata(1, 'T', 'D', ['x'])
+        assert result['skipped'] and result['sent'] == {}, result
+        assert server.count('PUT') == 0, 'No-op update was written'
+        assert server.count('GET') == 1, 'Draft fetched more than once'
+
+
+def test_rerun_sees_edits_made_elsewhere():
+    with MockSubstack(drafts=drafts(5)) as server:
+        client = make_client(server)
+        batch = [{'draft_id': i, 'seo_title': f'SEO {i}', 'tags': ['a']} for i in range(1, 6)]
+        client.set_seo_metadata_many(batch)
+        server.drafts[3]['search_engine_title'] = 'Edited in the Substack UI'
+        again = client.set_seo_metadata_many(batch)
+        assert [r['skipped'] for r in again] == [True, True, False, True, True], again
+        assert again[2]['sent'] == {'search_engine_title': 'SEO 3'}, again[2]
+        assert server.drafts[3]['search_engine_title'] == 'SEO 3', 'Stale state skipped a needed write'
+        assert server.count('GET') == 10, 'Each update should fetch its draft fresh'
+
+
+def test_batch_reuses_its_own_writes():
+    with MockSubstack(drafts=drafts(1)) as server:
+        results = make_client(server).set_seo_metadata_many(
+            [{'draft_id': 1, 'seo_title': 'New'}, {'draft_id': 1, 'seo_title': 'New'}], max_workers=1)
+        assert [r['skipped'] for r in results] == [False, True], results
+        assert server.count('GET') == 1 and server.count('PUT') == 1, server.requests
+
+
+def test_diff_can_be_disabled():
+    current = {1: {'search_engine_title': 'T'}}
+    with MockSubstack(drafts=current) as server:
+        result = make_client(server).set_seo_metadata(1, 'T', diff=False)
+        assert server.count('GET') == 0 and server.count('PUT') == 1
+        assert result['sent'] == {'search_engine_title': 'T'}
+
+
+def test_bad_token_raises():
+    with MockSubstack(drafts=drafts(1)) as server:
+        client = SubstackClient(server.url, token='wrong', backoff=0)
+        try:
+            client.get_draft(1)
+        except SubstackError as e:
+            assert '401' in str(e)
+        else:
+            raise AssertionError('Unauthorized request succeeded')
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Substack Client Tests')
+    print('=' * 55)
+
+    tests = [
+        ('payload has all fields in one body', test_payload_has_all_fields_in_one_body),
+        ('description limit enforced', test_description_limit_enforced),
+        ('optimizer field names', test_optimizer_field_names),
+        ('single draft is one PUT', test_single_draft_is_one_put),
+        ('bulk reuses pooled connections', test_bulk_reuses_pooled_connections),
+        ('bulk concurrency is bounded', test_bulk_concurrency_is_bounded),
+        ('rate limit is retried', test_rate_limit_is_retried),
+        ('one failure does not stop the batch', test_one_failure_does_not_stop_the_batch),
+        ('diff ignores tag ids and empty values', test_diff_ignores_tag_ids_and_empty_values),
+        ('only changed fields are sent', test_only_changed_fields_are_sent),
+        ('unchanged draft is not written', test_unchanged_draft_is_not_written),
+        ('re-run sees edits made elsewhere', test_rerun_sees_edits_made_elsewhere),
+        ('batch reuses its own writes', test_batch_reuses_its_own_writes),
+        ('diff can be disabled', test_diff_can_be_disabled),
+        ('bad token raises', test_bad_token_raises),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Tests for table_render_cache.py
+
+Run from project root: python test/test_table_render_cache.py
+Uses a stand-in renderer (writes a stub PNG and drops a marker file per
+render), so table_to_image / matplotlib are not needed.
+"""
+import os
+import sys
+import time
+import uuid
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from table_render_cache import TableRenderCache, convert_tables_to_images, has_tables
+
+# --- Fixtures ---
+
+MULTI_TABLE = """\
+# Two Tables
+
+First table:
+
+| Name | Value |
+|------|-------|
+| Alpha | 1 |
+| Beta | 2 |
+
+Between tables.
+
+| Column A | Column B | Column C |
+|----------|----------|----------|
+| X | Y | Z |
+| 1 | 2 | 3 |
+
+End.
+"""
+
+FENCED_TABLE = """\
+```
+| not | a table |
+|-----|---------|
+```
+"""
+
+
+def stub_render(table_text, dest_path):
+    """Write a PNG-looking file and a marker so renders can be counted across processes."""
+    dest_path = Path(dest_path)
+    dest_path.write_bytes(b'\x89PNG\r\n\x1a\n' + table_text.encode('utf-8'))
+    markers = dest_path.parent / 'renders'
+    markers.mkdir(exist_ok=True)
+    (markers / uuid.uuid4().hex).touch()
+    return str(dest_path)
+
+
+def render_count(cache):
+    markers = cache.cache_dir / 'renders'
+    return len(list(markers.iterdir())) if markers.exists() else 0
+
+
+def make_cache(tmp, workers=1, style='style-v1', **kwargs):
+    return TableRenderCache(Path(tmp) / 'cache', style=style, workers=workers, render_fn=stub_render, **kwargs)
+
+
+def table(n):
+    return f"| Table | {n} |\n|-------|---|\n| row | {n} |"
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+# --- Tests ---
+
+def test_tables_replaced_with_refs():
+    with tempfile.TemporaryDirectory() as tmp:
+        result, paths = convert_tables_to_images(MULTI_TABLE, Path(tmp) / 'out', 'multi', cache=make_cache(tmp))
+        pipe_rows = [l for l in result.splitlines() if l.strip().startswith('|')]
+        assert not pipe_rows, f'Table rows still present: {pipe_rows}'
+        assert len(paths) == 2 and all(p.exists() for p in paths), paths
+        for p in paths:
+            assert p.as_posix() in result, f'Missing image ref for {p}'
+        assert 'Between tables.' in result and 'End.' in result, 'Surrounding content lost'
+
+
+def test_rerun_renders_nothing():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        first = convert_tables_to_images(MULTI_TABLE, Path(tmp) / 'out', 'a', cache=cache)
+        second = convert_tables_to_images(MULTI_TABLE, Path(tmp) / 'out', 'a', cache=cache)
+        assert render_count(cache) == 2, f'Expected 2 renders total, got {render_count(cache)}'
+        assert first == second, 'Cached run produced different output'
+        assert cache.stats() == {'hits': 2, 'misses': 2, 'evictions': 0}, cache.stats()
+
+
+def test_prefix_change_reuses_renders():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        for prefix in ('single', 'notempty', 'validpng', 'imgref'):
+            convert_tables_to_images(MULTI_TABLE, Path(tmp) / 'out', prefix, cache=cache)
+        assert render_count(cache) == 2, f'Same tables rendered {render_count(cache)} times'
+
+
+def test_style_change_invalidates():
+    with tempfile.TemporaryDirectory() as tmp:
+        convert_tables_to_images(MULTI_TABLE, Path(tmp) / 'out', 'a', cache=make_cache(tmp, style='v1'))
+        restyled = make_cache(tmp, style='v2')
+        convert_tables_to_images(MULTI_TABLE, Path(tmp) / 'out', 'a', cache=restyled)
+        assert render_count(restyled) == 4, 'Renderer style change did not force re-render'
+
+
+def test_duplicate_tables_render_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        table = MULTI_TABLE.split('First table:')[1].split('Between')[0]
+        _, paths = convert_tables_to_images(table + '\ntext\n' + table, Path(tmp) / 'out', 'dup', cache=cache)
+        assert len(paths) == 2, 'Each occurrence still needs its own reference'
+        assert render_count(cache) == 1, f'Identical tables rendered {render_count(cache)} times'
+
+
+def test_parallel_matches_serial():
+    with tempfile.TemporaryDirectory() as tmp:
+        serial = convert_tables_to_images(MULTI_TABLE, Path(tmp) / 'out', 'p', cache=make_cache(Path(tmp) / 's'))
+        parallel_cache = make_cache(Path(tmp) / 'p', workers=2)
+        parallel = convert_tables_to_images(MULTI_TABLE, Path(tmp) / 'out', 'p', cache=parallel_cache)
+        assert serial[0] == parallel[0], 'Parallel render changed the document'
+        assert [p.read_bytes() for p in serial[1]] == [p.read_bytes() for p in parallel[1]], 'PNG bytes differ'
+        assert render_count(parallel_cache) == 2, 'Pool did not render both tables'
+
+
+def test_lru_eviction_by_entry_count():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, max_entries=3)
+        first, second = cache.ensure_rendered([table(1)])[0], cache.ensure_rendered([table(2)])[0]
+        past = time.time() - 60
+        os.utime(first, (past, past))
+        os.utime(second, (past - 60, past - 60))
+        cache.ensure_rendered([table(1)])                  # hit: table 1 becomes most recent
+        cache.ensure_rendered([table(3), table(4)])
+        assert sorted(cache.cache_dir.glob('*.png')) == sorted(
+            cache.ensure_rendered([table(1), table(3), table(4)])), 'Wrong entries evicted'
+        assert not second.exists(), 'Least recently used table was kept'
+        assert cache.stats()['evictions'] == 1, cache.stats()
+
+
+def test_eviction_by_total_bytes_keeps_current_tables():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, max_bytes=200)
+        for n in range(10):
+            cache.ensure_rendered([table(n)])
+        total = sum(p.stat().st_size for p in cache.cache_dir.glob('*.png'))
+        assert total <= 200, f'Cache over byte bound: {total}'
+        paths = cache.ensure_rendered([table(n) for n in range(20, 30)])
+        assert all(p.exists() for p in paths), "Eviction dropped the current call's tables"
+
+
+def test_fenced_table_ignored():
+    assert not has_tables(FENCED_TABLE), 'Table inside code fence detected'
+    with tempfile.TemporaryDirectory() as tmp:
+        result, paths = convert_tables_to_images(FENCED_TABLE, Path(tmp) / 'out', cache=make_cache(tmp))
+        assert result == FENCED_TABLE and paths == [], 'Fenced content must be unchanged'
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Table Render Cache Tests')
+    print('=' * 55)
+
+    tests = [
+        ('tables replaced with refs', test_tables_replaced_with_refs),
+        ('re-run renders nothing', test_rerun_renders_nothing),
+        ('prefix change reuses renders', test_prefix_change_reuses_renders),
+        ('style change invalidates', test_style_change_invalidates),
+        ('duplicate tables render once', test_duplicate_tables_render_once),
+        ('parallel matches serial', test_parallel_matches_serial),
+        ('LRU eviction by entry count', test_lru_eviction_by_entry_count),
+        ('eviction by total bytes keeps current tables', test_eviction_by_total_bytes_keeps_current_tables),
+        ('fenced table ignored', test_fenced_table_ignored),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for table_tokenizer.py
+
+Run from project root: python test/test_table_tokenizer.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from table_tokenizer import iter_tables, parse_tables, has_tables, replace_spans
+
+# --- Fixtures ---
+
+MULTI_TABLE = """\
+# Two Tables
+
+First table:
+
+| Name | Value |
+|------|-------|
+| Alpha | 1 |
+| Beta | 2 |
+
+Between tables.
+
+| Column A | Column B | Column C |
+|:---------|:--------:|---------:|
+| X | Y | Z |
+
+End.
+"""
+
+SINGLE_ROW_TABLE_NO_NEWLINE = "| Header A | Header B |\n|----------|----------|\n| Only Row | Data |"
+
+FENCED = """\
+```markdown
+| not | a table |
+|-----|---------|
+```
+"""
+
+PIPE_WITHOUT_SEPARATOR = """\
+| looks like a row |
+but no separator follows
+"""
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+# --- Tests ---
+
+def test_spans_have_exact_offsets():
+    spans = parse_tables(MULTI_TABLE)
+    assert len(spans) == 2, f'Expected 2 tables, got {len(spans)}'
+    for span in spans:
+        assert MULTI_TABLE[span.start:span.end] == span.text, 'Offsets do not slice to span text'
+        assert span.text.startswith('|') and span.text.endswith('|\n'), repr(span.text)
+    assert spans[0].text.count('\n') == 4, 'First table should be 4 lines'
+    assert (spans[1].start_line, spans[1].end_line) == (11, 14), spans[1]
+
+
+def test_table_at_eof_without_newline():
+    spans = parse_tables(SINGLE_ROW_TABLE_NO_NEWLINE)
+    assert len(spans) == 1 and spans[0].text == SINGLE_ROW_TABLE_NO_NEWLINE, spans
+    assert spans[0].end_line == 3, spans[0]
+
+
+def test_fenced_and_separatorless_ignored():
+    assert not has_tables(FENCED), 'Table inside code fence detected'
+    assert not has_tables(PIPE_WITHOUT_SEPARATOR), 'Pipe line without separator detected'
+    assert not has_tables(''), 'Empty document detected as table'
+
+
+def test_crlf_line_endings():
+    crlf = MULTI_TABLE.replace('\n', '\r\n')
+    spans = parse_tables(crlf)
+    assert len(spans) == 2, 'CRLF tables not detected'
+    result = replace_spans(crlf, spans, ['![t1](a.png)', '![t2](b.png)'])
+    assert '|' not in result, 'Table rows left behind'
+    assert '\r\n![t1](a.png)\r\n\r\nBetween' in result, 'CRLF structure not preserved'
+
+
+def test_replace_spans_preserves_surroundings():
+    spans = parse_tables(MULTI_TABLE)
+    result = replace_spans(MULTI_TABLE, spans, ['![A](a.png)', '![B](b.png)'])
+    assert result == MULTI_TABLE.replace(spans[0].text, '![A](a.png)\n').replace(spans[1].text, '![B](b.png)\n'), result
+
+
+def test_has_tables_stops_early():
+    table = MULTI_TABLE.split('First table:\n\n')[1].split('\nBetween')[0]
+    big = table + '\nfiller line\n' * 200000
+    start = time.perf_counter()
+    assert has_tables(big), 'Leading table not found'
+    assert time.perf_counter() - start < 0.05, 'has_tables scanned the whole document'
+
+
+def test_linear_on_large_document():
+    table = MULTI_TABLE.split('First table:\n\n')[1].split('\nBetween')[0] + '\n'
+    doc = ('Paragraph text.\n\n' + table + '\n') * 5000
+    spans = list(iter_tables(doc))
+    assert len(spans) == 5000, f'Expected 5000 tables, got {len(spans)}'
+    result = replace_spans(doc, spans, ['![t](t.png)'] * len(spans))
+    assert result.count('![t](t.png)') == 5000 and '|' not in result
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Table Tokenizer Tests')
+    print('=' * 55)
+
+    tests = [
+        ('spans have exact offsets', test_spans_have_exact_offsets),
+        ('table at EOF without newline', test_table_at_eof_without_newline),
+        ('fenced / separator-less ignored', test_fenced_and_separatorless_ignored),
+        ('CRLF line endings', test_crlf_line_endings),
+        ('replace_spans keeps surroundings', test_replace_spans_preserves_surroundings),
+        ('has_tables stops early', test_has_tables_stops_early),
+        ('linear on large document', test_linear_on_large_document),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)
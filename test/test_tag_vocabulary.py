@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for tag_vocabulary.py (normalized, prefix and fuzzy tag lookup)
+
+Run from project root: python test/test_tag_vocabulary.py
+"""
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tag_vocabulary import (DEFAULT_SNAPSHOT, TagIndex, Vocabulary, load_index, normalize,
+                            resolve_result_tags)
+
+TERMS = [
+    'Data Science',
+    'Data Visualization',
+    {'name': 'Machine Learning', 'count': 900, 'aliases': ['ML']},
+    {'name': 'March Madness', 'count': 50},
+    'Python',
+    'Sports Analytics',
+]
+
+
+def run_test(name, fn):
+    try:
+        fn()
+        print(f'  PASS  {name}')
+        return True
+    except AssertionError as e:
+        print(f'  FAIL  {name}: {e}')
+        return False
+    except Exception as e:
+        print(f'  ERROR {name}: {type(e).__name__}: {e}')
+        return False
+
+
+# --- Tests ---
+
+def test_normalize():
+    for raw in ('Data Science', 'data-science', '  DATA  science! ', 'Data_Science'):
+        assert normalize(raw) == 'data-science', (raw, normalize(raw))
+    assert normalize('Café & Crème') == 'cafe-and-creme', normalize('Café & Crème')
+
+
+def test_exact_alias_and_fuzzy_suggestions():
+    vocab = Vocabulary(TERMS)
+    cases = {
+        'machine-learning': ('Machine Learning', 'exact', []),
+        'ml': ('Machine Learning', 'alias', []),
+        'Datascience': (None, None, ['Data Science']),
+        'Sport Analytics': (None, None, ['Sports Analytics']),
+        'Images': (None, None, []),
+    }
+    for term, expected in cases.items():
+        result = vocab.resolve(term)
+        assert (result['tag'], result['match'], result['suggestions']) == expected, (term, result)
+
+
+def test_near_misses_are_never_applied():
+    # Each of these is fuzzy-close to a real tag that means something else
+    vocab = Vocabulary(['Sports', 'Sports Betting', 'Content Strategy', 'Analytics'])
+    index = TagIndex({'medium:tags': vocab})
+    tags = ['Sports Bet', 'Content', 'Analytics Engineering']
+    resolved, unmatched = index.resolve_tags(tags, 'medium')
+    assert resolved == tags and unmatched == tags, (resolved, unmatched)
+    suggestions = index.suggest(unmatched, 'medium')
+    assert 'Sports Betting' in suggestions['Sports Bet'], suggestions
+
+
+def test_prefix_completion_ranked_by_count():
+    vocab = Vocabulary(TERMS)
+    assert vocab.complete('ma') == ['Machine Learning', 'March Madness'], vocab.complete('ma')
+    assert vocab.complete('data', limit=1) == ['Data Science'], vocab.complete('data', limit=1)
+    assert vocab.complete('zzz') == []
+
+
+def test_resolve_tags_dedupes_and_strict_drops():
+    index = TagIndex({'medium:tags': TERMS})
+    tags, unmatched = index.resolve_tags(['ML', 'machine learning', 'Images', 'python'], 'medium')
+    assert tags == ['Machine Learning', 'Images', 'Python'], tags
+    assert unmatched == ['Images'], unmatched
+    tags, _ = index.resolve_tags(['ML', 'Images', 'Python'], 'medium:tags', strict=True)
+    assert tags == ['Machine Learning', 'Python'], tags
+    # No vocabulary for the namespace: tags pass through untouched
+    assert index.resolve_tags(['Anything'], 'substack:sections') == (['Anything'], [])
+
+
+def test_resolve_result_tags_keeps_candidates():
+    index = TagIndex({'medium:tags': TERMS})
+    result = {'strategy': 'balanced', 'tags': ['data-science', 'Python', 'Datascience', 'a', 'b', 'c']}
+    resolved = resolve_result_tags(result, 'medium', index)
+    assert resolved['tags'] == ['Data Science', 'Python', 'Datascience', 'a', 'b'], resolved['tags']
+    assert resolved['candidate_tags'] == result['tags']
+    assert resolved['unmatched_tags'] == ['Datascience', 'a', 'b', 'c'], resolved['unmatched_tags']
+    assert resolved['tag_suggestions'] == {'Datascience': ['Data Science']}, resolved['tag_suggestions']
+    assert result['tags'][0] == 'data-science', 'Input result was modified'
+    assert resolve_result_tags(result, 'substack', index) is result
+
+
+def test_resolve_result_section():
+    index = TagIndex({'substack:tags': TERMS, 'substack:sections': ['Research', 'Sports Analytics']})
+    resolved = resolve_result_tags({'tags': ['Python'], 'section': 'research'}, 'substack', index)
+    assert resolved['section'] == 'Research' and resolved['unmatched_section'] is None, resolved
+
+    result = {'tags': ['Python'], 'section': 'Technology'}
+    resolved = resolve_result_tags(result, 'substack', index)
+    assert resolved['section'] == 'Technology' and resolved['unmatched_section'] == 'Technology', resolved
+    assert resolve_result_tags(result, 'substack', index, strict=True)['section'] is None
+    resolved = resolve_result_tags({'section': 'Sport Analytics'}, 'substack', index)
+    assert resolved['section_suggestions'] == ['Sports Analytics'], resolved
+
+    # Sections alone are enough to check
+    only_sections = TagIndex({'substack:sections': ['Research']})
+    assert resolve_result_tags(result, 'substack', only_sections)['unmatched_section'] == 'Technology'
+
+
+def test_snapshot_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'vocab.json'
+        TagIndex({'medium:tags': TERMS, 'substack:sections': ['Research']}, generated='now').save(path)
+        data = json.loads(path.read_text(encoding='utf-8'))
+        assert data['vocabularies']['medium:tags'] == TERMS, data
+        index = TagIndex.load(path)
+        assert index.vocabulary('medium').lookup('ML') == 'Machine Learning'
+        assert index.vocabulary('substack:sections').lookup('research') == 'Research'
+        assert load_index(Path(tmp) / 'missing.json') is None
+        assert index.version() == TagIndex.load(path).version()
+        index.vocabulary('substack:sections').add('Sports Analytics')
+        assert index.version() != TagIndex.load(path).version(), 'Version ignores a new term'
+
+
+def test_shipped_snapshot_loads():
+    index = load_index(DEFAULT_SNAPSHOT)
+    assert index is not None, f'Missing {DEFAULT_SNAPSHOT}'
+    assert {'medium:tags', 'substack:tags', 'substack:sections'} <= set(index.vocabularies)
+    assert index.vocabulary('medium').lookup('data-science') == 'Data Science'
+
+
+if __name__ == '__main__':
+    print('=' * 55)
+    print('  Tag Vocabulary Tests')
+    print('=' * 55)
+
+    tests = [
+        ('normalize', test_normalize),
+        ('exact, alias and fuzzy suggestions', test_exact_alias_and_fuzzy_suggestions),
+        ('near misses are never applied', test_near_misses_are_never_applied),
+        ('prefix completion ranked by count', test_prefix_completion_ranked_by_count),
+        ('resolve_tags dedupes, strict drops', test_resolve_tags_dedupes_and_strict_drops),
+        ('resolve_result_tags keeps candidates', test_resolve_result_tags_keeps_candidates),
+        ('resolve_result_tags checks the section', test_resolve_result_section),
+        ('snapshot round trip', test_snapshot_round_trip),
+        ('shipped snapshot loads', test_shipped_snapshot_loads),
+    ]
+
+    results = [run_test(name, fn) for name, fn in tests]
+
+    print('=' * 55)
+    passed = sum(results)
+    total = len(results)
+    print(f'  {passed}/{total} passed')
+    if passed == total:
+        print('  ALL TESTS PASS')
+        sys.exit(0)
+    else:
+        print('  TESTS FAILED')
+        sys.exit(1)